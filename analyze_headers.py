@@ -1,24 +1,53 @@
+import argparse
 import json
-import re
 
-def analyze_headers():
-    try:
-        with open('templates.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        headers = set()
-        for item in data:
-            report = item.get('full_report', '')
-            # Find lines ending with ':'
-            matches = re.findall(r'^\s*([^\s:]+):', report, re.MULTILINE)
-            headers.update(matches)
-            
-        print("Unique Headers Found:")
-        for h in sorted(headers):
-            print(h)
-            
-    except Exception as e:
-        print(e)
+from darlkom.journal import PatchJournal, journal_path
+from darlkom.lexicon import lexicon_table
+from darlkom.report import HeaderStats
+from darlkom.scripts import JAPANESE, contains
+from darlkom.store import DEFAULT_PATH, DNALibrary, record_key
+from darlkom.stream import iter_library
+
+TRANSLATOR = lexicon_table('report_headers')
+
+def iter_items(path):
+    if PatchJournal(journal_path(path)).exists():
+        # The raw file is missing the pending patches; load() replays them
+        yield from DNALibrary.load(path)
+        return
+    # Streams the file: records of every collection (or the flat legacy list) one at a time
+    for entry in iter_library(path):
+        if entry.records is not None:
+            yield from entry.records
+
+def analyze_headers(path=DEFAULT_PATH):
+    stats = HeaderStats()
+    for item in iter_items(path):
+        report = item.get('full_report') if isinstance(item, dict) else None
+        if isinstance(report, str):
+            stats.add_report(report, record_key(item))
+    return stats
+
+def untranslated(header):
+    # Headers translate_db would still leave in Japanese are the dictionary gaps
+    return "(not in report_headers)" if contains(TRANSLATOR.replace(header), JAPANESE) else ""
 
 if __name__ == "__main__":
-    analyze_headers()
+    parser = argparse.ArgumentParser(description="Header frequency, depth and co-occurrence across every full_report.")
+    parser.add_argument('input', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--limit', type=int, default=30, help='headers to list (0 = all)')
+    parser.add_argument('--pairs', type=int, default=10, help='co-occurring header pairs to list')
+    parser.add_argument('--index', metavar='PATH', help='write {header: [module_id, ...]} as JSON')
+    parser.add_argument('--json', metavar='PATH', help='write the full statistics as JSON')
+    args = parser.parse_args()
+
+    stats = analyze_headers(args.input)
+    print(stats.format_report(args.limit, args.pairs, untranslated))
+    if args.index:
+        with open(args.index, 'w', encoding='utf-8') as f:
+            json.dump(stats.index(), f, ensure_ascii=False, indent=2)
+        print(f"Header index written to {args.index}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(stats.to_json(), f, ensure_ascii=False, indent=2)
+        print(f"Full statistics written to {args.json}")
@@ -162,19 +162,91 @@ window.backToDnaView = function() {
 
 async function loadLibrary() {
     try {
-        const res = await fetch('templates.json');
-        const data = await res.json();
-        const serverLibrary = data.styles_v2 || data.styles_001_100 || [];
+        const serverLibrary = await loadServerLibrary();
         const userLibrary = JSON.parse(localStorage.getItem('darlkom_user_designs') || '[]');
         state.library = [...userLibrary, ...serverLibrary];
         renderLibrary();
         updateSidebarStats();
+        // Nothing else up front: shards load as their stub cards scroll into view,
+        // on a filter change or when a card needs its DNA (ensureDNA); the search
+        // index loads on the first search.
     } catch (e) {
         console.error("Failed to load library:", e);
         els.grid.innerHTML = `<div class="error">Failed to load DNA Module Database. Check console.</div>`;
     }
 }
 
+// ── Sharded Library (python -m darlkom.shards) ─
+// First paint needs only library/manifest.json; records without their shard are
+// stubs ({ module_id, style_name, role_bucket, _stub }) until it arrives.
+const shards = { manifest: null, pending: {} };
+
+async function loadServerLibrary() {
+    try {
+        const res = await fetch('library/manifest.json', { cache: 'no-cache' });
+        if (res.ok) {
+            shards.manifest = await res.json();
+            shards.pending = {};
+            return shards.manifest.entries.map(e => ({ ...e, _stub: true }));
+        }
+    } catch (e) {
+        console.warn("No sharded library, falling back to templates.json:", e);
+    }
+    shards.manifest = null;
+    const res = await fetch('templates.json');
+    const data = await res.json();
+    return data.styles_v2 || data.styles_001_100 || [];
+}
+
+function loadShard(role) {
+    if (!shards.manifest || !(role in shards.manifest.shards)) return Promise.resolve();
+    if (!shards.pending[role]) {
+        shards.pending[role] = fetch(`library/${shards.manifest.shards[role]}`)
+            .then(res => res.json())
+            .then(records => {
+                const byId = new Map(records.map(r => [r.module_id, r]));
+                state.library = state.library.map(d => (d._stub && byId.get(d.module_id)) || d);
+                // Cards already on screen were drawn as stubs; give them their thumbnails.
+                records.forEach(renderCardThumbnail);
+            })
+            .catch(e => {
+                delete shards.pending[role];
+                console.error(`Failed to load shard for ${role}:`, e);
+            });
+    }
+    return shards.pending[role];
+}
+
+async function loadShardsForFilter(filter) {
+    if (!shards.manifest || filter === 'user') return;
+    const roles = Object.keys(shards.manifest.shards)
+        .filter(role => filter === 'all' || role.toLowerCase().includes(filter));
+    await Promise.all(roles.map(loadShard));
+    renderLibrary();
+    const selected = state.library.find(d => d.module_id === state.selection);
+    if (selected && !selected._stub) renderInspector(selected);
+}
+
+// Stub cards fetch their role's shard once they come near the viewport.
+const stubObserver = 'IntersectionObserver' in window
+    ? new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (!entry.isIntersecting) return;
+            stubObserver.unobserve(entry.target);
+            loadShard(entry.target.dataset.role);
+        });
+    }, { rootMargin: '200px' })
+    : null;
+
+async function ensureDNA(id) {
+    const dna = state.library.find(d => d.module_id === id);
+    if (dna && dna._stub) {
+        await loadShard(dna.role_bucket || '');
+        return state.library.find(d => d.module_id === id);
+    }
+    return dna;
+}
+
 function updateSidebarStats() {
     const total = state.library.length;
     const userCount = state.library.filter(d => d.module_id.startsWith('USER_')).length;
@@ -184,6 +256,82 @@ function updateSidebarStats() {
     el('stat-user', userCount);
 }
 
+// ── Search Index (python -m darlkom.search_index) ─
+// Posting lists of n-grams narrow the candidates, each record's lowercased JSON
+// confirms them; keep tokenization in sync with darlkom/search_index.py.
+const SEARCH_INDEX_VERSION = 2;
+const SEARCH_TOKEN_RE = /#[0-9a-f]{3,8}(?![0-9a-z])|[0-9a-z]+|[ㄱ-ㆎ가-힣]+/g;
+const searchIndex = { data: null, loading: null };
+
+function loadSearchIndex() {
+    if (!searchIndex.loading) {
+        searchIndex.loading = fetch('library/search-index.json', { cache: 'no-cache' })
+            .then(res => res.ok ? res.json() : null)
+            .then(data => {
+                // An index from an older build lacks `texts`; scan the shards instead.
+                searchIndex.data = data && data.version === SEARCH_INDEX_VERSION ? data : null;
+                if (searchIndex.data && els.search.value) renderLibrary();
+            })
+            .catch(() => { searchIndex.data = null; });
+    }
+    return searchIndex.loading;
+}
+
+// Called on search input. Without a prebuilt index the search scans whole
+// records, so the shards for the current filter are needed after all.
+async function prepareSearch() {
+    await loadSearchIndex();
+    if (!searchIndex.data) await loadShardsForFilter(state.filter);
+}
+
+function searchGrams(token) {
+    const n = /^[ㄱ-ㆎ가-힣]/.test(token) ? searchIndex.data.gram.hangul : searchIndex.data.gram.latin;
+    if (token.length <= n) return [token];
+    const grams = [];
+    for (let i = 0; i + n <= token.length; i++) grams.push(token.slice(i, i + n));
+    return grams;
+}
+
+// Returns a Set of matching module_ids, or null when there is no index.
+function searchMatches(term) {
+    if (!searchIndex.data) return null;
+    const { ids, texts } = searchIndex.data;
+    const candidates = searchCandidates(term) || texts.keys();
+    const matches = new Set();
+    for (const d of candidates) {
+        if (texts[d].includes(term)) matches.add(ids[d]);
+    }
+    return matches;
+}
+
+// Docs holding every query token's grams, or null when the query has no
+// indexable tokens (Japanese, punctuation) and every doc is a candidate.
+function searchCandidates(term) {
+    const tokens = term.normalize('NFKC').toLowerCase().match(SEARCH_TOKEN_RE);
+    if (!tokens) return null;
+
+    const { postings, gram } = searchIndex.data;
+    let result = null;
+    for (const token of tokens) {
+        const n = /^[ㄱ-ㆎ가-힣]/.test(token) ? gram.hangul : gram.latin;
+        let docs;
+        if (token.length >= n) {
+            for (const g of searchGrams(token)) {
+                const hits = postings[g] || [];
+                docs = docs ? new Set(hits.filter(d => docs.has(d))) : new Set(hits);
+            }
+        } else {
+            docs = new Set();
+            for (const g in postings) {
+                if (g.includes(token)) postings[g].forEach(d => docs.add(d));
+            }
+        }
+        result = result ? new Set([...docs].filter(d => result.has(d))) : docs;
+        if (result.size === 0) break;
+    }
+    return result;
+}
+
 // --- Rendering ---
 let _searchDebounce = null;
 function debouncedRenderLibrary() {
@@ -191,9 +339,19 @@ function debouncedRenderLibrary() {
     _searchDebounce = setTimeout(renderLibrary, 150);
 }
 
+function renderCardThumbnail(dna) {
+    const thumbID = `thumb-${dna.module_id}`;
+    if (!document.getElementById(thumbID)) return;
+    requestAnimationFrame(() => {
+        if (window.RenderEngine) window.RenderEngine.renderThumbnail(thumbID, dna);
+    });
+}
+
 function renderLibrary() {
+    if (stubObserver) stubObserver.disconnect();
     els.grid.innerHTML = '';
     const term = els.search.value.toLowerCase();
+    const indexed = term ? searchMatches(term) : null;
 
     const filtered = state.library.filter(dna => {
         if (state.filter !== 'all') {
@@ -202,6 +360,8 @@ function renderLibrary() {
             if (state.filter !== 'user' && !role.includes(state.filter)) return false;
         }
         if (term) {
+            // User designs live in localStorage and are not in the prebuilt index.
+            if (indexed && !dna.module_id.startsWith('USER_')) return indexed.has(dna.module_id);
             const haystack = JSON.stringify(dna).toLowerCase();
             if (!haystack.includes(term)) return false;
         }
@@ -236,18 +396,22 @@ function renderLibrary() {
         `;
 
         els.grid.appendChild(item);
-        requestAnimationFrame(() => {
-            if (window.RenderEngine) window.RenderEngine.renderThumbnail(thumbID, dna);
-        });
+        if (dna._stub) {
+            item.dataset.role = dna.role_bucket || '';
+            if (stubObserver) stubObserver.observe(item);
+            else loadShard(item.dataset.role);
+            return;
+        }
+        renderCardThumbnail(dna);
     });
 }
 
-function selectDNA(id) {
+async function selectDNA(id) {
     state.selection = id;
     document.querySelectorAll('.dna-item').forEach(el => el.classList.remove('selected'));
     renderLibrary();
-    const dna = state.library.find(d => d.module_id === id);
-    renderInspector(dna);
+    const dna = await ensureDNA(id);
+    if (state.selection === id) renderInspector(dna);
 }
 
 
@@ -378,8 +542,8 @@ function setupDragAndDrop() {
 }
 
 // --- Mixer Logic ---
-window.assignSlot = function(slot, id) {
-    const dna = state.library.find(d => d.module_id === id);
+window.assignSlot = async function(slot, id) {
+    const dna = await ensureDNA(id);
     if (!dna) return;
 
     state.mixer[slot] = dna;
@@ -470,8 +634,8 @@ window.saveHybrid = function() {
     });
 };
 
-window.copyPrompt = function(id) {
-    const dna = state.library.find(d => d.module_id === id);
+window.copyPrompt = async function(id) {
+    const dna = await ensureDNA(id);
     if (!dna) return;
 
     let text = dna.image_prompt_one_line;
@@ -481,8 +645,8 @@ window.copyPrompt = function(id) {
     secureCopy(text, "이미지 프롬프트");
 };
 
-window.copyJSON = function(id) {
-    const dna = state.library.find(d => d.module_id === id);
+window.copyJSON = async function(id) {
+    const dna = await ensureDNA(id);
     if (!dna) return;
     secureCopy(JSON.stringify(dna, null, 2), "DNA JSON");
 };
@@ -558,7 +722,10 @@ window.copyDeckSequence = function() {
 // --- Event Listeners ---
 function setupEventListeners() {
     // Search with debounce
-    els.search.addEventListener('input', debouncedRenderLibrary);
+    els.search.addEventListener('input', () => {
+        if (els.search.value) prepareSearch();
+        debouncedRenderLibrary();
+    });
 
     // Ctrl+K / Cmd+K shortcut
     document.addEventListener('keydown', (e) => {
@@ -583,6 +750,7 @@ function setupEventListeners() {
             btn.classList.add('active');
             state.filter = btn.dataset.filter;
             renderLibrary();
+            loadShardsForFilter(state.filter);
         });
     });
 
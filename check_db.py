@@ -1,23 +1,37 @@
-import json
-import re
+import argparse
+import sys
+
+from darlkom.scan import has_residue, scan_record
+from darlkom.snapshot import open_library
+
+def detect_japanese(path='templates.json', limit=5):
+    library = open_library(path)
 
-def detect_japanese():
-    with open('templates.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    japanese_chars = re.compile(r'[\u3000-\u303f\u3040-\u309f\u30a0-\u30ff\uff00-\uff9f\u4e00-\u9faf\u3400-\u4dbf]')
-    
     found = False
-    for item in data:
-        # Check specific fields that might have residues
-        text_dump = json.dumps(item, ensure_ascii=False)
-        matches = japanese_chars.findall(text_dump)
-        if matches:
-            print(f"ID {item.get('id')}: Found {len(matches)} Japanese chars: {matches[:5]}...")
+    for item in library:
+        # Every CJK run with the field it sits in; the walk is in place, no json.dumps
+        findings = list(scan_record(item))
+        if findings:
+            chars = sum(f.end - f.start for f in findings)
+            print(f"ID {findings[0].key}: Found {chars} Japanese chars in {len(findings)} runs:")
+            for f in findings[:limit]:
+                print(f"  {f.path} [{f.start}:{f.end}]: {f.text}")
+            if len(findings) > limit:
+                print(f"  ... {len(findings) - limit} more")
             found = True
-            
+
     if not found:
         print("No Japanese characters found.")
+    return found
 
 if __name__ == "__main__":
-    detect_japanese()
+    parser = argparse.ArgumentParser(description="Report the fields that still contain Japanese/CJK characters.")
+    parser.add_argument('input', nargs='?', default='templates.json')
+    parser.add_argument('--limit', type=int, default=5, help='locations to list per record')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='print nothing; stop at the first hit and exit with status 1 if there is one')
+    args = parser.parse_args()
+
+    if args.quiet:
+        sys.exit(1 if has_residue(open_library(args.input)) else 0)
+    detect_japanese(args.input, args.limit)
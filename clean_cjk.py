@@ -1,48 +1,151 @@
-import json
+import argparse
 import re
+from collections import namedtuple
 
-def clean_database():
-    with open('templates.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        
-    # Regex to match any CJK characters (Chinese/Japanese/Korean Hanja)
-    # Range includes: 
-    # U+3000-U+303F (CJK Symbols and Punctuation)
-    # U+3040-U+309F (Hiragana)
-    # U+30A0-U+30FF (Katakana)
-    # U+FF00-U+FFEF (Halfwidth and Fullwidth Forms)
-    # U+4E00-U+9FAF (CJK Unified Ideographs - Common Kanji/Hanja)
-    # But we want to KEEP Korean Hangul (U+AC00-U+D7A3)
-    
-    # So we remove Japanese/Chinese ranges specifically.
-    jp_ch_pattern = re.compile(r'[\u3040-\u30ff\u4e00-\u9faf\u3400-\u4dbf]')
-    
-    # Fallback map for stubborn mixed terms that might just need deletion of the JP part
-    # or replacement with English if context is lost.
-    
-    def recursive_clean(obj):
-        if isinstance(obj, dict):
-            return {k: recursive_clean(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [recursive_clean(i) for i in obj]
-        elif isinstance(obj, str):
-            # If string contains Japanese/Chinese chars, try to clean it
-            if jp_ch_pattern.search(obj):
-                # Strategy: 
-                # 1. Provide specific manual overrides for known remaining issues if any
-                # 2. Aggressively remove the characters if they are mixed
-                new_str = jp_ch_pattern.sub('', obj)
-                # Cleanup double spaces or weird punctuation left behind
-                new_str = re.sub(r'\s+', ' ', new_str).strip()
-                return new_str
+from darlkom.journal import compact_hint
+from darlkom.pipeline import register_stage
+from darlkom.scan import format_path
+from darlkom.scripts import JAPANESE, contains, strip
+from darlkom.store import COLLECTIONS, DEFAULT_PATH, DNALibrary, record_key
+
+# Kana and CJK ideographs (darlkom.scripts.JAPANESE) are removed.
+# CJK punctuation, full-width forms and Korean Hangul are kept.
+
+# One cleaned string: `key` is the record's module_id/id (None for top-level values),
+# `path` the keys and list indexes leading to it.
+Change = namedtuple('Change', 'key path old new')
+
+def clean_string(text):
+    # If string contains Japanese/Chinese chars, try to clean it
+    if not contains(text, JAPANESE):
+        return text
+    # Strategy:
+    # 1. Provide specific manual overrides for known remaining issues if any
+    # 2. Aggressively remove the characters if they are mixed
+    new_str = strip(text, JAPANESE)
+    # Cleanup double spaces or weird punctuation left behind
+    return re.sub(r'\s+', ' ', new_str).strip()
+
+def clean_value(obj, path=(), changes=None):
+    """
+    Copy-on-write clean: containers with nothing to clean are returned as
+    is, so only the dicts/lists on the path to a changed string are copied.
+    Appends (path, old, new) for every changed string to `changes`.
+    """
+    if isinstance(obj, str):
+        new = clean_string(obj)
+        if new == obj:
             return obj
+        if changes is not None:
+            changes.append((path, obj, new))
+        return new
+    if isinstance(obj, dict):
+        items = obj.items()
+    elif isinstance(obj, list):
+        items = enumerate(obj)
+    else:
         return obj
+    copy = None
+    for k, v in items:
+        new = clean_value(v, path + (k,) if changes is not None else path, changes)
+        if new is not v:
+            if copy is None:
+                copy = obj.copy()
+            copy[k] = new
+    return obj if copy is None else copy
+
+@register_stage('clean_cjk', meta=True)
+def recursive_clean(obj):
+    return clean_value(obj)
+
+def _patch_path(path):
+    # The journal addresses dict keys only; a change inside a list patches the whole list
+    for i, part in enumerate(path):
+        if isinstance(part, int):
+            return path[:i]
+    return path
+
+def _get_path(value, path):
+    for part in path:
+        value = value[part]
+    return value
+
+def clean_library(library, apply=True):
+    """
+    Cleans a DNALibrary without rewriting it: changed record fields are
+    queued as journal patches (set_field), anything the journal cannot
+    address is replaced in library.data. Returns ([Change], whether a full
+    save is needed). With apply=False only the diff is computed.
+    """
+    changes = []
+    full_save = False
+    for name in library.collection_names():
+        records = library.collection(name)
+        for index, item in enumerate(records):
+            found = []
+            cleaned = clean_value(item, (), found)
+            if not found:
+                continue
+            key = record_key(item) if isinstance(item, dict) else None
+            changes.extend(Change(key, path, old, new) for path, old, new in found)
+            if not apply:
+                continue
+            if key is None or library.get(key) is not item:
+                records[index] = cleaned
+                full_save = True
+                continue
+            for path in dict.fromkeys(_patch_path(path) for path, _, _ in found):
+                library.set_field(key, list(path), _get_path(cleaned, path))
+    if not library.is_legacy_list:
+        for name, value in library.data.items():
+            if name in COLLECTIONS and isinstance(value, list):
+                continue
+            found = []
+            cleaned = clean_value(value, (name,), found)
+            if found:
+                changes.extend(Change(None, path, old, new) for path, old, new in found)
+                if apply:
+                    library.data[name] = cleaned
+                    full_save = True
+    if full_save:
+        library.reindex()
+    return changes, full_save
+
+def format_changes(changes, limit=None):
+    lines = []
+    for change in changes[:limit]:
+        lines.append(f"{change.key if change.key is not None else '<top level>'} {format_path(change.path) or '<value>'}")
+        lines.append(f"  - {change.old!r}")
+        lines.append(f"  + {change.new!r}")
+    if limit is not None and len(changes) > limit:
+        lines.append(f"... {len(changes) - limit} more")
+    records = len({change.key for change in changes if change.key is not None})
+    lines.append(f"{len(changes)} strings in {records} records cleaned.")
+    return '\n'.join(lines)
 
-    cleaned_data = recursive_clean(data)
-    
-    with open('templates.json', 'w', encoding='utf-8') as f:
-        json.dump(cleaned_data, f, indent=2, ensure_ascii=False)
+def clean_database(path=DEFAULT_PATH, dry_run=False, limit=None):
+    library = DNALibrary.load(path)
+    changes, full_save = clean_library(library, apply=not dry_run)
+    if changes:
+        print(format_changes(changes, limit))
+    if dry_run:
+        print("Dry run: nothing written." if changes else "No CJK found.")
+        return changes
+    if not changes:
+        print(f"Aggressive cleaning complete. No CJK found; {path} left untouched.")
+    elif full_save:
+        library.save()
         print("Aggressive cleaning complete.")
+    else:
+        written = library.commit()
+        print(f"Aggressive cleaning complete. {written} patches appended to the journal.")
+        print(compact_hint(path))
+    return changes
 
 if __name__ == "__main__":
-    clean_database()
+    parser = argparse.ArgumentParser(description="Strip the kana/kanji no translation pass could handle.")
+    parser.add_argument('input', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--dry-run', action='store_true', help='print the diff without writing anything')
+    parser.add_argument('--limit', type=int, default=None, help='changes to print (default: all)')
+    args = parser.parse_args()
+    clean_database(args.input, args.dry_run, args.limit)
@@ -0,0 +1,11 @@
+"""Shared tooling for the Darlkom DNA library (templates.json)."""
+
+__all__ = ["DNALibrary"]
+
+
+def __getattr__(name):
+    # Lazy so `python -m darlkom.<tool>` does not import its own module twice.
+    if name == "DNALibrary":
+        from darlkom.store import DNALibrary
+        return DNALibrary
+    raise AttributeError(f"module 'darlkom' has no attribute {name!r}")
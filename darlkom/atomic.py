@@ -0,0 +1,55 @@
+"""
+Atomic file replacement for every tool that rewrites a file in place.
+
+    atomic_write(path, lambda f: json.dump(data, f))
+    atomic_write(path, lambda f: f.write(raw), binary=True)
+
+The writer gets a temp file in the same directory as `path`. Once it
+returns, the file is flushed, fsynced and renamed over `path`, so readers
+and a crash mid-write see either the old file or the complete new one.
+If the writer raises, the temp file is removed and `path` is untouched.
+
+StreamWriter writes across many calls and only sometimes keeps the
+result, so it drives an AtomicFile directly: open(), write, then commit()
+to replace `path` and close() to drop the temp file either way.
+"""
+import os
+
+
+class AtomicFile:
+    def __init__(self, path, binary=False):
+        self.path = path
+        self.binary = binary
+        self.tmp_path = f"{path}.tmp{os.getpid()}"
+        self.f = None
+
+    def open(self):
+        if self.binary:
+            self.f = open(self.tmp_path, 'wb')
+        else:
+            self.f = open(self.tmp_path, 'w', encoding='utf-8')
+        return self.f
+
+    def commit(self):
+        """Makes the temp file durable and renames it over `path`."""
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.f.close()
+        os.replace(self.tmp_path, self.path)
+
+    def close(self):
+        """Closes and removes the temp file if it was not committed."""
+        if self.f is not None:
+            self.f.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def atomic_write(path, writer, binary=False):
+    """Calls `writer(f)` on a temp file and renames it over `path` if it returns."""
+    target = AtomicFile(path, binary)
+    try:
+        writer(target.open())
+        target.commit()
+    finally:
+        target.close()
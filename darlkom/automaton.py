@@ -0,0 +1,88 @@
+"""
+Multi-pattern replacement for the translation maps.
+
+    automaton = Automaton(TRANSLATION_MAP)
+    automaton.replace("背景色: 白")   # -> "Background Color: White"
+
+The string is rewritten in one left-to-right pass instead of one
+str.replace per dictionary key. Matches are leftmost-longest and never
+overlap: at each position the earliest-starting key wins, ties go to the
+longest key, and replaced text is not scanned again. The result no longer
+depends on dictionary order (with the old loop "背景色" could be eaten by
+an earlier "色" entry).
+
+The keys are compiled into a trie and the trie is emitted as a single
+regular expression ("背景色|背景" -> "背景(?:色)?"), so the scan runs in
+the re module's C matcher and costs one step per character of the
+longest partial match rather than one attempt per key. Branches are
+greedy, which gives longest-match at each start position; re.finditer
+supplies leftmost, non-overlapping scanning. A hand-written Aho-Corasick
+loop in Python was measured slower than the old str.replace loop on our
+~200-key maps, since every character went through the interpreter.
+"""
+import re
+
+
+def _trie(keys):
+    root = {}
+    for key in keys:
+        node = root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[''] = None  # end of a key
+    return root
+
+
+def _emit(node):
+    branches = [re.escape(char) + _emit(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if '' in node:
+        # A key ends here; try the longer continuations first, greedily.
+        return '(?:' + body + ')?'
+    return body
+
+
+def compile_pattern(keys):
+    """A regex matching any of `keys`, leftmost-longest under finditer/sub."""
+    return re.compile(_emit(_trie(keys)))
+
+
+class Automaton:
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        for key in self.mapping:
+            if not isinstance(key, str) or not key:
+                raise ValueError(f"translation keys must be non-empty strings, got {key!r}")
+        self.pattern = compile_pattern(self.mapping) if self.mapping else None
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def finditer(self, text):
+        """Yields (start, end, key) for each leftmost-longest, non-overlapping match."""
+        if self.pattern is None:
+            return
+        for match in self.pattern.finditer(text):
+            yield match.start(), match.end(), match.group()
+
+    def _substitute(self, match):
+        return self.mapping[match.group()]
+
+    def replace(self, text):
+        if self.pattern is None or not text:
+            return text
+        return self.pattern.sub(self._substitute, text)
+
+    def replace_tracking(self, text):
+        """Like replace(), also returning the keys that matched (in order, with repeats)."""
+        used = []
+        if self.pattern is None or not text:
+            return text, used
+
+        def substitute(match):
+            key = match.group()
+            used.append(key)
+            return self.mapping[key]
+        return self.pattern.sub(substitute, text), used
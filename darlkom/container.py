@@ -0,0 +1,138 @@
+"""
+Binary container shared by the columnar snapshot and the compiled lexicon.
+
+    MAGIC (8 bytes), uint32 directory length, JSON directory, padding to 8,
+    then the body: 8-aligned sections whose [offset, length] (relative to
+    the body) the directory holds.
+
+Writers fill a Body with sections, usually uint32 arrays, and intern
+their strings in a StringTable, whose offsets and UTF-8 blob become two
+more sections under directory["strings"]:
+
+    strings, body = StringTable(), Body()
+    directory = {"version": 1, "ids": body.section(array('I', [strings.intern(s) for s in words]))}
+    directory["strings"] = strings.sections(body)
+    write_container(path, MAGIC, directory, body)
+
+Container is the reader: it mmaps the file (or wraps bytes built in
+memory), checks the magic and version, and hands out zero-copy views of
+sections and strings decoded on first access.
+"""
+import json
+import mmap
+import struct
+from array import array
+
+from darlkom.atomic import atomic_write
+
+
+class StringTable:
+    """Interns strings to dense ids, in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+        self.offsets = array('I', [0])
+        self.blob = bytearray()
+
+    def intern(self, text):
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = len(self.ids)
+            self.ids[text] = string_id
+            self.blob += text.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return string_id
+
+    def sections(self, body):
+        """Appends the table to `body`; the result goes in directory["strings"]."""
+        return {"offsets": body.section(self.offsets), "blob": body.section(self.blob)}
+
+
+class Body:
+    def __init__(self):
+        self.buf = bytearray()
+
+    def section(self, data):
+        """Appends 8-aligned bytes and returns [offset, length] relative to the body."""
+        pad = -len(self.buf) % 8
+        self.buf += b'\0' * pad
+        offset = len(self.buf)
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        self.buf += raw
+        return [offset, len(raw)]
+
+
+def _prefix(magic, directory):
+    header = json.dumps(directory, ensure_ascii=False).encode('utf-8')
+    prefix = magic + struct.pack('<I', len(header)) + header
+    return prefix + b'\0' * (-len(prefix) % 8)
+
+
+def encode_container(magic, directory, body):
+    """The whole container as bytes, for readers that never touch disk."""
+    return _prefix(magic, directory) + body.buf
+
+
+def write_container(path, magic, directory, body):
+    prefix = _prefix(magic, directory)
+    atomic_write(path, lambda f: f.writelines((prefix, body.buf)), binary=True)
+    return path
+
+
+class Container:
+    """
+    Read-only view over a container file, or over `data` if given.
+    `kind` names the format in error messages ("DNA snapshot").
+    """
+
+    def __init__(self, path, magic, version, kind, data=None):
+        self.path = path
+        if data is None:
+            with open(path, 'rb') as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            data = self._mm
+        else:
+            self._mm = None
+        if data[:len(magic)] != magic:
+            raise ValueError(f"{path} is not a {kind}")
+        (header_len,) = struct.unpack_from('<I', data, len(magic))
+        header_start = len(magic) + 4
+        self.directory = json.loads(bytes(data[header_start:header_start + header_len]).decode('utf-8'))
+        if self.directory.get("version") != version:
+            raise ValueError(f"{path} has unsupported {kind} version {self.directory.get('version')}")
+        body_start = header_start + header_len
+        self._body = body_start + (-body_start % 8)
+        self._buffer = memoryview(data)
+        self._views = []
+        self._strings = {}
+        strings = self.directory.get("strings")
+        self._string_offsets = self.view(strings["offsets"], 'I') if strings else None
+        self._blob = strings["blob"][0] if strings else None
+
+    def view(self, section, fmt):
+        """A memoryview of one section, cast to `fmt` ('I', 'd', 'q', ...)."""
+        offset, length = section
+        start = self._body + offset
+        raw = self._buffer[start:start + length]
+        view = raw.cast(fmt)
+        self._views += (view, raw)
+        return view
+
+    def string(self, string_id):
+        text = self._strings.get(string_id)
+        if text is None:
+            start = self._body + self._blob
+            lo, hi = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+            text = str(self._buffer[start + lo:start + hi], 'utf-8')
+            self._strings[string_id] = text
+        return text
+
+    def close(self):
+        """Releases every view handed out, so the mmap can close even if callers still hold some."""
+        self._string_offsets = None
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._buffer.release()
+        if self._mm is not None:
+            self._mm.close()
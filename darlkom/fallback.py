@@ -0,0 +1,243 @@
+"""
+LLM fallback for Japanese text that no dictionary covers.
+
+    translator = FallbackTranslator(target='ko', memory=memory)
+    translator.run(library)     # collect -> translate -> rewrite
+
+After the dictionary passes, every run of kana/kanji still in the library
+(the same characters clean_cjk would strip) is collected and deduplicated,
+so a phrase left in 300 records is one item. Items already in the
+translation memory are answered from it; the rest go to an
+OpenAI-compatible chat endpoint `batch_size` at a time as a JSON list,
+with at most `concurrency` requests in flight (asyncio + a semaphore).
+Results are written back to the memory, so a second run makes no calls.
+
+The endpoint is `base_url` (or $DARLKOM_LLM_BASE_URL), which can point at
+a local server speaking the /chat/completions API; api.openai.com needs
+`api_key` or $OPENAI_API_KEY. The constructor checks both, and that
+openai is installed, so a misconfigured run fails before any stage. A
+batch that fails or returns malformed JSON is skipped and its text is
+left as it was; the openai client already retries transient errors.
+
+Needs the `openai` package; nothing else in darlkom imports it.
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import Counter
+
+from darlkom.memory import _hash
+from darlkom.scripts import JAPANESE, pattern
+
+try:
+    from openai import AsyncOpenAI, OpenAIError
+except ImportError:  # only the fallback needs it
+    AsyncOpenAI = OpenAIError = None
+
+BASE_URL_ENV = 'DARLKOM_LLM_BASE_URL'
+DEFAULT_MODEL = 'gpt-4o-mini'
+DEFAULT_BATCH_SIZE = 40
+DEFAULT_CONCURRENCY = 4
+PROMPT_VERSION = 1
+
+# The characters clean_cjk strips: kana and CJK ideographs.
+RESIDUE_PATTERN = pattern(JAPANESE)
+
+LANGUAGES = {'ko': 'Korean', 'en': 'English'}
+
+_PROMPT = (
+    "You translate Japanese fragments from graphic-design style descriptions into {language}. "
+    "The user sends a JSON array of strings. Reply with only a JSON object that maps every "
+    "input string, unchanged, to its {language} translation. Keep design terms short."
+)
+
+
+def _strings(value):
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def collect_residue(data):
+    """Counter of each untranslated Japanese run in `data` (any JSON value)."""
+    residue = Counter()
+    for text in _strings(data):
+        residue.update(RESIDUE_PATTERN.findall(text))
+    return residue
+
+
+def rewrite(value, translations):
+    """A copy of `value` with every translated run replaced."""
+    if isinstance(value, str):
+        if not RESIDUE_PATTERN.search(value):
+            return value
+        return RESIDUE_PATTERN.sub(lambda m: translations.get(m.group(), m.group()), value)
+    if isinstance(value, dict):
+        return {k: rewrite(v, translations) for k, v in value.items()}
+    if isinstance(value, list):
+        return [rewrite(v, translations) for v in value]
+    return value
+
+
+class FallbackTranslator:
+    """
+    Raises ValueError for a bad setting or when no endpoint credentials are
+    configured, RuntimeError when the openai package is missing.
+    """
+
+    def __init__(self, target='ko', model=DEFAULT_MODEL, base_url=None, api_key=None,
+                 batch_size=DEFAULT_BATCH_SIZE, concurrency=DEFAULT_CONCURRENCY, memory=None):
+        if target not in LANGUAGES:
+            raise ValueError(f"unsupported fallback target {target!r}")
+        if batch_size < 1 or concurrency < 1:
+            raise ValueError("batch_size and concurrency must be at least 1")
+        if AsyncOpenAI is None:
+            raise RuntimeError("the LLM fallback needs the openai package (pip install openai)")
+        self.target = target
+        self.model = model
+        self.base_url = base_url or os.getenv(BASE_URL_ENV)
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        if not self.api_key:
+            if not self.base_url:
+                raise ValueError(f"the LLM fallback needs OPENAI_API_KEY, or an endpoint via "
+                                 f"--llm-base-url / ${BASE_URL_ENV}")
+            self.api_key = 'unused'  # local OpenAI-compatible servers usually ignore it
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.memory = memory
+        # Memory entries are only reused for the same model and prompt.
+        self.version = _hash(json.dumps(['llm-fallback', model, PROMPT_VERSION]))
+        self.occurrences = 0
+        self.unique = 0
+        self.cached = 0
+        self.translated = 0
+        self.requests = 0
+        self.failed = 0
+
+    def _client(self):
+        return AsyncOpenAI(base_url=self.base_url, api_key=self.api_key)
+
+    async def _translate_batch(self, client, semaphore, batch):
+        async with semaphore:
+            self.requests += 1
+            try:
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": _PROMPT.format(language=LANGUAGES[self.target])},
+                        {"role": "user", "content": json.dumps(batch, ensure_ascii=False)},
+                    ],
+                    response_format={"type": "json_object"},
+                    temperature=0,
+                )
+                reply = json.loads(response.choices[0].message.content or '')
+            except (OpenAIError, ValueError, IndexError) as e:
+                self.failed += 1
+                print(f"llm fallback: batch of {len(batch)} failed: {e}")
+                return {}
+        if not isinstance(reply, dict):
+            self.failed += 1
+            print(f"llm fallback: batch of {len(batch)} failed: expected a JSON object")
+            return {}
+        return {text: reply[text].strip() for text in batch
+                if isinstance(reply.get(text), str) and reply[text].strip()}
+
+    async def _translate_batches(self, batches):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._client() as client:
+            results = await asyncio.gather(*(self._translate_batch(client, semaphore, batch) for batch in batches))
+        merged = {}
+        for result in results:
+            merged.update(result)
+        return merged
+
+    def translate(self, texts):
+        """{text: translation} for as many of `texts` as the memory or the model could answer."""
+        texts = list(dict.fromkeys(texts))
+        found = self.memory.recall(self.version, self.target, texts) if self.memory is not None else {}
+        self.cached += len(found)
+        pending = [text for text in texts if text not in found]
+        if pending:
+            batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            fresh = asyncio.run(self._translate_batches(batches))
+            self.translated += len(fresh)
+            if self.memory is not None:
+                self.memory.remember(self.version, self.target, fresh)
+            found.update(fresh)
+        return found
+
+    def run(self, library):
+        """Translates the library's residue in place. Returns the translations used."""
+        residue = collect_residue(library.data)
+        self.occurrences += sum(residue.values())
+        self.unique += len(residue)
+        translations = self.translate(text for text, _ in residue.most_common()) if residue else {}
+        if translations:
+            library.transform(lambda record, collection: rewrite(record, translations),
+                              lambda value: rewrite(value, translations))
+        return translations
+
+    def format_stats(self):
+        return (f"llm fallback: {self.occurrences} untranslated runs, {self.unique} unique, "
+                f"{self.cached} from memory, {self.translated} translated in {self.requests} requests"
+                + (f" ({self.failed} failed)" if self.failed else ""))
+
+
+def add_fallback_arguments(parser, flag=True):
+    """`--llm-*` options read by from_args(); flag=True also adds --llm-fallback to enable it."""
+    if flag:
+        parser.add_argument('--llm-fallback', action='store_true',
+                            help='send Japanese no dictionary covered to an LLM (before clean_cjk)')
+    parser.add_argument('--llm-base-url', default=None,
+                        help=f'OpenAI-compatible endpoint (default: ${BASE_URL_ENV}, else api.openai.com)')
+    parser.add_argument('--llm-model', default=DEFAULT_MODEL)
+    parser.add_argument('--llm-target', default='ko', choices=sorted(LANGUAGES))
+    parser.add_argument('--llm-batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='strings per request')
+    parser.add_argument('--llm-concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help='requests in flight at once')
+    return parser
+
+
+def from_args(args, memory=None, parser=None):
+    """The translator for parsed `--llm-*` options; with `parser`, a bad setup exits via parser.error()."""
+    try:
+        return FallbackTranslator(args.llm_target, args.llm_model, args.llm_base_url,
+                                  batch_size=args.llm_batch_size, concurrency=args.llm_concurrency, memory=memory)
+    except (RuntimeError, ValueError) as e:
+        if parser is None:
+            raise
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    from darlkom.memory import memory_session
+    from darlkom.store import DEFAULT_PATH, DNALibrary
+
+    parser = argparse.ArgumentParser(description="Translate the Japanese left in the library with an LLM.")
+    parser.add_argument('input', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--output', default=None, help='write here instead of in place')
+    parser.add_argument('--dry-run', action='store_true', help='list the residue without calling the model')
+    add_fallback_arguments(parser, flag=False)
+    args = parser.parse_args()
+    translator = None if args.dry_run else from_args(args, parser=parser)
+
+    library = DNALibrary.load(args.input)
+    if args.dry_run:
+        residue = collect_residue(library.data)
+        for text, count in residue.most_common():
+            print(f"{count:>6}  {text}")
+        print(f"{sum(residue.values())} untranslated runs, {len(residue)} unique")
+    else:
+        with memory_session(tables=[]) as memory:
+            translator.memory = memory
+            translator.run(library)
+            print(translator.format_stats())
+        if not library.save(args.output):
+            print("Nothing translated; file left untouched.")
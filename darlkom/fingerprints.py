@@ -0,0 +1,185 @@
+"""
+Per-record content fingerprints and dirty tracking.
+
+A fingerprint is a short hash of a record's compact JSON (key order
+included, so anything that would change the saved file changes the hash).
+Writers keep a sidecar next to the file they wrote, e.g.
+templates.json.fingerprints:
+
+    {"version": 1, "stat": [size, mtime_ns],
+     "meta": {"deck_consistency": "9f2c..."},
+     "collections": {"styles_v2": [["DNA_001", "a41e..."], ...]}}
+
+`stat` ties the sidecar to the exact file it describes; if the file was
+replaced behind our back the sidecar is ignored and everything counts as
+dirty. DNALibrary.save() and StreamWriter skip the write when the new
+fingerprints equal the sidecar's.
+
+Downstream builders (search index, thumbnails) use a BuildCache to keep a
+per-record result keyed by fingerprint and only redo records that changed.
+"""
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+from darlkom.atomic import atomic_write
+
+FINGERPRINT_SUFFIX = '.fingerprints'
+FORMAT_VERSION = 1
+HASH_LENGTH = 16
+
+# Collection name used for the flat legacy list layout.
+LIST_COLLECTION = ''
+
+Changes = namedtuple('Changes', 'added changed removed')
+
+
+def fingerprint_path(path):
+    return path + FINGERPRINT_SUFFIX
+
+
+def fingerprint(value):
+    raw = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]
+
+
+def _key_of(item):
+    # Same rule as store.record_key, without importing store.
+    if isinstance(item, dict):
+        return item['module_id'] if 'module_id' in item else item.get('id')
+    return None
+
+
+def record_fingerprint(item):
+    """The [key, fingerprint] pair stored for one record."""
+    return [_key_of(item), fingerprint(item)]
+
+
+def collection_fingerprints(records):
+    return [record_fingerprint(item) for item in records]
+
+
+def data_fingerprints(data, collections):
+    """Fingerprints of a whole library document (dict or flat-list layout)."""
+    if isinstance(data, list):
+        return {"meta": {}, "collections": {LIST_COLLECTION: collection_fingerprints(data)}}
+    meta = {}
+    records = {}
+    for key, value in data.items():
+        if key in collections and isinstance(value, list):
+            records[key] = collection_fingerprints(value)
+        else:
+            meta[key] = fingerprint(value)
+    return {"meta": meta, "collections": records}
+
+
+def _stat(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def read_manifest(path):
+    """The fingerprints recorded for `path`, or None if missing or stale."""
+    try:
+        with open(fingerprint_path(path), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get("version") != FORMAT_VERSION or manifest.get("stat") != _stat(path):
+            return None
+    except (OSError, ValueError):
+        return None
+    return {"meta": manifest.get("meta", {}), "collections": manifest.get("collections", {})}
+
+
+def write_manifest(path, fingerprints):
+    """Records `fingerprints` as describing the file currently at `path`."""
+    manifest = {"version": FORMAT_VERSION, "stat": _stat(path)}
+    manifest.update(fingerprints)
+    _write_json(fingerprint_path(path), manifest)
+
+
+def is_dirty(path, fingerprints):
+    return read_manifest(path) != fingerprints
+
+
+def diff(old, new):
+    """
+    Record-level Changes between two fingerprint sets, as (collection, key)
+    pairs. `old` may be None (unknown: everything in `new` is added).
+    """
+    def flat(fps):
+        if not fps:
+            return {}
+        return {(name, key): fp
+                for name, pairs in fps["collections"].items()
+                for key, fp in pairs}
+
+    before, after = flat(old), flat(new)
+    added = [k for k in after if k not in before]
+    changed = [k for k in after if k in before and before[k] != after[k]]
+    removed = [k for k in before if k not in after]
+    return Changes(added, changed, removed)
+
+
+def write_if_changed(path, raw):
+    """Atomically writes bytes to `path` unless it already holds exactly them."""
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == raw:
+                return False
+    atomic_write(path, lambda f: f.write(raw), binary=True)
+    return True
+
+
+def _write_json(path, value):
+    atomic_write(path, lambda f: json.dump(value, f, ensure_ascii=False, separators=(',', ':')))
+
+
+class BuildCache:
+    """
+    Per-record build results keyed by record fingerprint, for tools that
+    derive something from each record (search grams, thumbnails).
+
+        cache = BuildCache(fingerprint_path(output_path))
+        value = cache.get(key, fp)
+        if value is None:
+            value = expensive(record)
+            cache.put(key, fp, value)
+        cache.save()   # drops entries not seen this run
+
+    Values must be JSON-serializable and not None.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.seen = {}
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") == FORMAT_VERSION:
+                self.entries = cache.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, key, fp):
+        entry = self.entries.get(str(key))
+        if entry is not None and entry[0] == fp:
+            self.hits += 1
+            self.seen[str(key)] = entry
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def put(self, key, fp, value):
+        self.seen[str(key)] = [fp, value]
+
+    def save(self):
+        if self.seen == self.entries:
+            return False
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        _write_json(self.path, {"version": FORMAT_VERSION, "entries": self.seen})
+        self.entries = dict(self.seen)
+        return True
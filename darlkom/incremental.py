@@ -0,0 +1,104 @@
+"""
+State for `--incremental` translation runs.
+
+Each script keeps templates.json.<script>.state with a hash per record of
+the fields it translates, taken after its last successful run:
+
+    {"version": 2, "fields": ["elaboration"],
+     "tables": [["batch_en_ko", "c81d..."]], "records": {"17": "3fa0..."}}
+
+On the next run a record whose hash still matches was already handled and
+is passed through untouched, so appending a batch of new DNAs only costs
+the new ones. `fields=None` hashes the whole record, for the translators
+that walk every string. Records without a key are always processed.
+
+`tables` are the TranslationTables the script translates with, stored as
+a hash of their entries. A dictionary edit (a lexicon .tsv, a map in a
+script) changes that hash and the whole previous state is dropped, so
+records handled with the old entries are translated again.
+
+    state = IncrementalState.for_script(path, 'translate_db', SOURCE_FIELDS, [TRANSLATOR])
+    library.transform(state.wrap(record_fn))
+    library.save()
+    state.save()
+"""
+import json
+
+from darlkom.atomic import atomic_write
+from darlkom.fingerprints import fingerprint
+from darlkom.store import record_key
+
+FORMAT_VERSION = 2
+
+
+def state_path(library_path, name):
+    return f"{library_path}.{name}.state"
+
+
+def table_digests(tables):
+    """[name, hash of the entries in order] per table."""
+    return [[table.name, fingerprint(list(table.mapping.items()))] for table in tables]
+
+
+class IncrementalState:
+    def __init__(self, path, fields=None, tables=()):
+        self.path = path
+        self.fields = list(fields) if fields is not None else None
+        self.tables = table_digests(tables)
+        self.previous = {}
+        self.current = {}
+        self.skipped = 0
+        self.processed = 0
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            # A different field list means the hashes are not comparable, and
+            # different dictionaries mean the last run's output is stale.
+            if (state.get("version") == FORMAT_VERSION and state.get("fields") == self.fields
+                    and state.get("tables") == self.tables):
+                self.previous = state.get("records", {})
+        except (OSError, ValueError):
+            pass
+
+    @classmethod
+    def for_script(cls, library_path, name, fields=None, tables=()):
+        return cls(state_path(library_path, name), fields, tables)
+
+    def digest(self, item):
+        if self.fields is None or not isinstance(item, dict):
+            return fingerprint(item)
+        return fingerprint([item.get(field) for field in self.fields])
+
+    def unchanged(self, item):
+        """True if `item` is exactly as the last successful run left it."""
+        key = record_key(item)
+        if key is not None and self.previous.get(str(key)) == self.digest(item):
+            self.skipped += 1
+            return True
+        self.processed += 1
+        return False
+
+    def remember(self, item):
+        key = record_key(item)
+        if key is not None:
+            self.current[str(key)] = self.digest(item)
+
+    def wrap(self, record_fn):
+        """record_fn(record, collection) that skips unchanged records and remembers results."""
+        def incremental(record, collection):
+            if not self.unchanged(record):
+                record = record_fn(record, collection)
+            if record is not None:
+                self.remember(record)
+            return record
+        return incremental
+
+    def save(self, records=None):
+        """Call after the output was written. `records` are remembered first, if given."""
+        for item in records or ():
+            self.remember(item)
+        state = {"version": FORMAT_VERSION, "fields": self.fields, "tables": self.tables, "records": self.current}
+        atomic_write(self.path, lambda f: json.dump(state, f, ensure_ascii=False, separators=(',', ':')))
+
+    def format_stats(self):
+        return f"incremental: {self.processed} processed, {self.skipped} unchanged and skipped"
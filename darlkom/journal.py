@@ -0,0 +1,165 @@
+"""
+Write-ahead patch journal for templates.json.
+
+Each edit is appended as one JSON line next to the library file
+(`templates.json.journal`), so the cost of a write scales with the change,
+not with the library. `compact()` folds the journal into a fresh snapshot
+that replaces templates.json atomically.
+
+Patch lines:
+    {"op": "set", "key": "DNA_001", "path": ["elaboration"], "value": "..."}
+    {"op": "add", "key": "DNA_300", "collection": "styles_v2", "value": {...}}
+
+Both operations are idempotent, so replaying a journal over a snapshot that
+already contains some of its patches (crash between rename and truncate)
+is harmless.
+"""
+import json
+import os
+
+from darlkom.atomic import atomic_write
+
+JOURNAL_SUFFIX = '.journal'
+
+
+def journal_path(library_path):
+    return library_path + JOURNAL_SUFFIX
+
+
+class JournalError(ValueError):
+    """A journal line that cannot be read or applied; the message names the file and line."""
+
+
+def check_path(record, path):
+    """
+    Raises ValueError unless `set_path(record, path, ...)` can apply: `path`
+    is a non-empty list of keys and every value along it that already
+    exists is an object. Missing objects are created by set_path.
+    """
+    if not path:
+        raise ValueError("empty field path")
+    target = record
+    for depth, part in enumerate(path):
+        if not isinstance(part, str):
+            raise ValueError(f"path part {part!r} is not a key")
+        if depth == len(path) - 1 or target is None:
+            continue
+        target = target.get(part)
+        if target is not None and not isinstance(target, dict):
+            where = '.'.join(path[:depth + 1])
+            raise ValueError(f"{where} is {type(target).__name__}, not an object")
+
+
+def set_path(record, path, value):
+    check_path(record, path)
+    target = record
+    for part in path[:-1]:
+        if target.get(part) is None:
+            target[part] = {}
+        target = target[part]
+    target[path[-1]] = value
+
+
+class PatchJournal:
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def append(self, patches):
+        """Appends patches as a single write and fsyncs before returning."""
+        if not patches:
+            return 0
+        lines = ''.join(json.dumps(p, ensure_ascii=False) + '\n' for p in patches)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(patches)
+
+    def __iter__(self):
+        for _, patch in self.lines():
+            yield patch
+
+    def lines(self):
+        """Yields (line number, patch) for every complete line."""
+        if not self.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.endswith('\n'):
+                    # Torn final line from an interrupted append; it was never acknowledged.
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    raise JournalError(f"{self.path}:{number}: not a JSON patch ({e})") from None
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def clear(self):
+        if self.exists():
+            os.remove(self.path)
+
+
+def replay(library, journal):
+    """
+    Applies every journaled patch to an in-memory DNALibrary. Returns the
+    patch count. Raises JournalError naming the journal line of the first
+    patch that does not apply.
+    """
+    count = 0
+    for number, patch in journal.lines():
+        count += 1
+        try:
+            op = patch.get('op', 'set')
+            if op == 'set':
+                record = library.get(patch['key'])
+                if record is not None:
+                    set_path(record, patch['path'], patch['value'])
+            elif op == 'add':
+                library.add(patch['value'], patch.get('collection', 'styles_v2'))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            detail = f"missing {e}" if isinstance(e, KeyError) else str(e)
+            raise JournalError(f"{journal.path}:{number}: cannot apply patch: {detail}") from None
+    if count:
+        library.reindex()
+    return count
+
+
+def write_snapshot(data, path):
+    """Writes `data` to a temp file in the same directory and renames it over `path`."""
+    atomic_write(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False))
+
+
+def compact_hint(path='templates.json'):
+    """What to print after journaling edits: `path` itself, which is what gets deployed, is unchanged."""
+    return f"{path} itself is unchanged until they are compacted: python -m darlkom.journal {path}"
+
+
+def compact(path='templates.json'):
+    """Folds the journal for `path` into a new snapshot. Returns the number of patches applied."""
+    from darlkom.store import DNALibrary
+
+    library = DNALibrary.load(path)
+    applied = library.replayed
+    if applied:
+        library.save()
+    return applied
+
+
+if __name__ == "__main__":
+    import sys
+
+    target = sys.argv[1] if len(sys.argv) > 1 else 'templates.json'
+    pending = len(PatchJournal(journal_path(target)))
+    if not pending:
+        print(f"No journaled patches for {target}.")
+    else:
+        compact(target)
+        print(f"Compacted {pending} patches into {target}.")
@@ -0,0 +1,240 @@
+"""
+Translation lexicons, kept as data files and compiled to an mmap-able binary.
+
+The dictionaries live in lexicons/<source>-<target>.tsv, one entry per line:
+
+    背景色<TAB>Background Color<TAB>jp_en,report_headers
+
+The third column names the translation tables that use the entry, so a
+pair shared by several translators is written once; a table's target
+language comes from the file name. `#` starts a comment line.
+
+`python -m darlkom.lexicon` (or the first lexicon_table() call after a
+.tsv changed) compiles every file into lexicons/lexicons.bin, a
+darlkom.container whose sections are the interned string table (shared
+by all tables) and per table three uint32 arrays -- key ids and value ids
+in file order, and the entry positions sorted by key. Where lexicons/ is
+not writable (a read-only install), the same bytes are compiled in memory
+for the process instead.
+
+Readers mmap the file. `lexicon_table(name)` wraps a table in a shared
+TranslationTable whose mapping decodes strings on access and finds keys
+by binary search over the sorted positions, so a script that only looks up
+a few tokens never builds a dict; replace() still compiles the table's
+trie regex (darlkom.automaton) on first use.
+"""
+import os
+import re
+from array import array
+from collections.abc import Mapping
+
+from darlkom.container import Body, Container, StringTable, encode_container, write_container
+from darlkom.translation import translation_table
+
+MAGIC = b'DNALEX01'
+FORMAT_VERSION = 1
+LEXICON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'lexicons')
+BINARY_NAME = 'lexicons.bin'
+
+_ESCAPE = re.compile(r'\\(.?)')
+_ESCAPES = {'t': '\t', 'n': '\n', '\\': '\\'}
+
+_loaded = {}
+_tables = {}
+
+
+def _unescape_char(match):
+    char = _ESCAPES.get(match.group(1))
+    if char is None:
+        raise ValueError(f"bad escape \\{match.group(1)}")
+    return char
+
+
+def source_files(directory=LEXICON_DIR):
+    return sorted(name for name in os.listdir(directory) if name.endswith('.tsv'))
+
+
+def read_source(path):
+    """Yields (source, target, table names) for each entry line of a .tsv lexicon."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split('\t')
+            if len(fields) != 3:
+                raise ValueError(f"{path}:{lineno}: expected source<TAB>target<TAB>tables")
+            source, target = (_ESCAPE.sub(_unescape_char, field) for field in fields[:2])
+            tables = [name.strip() for name in fields[2].split(',') if name.strip()]
+            if not source or not tables:
+                raise ValueError(f"{path}:{lineno}: empty source or table list")
+            yield source, target, tables
+
+
+def _source_stats(directory, names):
+    stats = {}
+    for name in names:
+        stat = os.stat(os.path.join(directory, name))
+        stats[name] = [stat.st_size, stat.st_mtime_ns]
+    return stats
+
+
+def compile_lexicon(directory=LEXICON_DIR):
+    """Compiles every .tsv in `directory`. Returns the container (directory, Body)."""
+    names = source_files(directory)
+    entries = {}
+    targets = {}
+    for name in names:
+        target_lang = os.path.splitext(name)[0].rpartition('-')[2]
+        path = os.path.join(directory, name)
+        for source, target, tables in read_source(path):
+            for table in tables:
+                if targets.setdefault(table, target_lang) != target_lang:
+                    raise ValueError(f"{path}: table {table} already targets {targets[table]}")
+                mapping = entries.setdefault(table, {})
+                if source in mapping:
+                    raise ValueError(f"{path}: duplicate key {source!r} in table {table}")
+                mapping[source] = target
+
+    strings = StringTable()
+    body = Body()
+    directory_json = {"version": FORMAT_VERSION, "tables": {}}
+    for table, mapping in entries.items():
+        keys = list(mapping)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        directory_json["tables"][table] = {
+            "target": targets[table],
+            "keys": body.section(array('I', [strings.intern(k) for k in keys])),
+            "values": body.section(array('I', [strings.intern(v) for v in mapping.values()])),
+            "order": body.section(array('I', order)),
+        }
+    directory_json["strings"] = strings.sections(body)
+    directory_json["sources"] = _source_stats(directory, names)
+    return directory_json, body
+
+
+def build_lexicon(directory=LEXICON_DIR, output_path=None):
+    """Compiles every .tsv in `directory` into one binary lexicon file."""
+    output_path = output_path or os.path.join(directory, BINARY_NAME)
+    return write_container(output_path, MAGIC, *compile_lexicon(directory))
+
+
+# -- Reading ---------------------------------------------------------------
+
+class LexiconMapping(Mapping):
+    """Read-only key -> translation view of one compiled table, in file order."""
+
+    def __init__(self, lexicon, spec):
+        self.target = spec["target"]
+        self._string = lexicon.string
+        self._keys = lexicon.view(spec["keys"], 'I')
+        self._values = lexicon.view(spec["values"], 'I')
+        self._order = lexicon.view(spec["order"], 'I')
+
+    def _find(self, key):
+        string, keys, order = self._string, self._keys, self._order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if string(keys[order[mid]]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and string(keys[order[lo]]) == key:
+            return order[lo]
+        return None
+
+    def __getitem__(self, key):
+        position = self._find(key) if isinstance(key, str) else None
+        if position is None:
+            raise KeyError(key)
+        return self._string(self._values[position])
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._find(key) is not None
+
+    def __iter__(self):
+        string = self._string
+        return (string(i) for i in self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class Lexicon(Container):
+    """
+    Read-only mmap view over a file written by `build_lexicon`, or over
+    `data` from encode_container() when the file could not be written.
+    """
+
+    def __init__(self, path, data=None):
+        super().__init__(path, MAGIC, FORMAT_VERSION, 'compiled lexicon', data)
+        self._mappings = {}
+
+    def table_names(self):
+        return list(self.directory["tables"])
+
+    def mapping(self, name):
+        mapping = self._mappings.get(name)
+        if mapping is None:
+            spec = self.directory["tables"].get(name)
+            if spec is None:
+                raise KeyError(f"no lexicon table named {name!r} in {self.path}")
+            mapping = self._mappings[name] = LexiconMapping(self, spec)
+        return mapping
+
+    def is_fresh(self, directory=LEXICON_DIR):
+        try:
+            return self.directory.get("sources") == _source_stats(directory, source_files(directory))
+        except FileNotFoundError:
+            return False
+
+    def close(self):
+        self._mappings = {}
+        super().close()
+
+
+def load_lexicon(directory=LEXICON_DIR):
+    """
+    The compiled lexicon for `directory`, rebuilt first if any .tsv changed.
+    If lexicons.bin cannot be written, the rebuilt lexicon lives in memory.
+    """
+    lexicon = _loaded.get(directory)
+    if lexicon is not None:
+        return lexicon
+    path = os.path.join(directory, BINARY_NAME)
+    try:
+        lexicon = Lexicon(path)
+    except (OSError, ValueError):
+        lexicon = None
+    if lexicon is None or not lexicon.is_fresh(directory):
+        if lexicon is not None:
+            lexicon.close()  # Windows cannot replace a mapped file
+        try:
+            build_lexicon(directory, path)
+            lexicon = Lexicon(path)
+        except OSError:
+            lexicon = Lexicon(path, encode_container(MAGIC, *compile_lexicon(directory)))
+    _loaded[directory] = lexicon
+    return lexicon
+
+
+def lexicon_table(name, directory=LEXICON_DIR):
+    """The shared TranslationTable for lexicon table `name`."""
+    key = (directory, name)
+    table = _tables.get(key)
+    if table is None:
+        mapping = load_lexicon(directory).mapping(name)
+        table = _tables[key] = translation_table(mapping, name, mapping.target)
+    return table
+
+
+if __name__ == "__main__":
+    import sys
+
+    directory = sys.argv[1] if len(sys.argv) > 1 else LEXICON_DIR
+    path = build_lexicon(directory)
+    lexicon = Lexicon(path)
+    for name in lexicon.table_names():
+        print(f"{name}: {len(lexicon.mapping(name))} entries -> {lexicon.mapping(name).target}")
+    print(f"Lexicon written to {path} ({os.path.getsize(path)} bytes).")
@@ -0,0 +1,218 @@
+"""
+Persistent translation memory (SQLite).
+
+Each entry is keyed by (source text hash, table version, target language)
+and stores the source text, the translated text and the dictionary keys
+that matched. A table's version is its name and method only, so editing
+the dictionary invalidates just the entries the edit can reach:
+
+- Changing or removing a key: only entries whose `used` keys include it.
+  Each entry keeps a hash of the (key, value) pairs it used, checked on
+  read; a removed key reads as None and fails the check. A key that did
+  not match lost to a longer or earlier one, so dropping it changes
+  nothing elsewhere.
+- Adding a key: only entries whose source text contains it, since a key
+  can only match where it occurs. The key set each table was last used
+  with is stored, and on load the entries containing an added key are
+  dropped.
+
+Rows for a table version are read with one SELECT the first time the table
+is used and new rows are written in one transaction on flush(), so a hit
+costs a dict lookup and a small hash.
+
+Translations that do not come from a table (darlkom.fallback) are stored
+with recall()/remember() under a version their producer chooses, with no
+dependencies.
+
+    with memory_session():          # attaches to every translation_table
+        translate_recursive(data)
+"""
+import hashlib
+import json
+import sqlite3
+from collections import namedtuple
+from contextlib import contextmanager
+
+from darlkom.translation import shared_tables
+
+MEMORY_PATH = '.translation-memory.sqlite3'
+
+# Bumped when the tables change shape; an older file is cleared, it is only a cache.
+SCHEMA_VERSION = 2
+
+_Entry = namedtuple('_Entry', 'source result used deps')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory (
+    source_hash TEXT NOT NULL,
+    version     TEXT NOT NULL,
+    target      TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    result      TEXT NOT NULL,
+    used        TEXT NOT NULL,
+    deps        TEXT NOT NULL,
+    PRIMARY KEY (source_hash, version, target)
+);
+CREATE TABLE IF NOT EXISTS table_keys (
+    version     TEXT NOT NULL,
+    target      TEXT NOT NULL,
+    keys        TEXT NOT NULL,
+    PRIMARY KEY (version, target)
+);
+"""
+
+
+def _hash(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def table_version(table, method='replace'):
+    """
+    Stable across dictionary edits for a named table; the key set only
+    tells apart anonymous tables, which have nothing else to go by.
+    """
+    parts = [table.name] if table.name else [None, sorted(table.mapping)]
+    if method != 'replace':
+        parts.append(method)  # segment() splits text differently from replace()
+    return _hash(json.dumps(parts, ensure_ascii=False))
+
+
+def _deps(mapping, used):
+    return _hash(json.dumps([[key, mapping.get(key)] for key in used], ensure_ascii=False))
+
+
+class TranslationMemory:
+    def __init__(self, path=MEMORY_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        (schema,) = self.conn.execute("PRAGMA user_version").fetchone()
+        if schema != SCHEMA_VERSION:
+            with self.conn:
+                self.conn.execute("DROP TABLE IF EXISTS memory")
+                self.conn.execute("DROP TABLE IF EXISTS table_keys")
+                self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(_SCHEMA)
+        self._loaded = {}
+        self._rows = {}
+        self._dirty = []
+        self._dropped = []
+        self._keys = []
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def _load(self, key):
+        entries = self._rows.get(key)
+        if entries is None:
+            rows = self.conn.execute(
+                "SELECT source_hash, source, result, used, deps FROM memory WHERE version = ? AND target = ?", key)
+            entries = self._rows[key] = {h: _Entry(source, result, json.loads(used), deps)
+                                         for h, source, result, used, deps in rows}
+        return entries
+
+    def _entries(self, table, method):
+        loaded = self._loaded.get((id(table), method))
+        if loaded is None or loaded[0] is not table:
+            key = (table_version(table, method), table.target or '')
+            entries = self._load(key)
+            self._check_added(table, key, entries)
+            loaded = self._loaded[(id(table), method)] = (table, key, entries)
+        return loaded[1], loaded[2]
+
+    def _check_added(self, table, key, entries):
+        # Drops the entries whose source contains a key added since the table was last used.
+        row = self.conn.execute("SELECT keys FROM table_keys WHERE version = ? AND target = ?", key).fetchone()
+        known = set(json.loads(row[0])) if row else set()
+        current = set(table.mapping)
+        if current == known:
+            return
+        added = current - known
+        if added and entries:
+            for source_hash, entry in list(entries.items()):
+                if any(k in entry.source for k in added):
+                    # deps None never matches, so the next read counts it as re-translated
+                    entries[source_hash] = entry._replace(deps=None)
+                    self._dropped.append((source_hash,) + key)
+        self._keys.append(key + (json.dumps(sorted(current), ensure_ascii=False),))
+
+    def translate(self, table, text, method='replace'):
+        """table.replace(text), or table.segment(text) for method="segment", answered from memory when still valid."""
+        key, entries = self._entries(table, method)
+        source_hash = _hash(text)
+        entry = entries.get(source_hash)
+        if entry is not None:
+            if _deps(table.mapping, entry.used) == entry.deps:
+                self.hits += 1
+                return entry.result
+            self.stale += 1
+        else:
+            self.misses += 1
+        matcher = table.segmenter if method == 'segment' else table.automaton
+        result, used = matcher.replace_tracking(text)
+        used = sorted(set(used))
+        entry = _Entry(text, result, used, _deps(table.mapping, used))
+        entries[source_hash] = entry
+        self._dirty.append((source_hash, key[0], key[1], text, entry.result,
+                            json.dumps(used, ensure_ascii=False), entry.deps))
+        return result
+
+    def recall(self, version, target, texts):
+        """{text: result} for each of `texts` stored under (version, target)."""
+        entries = self._load((version, target))
+        found = {}
+        for text in texts:
+            entry = entries.get(_hash(text))
+            if entry is not None:
+                self.hits += 1
+                found[text] = entry.result
+        return found
+
+    def remember(self, version, target, results):
+        """Stores {text: result} under (version, target); written on flush()."""
+        entries = self._load((version, target))
+        deps = _deps({}, [])
+        self.misses += len(results)
+        for text, result in results.items():
+            source_hash = _hash(text)
+            entries[source_hash] = _Entry(text, result, [], deps)
+            self._dirty.append((source_hash, version, target, text, result, '[]', deps))
+
+    def flush(self):
+        if not (self._dirty or self._dropped or self._keys):
+            return 0
+        with self.conn:
+            # Dropped rows go before the key sets that no longer flag them.
+            self.conn.executemany("DELETE FROM memory WHERE source_hash = ? AND version = ? AND target = ?",
+                                  self._dropped)
+            self.conn.executemany("INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?, ?, ?, ?)", self._dirty)
+            self.conn.executemany("INSERT OR REPLACE INTO table_keys VALUES (?, ?, ?)", self._keys)
+        written = len(self._dirty)
+        self._dirty, self._dropped, self._keys = [], [], []
+        return written
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    def format_stats(self):
+        return f"translation memory: {self.hits} hits, {self.misses} new, {self.stale} re-translated"
+
+
+@contextmanager
+def memory_session(path=MEMORY_PATH, tables=None):
+    """
+    Opens the memory and routes TranslationTable.replace through it for
+    `tables` (default: every table created via translation_table so far).
+    """
+    memory = TranslationMemory(path)
+    tables = list(tables) if tables is not None else shared_tables()
+    for table in tables:
+        table.memory = memory
+    try:
+        yield memory
+    finally:
+        for table in tables:
+            table.memory = None
+        memory.close()
+        if memory.hits or memory.misses or memory.stale:
+            print(memory.format_stats())
@@ -0,0 +1,119 @@
+"""
+Process-pool execution of pipeline stages.
+
+    pipeline = Pipeline(['final_translate', 'translate_jp_to_kr'])
+    stats = run_parallel(pipeline, library, workers=4, chunk_size=32)
+
+Records are cut into chunks of `chunk_size` and sent to a
+ProcessPoolExecutor. Each worker imports the modules that registered the
+stages and compiles every translation table once, in its initializer, so
+a chunk only pays for the per-string passes. executor.map hands results
+back in submission order, so the output is identical to the serial run.
+Top-level values (deck_consistency) are small and stay in the parent.
+
+Workers do not use the translation memory: a SQLite connection cannot be
+shared across processes, and the per-string work is what is being spread.
+"""
+import importlib
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from darlkom.pipeline import Pipeline
+from darlkom.store import COLLECTIONS
+from darlkom.translation import shared_tables
+
+DEFAULT_CHUNK_SIZE = 32
+
+ParallelStats = namedtuple('ParallelStats', 'workers chunks records wall busy')
+
+
+def add_parallel_arguments(parser):
+    """`--workers/--chunk-size` for scripts that can run their stage in a process pool."""
+    parser.add_argument('--workers', type=int, default=0,
+                        help='translate in N worker processes (0 = serial)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='records per work unit in parallel mode')
+    return parser
+
+_worker_pipeline = None
+
+
+def _init_worker(modules, stage_names):
+    global _worker_pipeline
+    for name in modules:
+        importlib.import_module(name)
+    for table in shared_tables():
+        table.memory = None
+        table.automaton  # compile once per worker
+        table.folded
+    _worker_pipeline = Pipeline(stage_names)
+
+
+def _run_chunk(chunk):
+    pipeline = _worker_pipeline
+    before = dict(pipeline.seconds), dict(pipeline.calls)
+    start = time.perf_counter()
+    records = [pipeline.apply(record, collection) for record, collection in chunk]
+    busy = time.perf_counter() - start
+    seconds = {name: pipeline.seconds[name] - before[0][name] for name in pipeline.seconds}
+    calls = {name: pipeline.calls[name] - before[1][name] for name in pipeline.calls}
+    return records, seconds, calls, busy
+
+
+def _stage_modules(pipeline):
+    # Stages defined in a script run as __main__ are re-registered when the worker imports it.
+    return sorted({stage.fn.__module__ for stage in pipeline.stages} - {'__main__'})
+
+
+def run_parallel(pipeline, library, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Pipeline.run() across processes. Per-stage times from the workers are
+    added to `pipeline`'s report. Returns ParallelStats; `busy` is the
+    summed time workers spent in chunks, i.e. the serial-equivalent work.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    start = time.perf_counter()
+    if not library.is_legacy_list:
+        for key in list(library.data):
+            value = library.data[key]
+            if key not in COLLECTIONS or not isinstance(value, list):
+                library.data[key] = pipeline.apply_meta(value)
+
+    work = [(record, name) for name in library.collection_names() for record in library.collection(name)]
+    chunks = [work[i:i + chunk_size] for i in range(0, len(work), chunk_size)]
+    results = []
+    busy = 0.0
+    stage_names = [stage.name for stage in pipeline.stages]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(_stage_modules(pipeline), stage_names)) as executor:
+        for records, seconds, calls, chunk_busy in executor.map(_run_chunk, chunks):
+            results.extend(records)
+            busy += chunk_busy
+            for name in seconds:
+                pipeline.seconds[name] += seconds[name]
+                pipeline.calls[name] += calls[name]
+
+    position = 0
+    for name in library.collection_names():
+        records = library.collection(name)
+        count = len(records)
+        records[:] = [record for record in results[position:position + count] if record is not None]
+        position += count
+    library.reindex()
+    return ParallelStats(workers, len(chunks), len(work), time.perf_counter() - start, busy)
+
+
+def format_stats(stats, serial_seconds=None):
+    line = (f"parallel: {stats.records} records in {stats.chunks} chunks on {stats.workers} workers, "
+            f"{stats.wall:.3f}s wall")
+    if serial_seconds is not None:
+        return line + f", serial {serial_seconds:.3f}s -> {serial_seconds / stats.wall:.2f}x speedup"
+    # Without a serial run, the workers' summed busy time stands in for it. That
+    # ignores pickling and pool start-up, so it is printed as an estimate, not a measurement.
+    return line + (f", {stats.busy:.3f}s of worker time -> ~{stats.busy / stats.wall:.2f}x "
+                   f"estimated speedup (not measured against a serial run)")
@@ -0,0 +1,86 @@
+"""
+Single-load pipeline over the in-memory library.
+
+Scripts register their per-record transform as a named stage:
+
+    @register_stage('final_translate', meta=True)
+    def translate_recursive(data): ...
+
+A Pipeline runs a declared list of stages over each record in turn, so the
+library is loaded, walked and written once no matter how many passes it
+has. A stage function takes a record and returns the new record, or None
+if it edited the record in place. `collections` limits a stage to e.g.
+('styles_001_100',); `meta=True` also runs it over top-level values such
+as deck_consistency. Time spent is accumulated per stage.
+"""
+import time
+from collections import namedtuple
+
+Stage = namedtuple('Stage', 'name fn collections meta')
+
+STAGES = {}
+
+
+def register_stage(name, collections=None, meta=False):
+    def decorator(fn):
+        STAGES[name] = Stage(name, fn, tuple(collections) if collections else None, meta)
+        return fn
+    return decorator
+
+
+class Pipeline:
+    def __init__(self, stage_names):
+        missing = [name for name in stage_names if name not in STAGES]
+        if missing:
+            raise KeyError(f"unregistered stage(s): {', '.join(missing)}")
+        self.stages = [STAGES[name] for name in stage_names]
+        self.seconds = {stage.name: 0.0 for stage in self.stages}
+        self.calls = {stage.name: 0 for stage in self.stages}
+
+    def _run_stage(self, stage, value):
+        start = time.perf_counter()
+        result = stage.fn(value)
+        self.seconds[stage.name] += time.perf_counter() - start
+        self.calls[stage.name] += 1
+        return value if result is None else result
+
+    def apply(self, record, collection):
+        """Runs every applicable stage over one record. Usable as a stream_transform record_fn."""
+        for stage in self.stages:
+            if stage.collections is None or collection in stage.collections:
+                record = self._run_stage(stage, record)
+        return record
+
+    def apply_meta(self, value):
+        for stage in self.stages:
+            if stage.meta:
+                value = self._run_stage(stage, value)
+        return value
+
+    def run(self, library):
+        """Transforms a DNALibrary in memory. The caller decides when to save()."""
+        library.transform(self.apply, self.apply_meta)
+        return self.report()
+
+    def split(self, name):
+        """
+        (stages before `name`, stages from `name` on) as two Pipelines that add
+        their times to this one's report, so a whole-library pass can run between.
+        """
+        names = [stage.name for stage in self.stages]
+        index = names.index(name) if name in names else len(names)
+        parts = Pipeline(names[:index]), Pipeline(names[index:])
+        for part in parts:
+            part.seconds, part.calls = self.seconds, self.calls
+        return parts
+
+    def report(self):
+        return [(stage.name, self.calls[stage.name], self.seconds[stage.name]) for stage in self.stages]
+
+    def format_report(self):
+        lines = [f"{'stage':<34}{'calls':>8}{'seconds':>12}"]
+        for name, calls, seconds in self.report():
+            lines.append(f"{name:<34}{calls:>8}{seconds:>12.4f}")
+        total = sum(self.seconds.values())
+        lines.append(f"{'total':<34}{sum(self.calls.values()):>8}{total:>12.4f}")
+        return '\n'.join(lines)
@@ -0,0 +1,168 @@
+"""
+Compact `__slots__` record types for v2 DNA modules.
+
+Holding the whole library as plain dicts repeats every key and every
+vocabulary string ("sans-serif", "z-pattern", "moderate", ...) per record.
+These classes store fields in slots, intern short vocabulary strings and
+keep string lists as tuples, so identical values share one object.
+
+Conversion is lossless: `DNAModule.from_dict(d).to_dict() == d`, including
+key order, missing fields, unknown keys and malformed (non-dict) genes.
+
+    modules = [DNAModule.from_dict(d) for d in library.collection('styles_v2')]
+    modules[0].design_dna.layout_rules.whitespace_ratio
+"""
+import sys
+
+_orders = {}
+
+
+def _intern_order(keys):
+    keys = tuple(sys.intern(k) if isinstance(k, str) else k for k in keys)
+    return _orders.setdefault(keys, keys)
+
+
+def _intern_value(value):
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list) and all(isinstance(v, str) for v in value):
+        return tuple(sys.intern(v) for v in value)
+    return value
+
+
+def _export_value(value):
+    if isinstance(value, tuple):
+        return list(value)
+    return value
+
+
+class _Record:
+    """
+    Base for the gene/module classes. Subclasses declare FIELDS (JSON key
+    order), NESTED (field -> record class) and PROSE (fields not interned).
+    `_order` is only set when a record's keys differ from FIELDS; `_extra`
+    only when it has keys we do not model.
+    """
+    __slots__ = ('_order', '_extra')
+    FIELDS = ()
+    NESTED = {}
+    PROSE = frozenset()
+
+    def __init__(self, **fields):
+        for name in self.FIELDS:
+            setattr(self, name, fields.pop(name, None))
+        self._extra = fields or None
+        self._order = None
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls.__new__(cls)
+        extra = None
+        for name in cls.FIELDS:
+            if name not in data:
+                setattr(record, name, None)
+                continue
+            value = data[name]
+            nested = cls.NESTED.get(name)
+            if nested is not None and isinstance(value, dict):
+                value = nested.from_dict(value)
+            elif name not in cls.PROSE:
+                value = _intern_value(value)
+            setattr(record, name, value)
+        for key, value in data.items():
+            if key not in cls.FIELDS:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        record._extra = extra
+        keys = tuple(data.keys())
+        record._order = None if keys == cls.FIELDS else _intern_order(keys)
+        return record
+
+    def to_dict(self):
+        out = {}
+        for key in (self.FIELDS if self._order is None else self._order):
+            if key in self.FIELDS:
+                value = getattr(self, key)
+                if isinstance(value, _Record):
+                    value = value.to_dict()
+                out[key] = _export_value(value)
+            else:
+                out[key] = self._extra[key]
+        return out
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class ColorPalette(_Record):
+    __slots__ = ('primary', 'secondary', 'accent')
+    FIELDS = ('primary', 'secondary', 'accent')
+
+
+class LayoutRules(_Record):
+    __slots__ = ('composition', 'whitespace_ratio', 'reading_flow')
+    FIELDS = ('composition', 'whitespace_ratio', 'reading_flow')
+
+
+class Materiality(_Record):
+    __slots__ = ('base', 'texture')
+    FIELDS = ('base', 'texture')
+
+
+class LineShape(_Record):
+    __slots__ = ('line_style', 'stroke_variance')
+    FIELDS = ('line_style', 'stroke_variance')
+
+
+class Typography(_Record):
+    __slots__ = ('headline', 'body', 'language_support')
+    FIELDS = ('headline', 'body', 'language_support')
+
+
+class EmotionalProfile(_Record):
+    __slots__ = ('mood', 'tempo', 'weight')
+    FIELDS = ('mood', 'tempo', 'weight')
+
+
+class SlideUsage(_Record):
+    __slots__ = ('best_for', 'avoid_for')
+    FIELDS = ('best_for', 'avoid_for')
+
+
+class DesignDNA(_Record):
+    __slots__ = ('tone_keywords', 'color_palette', 'layout_rules', 'materiality',
+                 'line_shape', 'typography', 'emotional_profile')
+    FIELDS = ('tone_keywords', 'color_palette', 'layout_rules', 'materiality',
+              'line_shape', 'typography', 'emotional_profile')
+    NESTED = {
+        'color_palette': ColorPalette,
+        'layout_rules': LayoutRules,
+        'materiality': Materiality,
+        'line_shape': LineShape,
+        'typography': Typography,
+        'emotional_profile': EmotionalProfile,
+    }
+
+
+class DNAModule(_Record):
+    __slots__ = ('module_id', 'style_name', 'role_bucket', 'design_dna', 'slide_usage',
+                 'image_prompt_one_line', 'negative_prompt')
+    FIELDS = ('module_id', 'style_name', 'role_bucket', 'design_dna', 'slide_usage',
+              'image_prompt_one_line', 'negative_prompt')
+    NESTED = {'design_dna': DesignDNA, 'slide_usage': SlideUsage}
+    # Free text that is almost never shared between records.
+    PROSE = frozenset({'style_name', 'image_prompt_one_line'})
+
+
+def load_modules(records):
+    """Converts v2 record dicts (e.g. library.collection('styles_v2')) to DNAModule objects."""
+    return [DNAModule.from_dict(record) for record in records]
+
+
+def dump_modules(modules):
+    return [module.to_dict() for module in modules]
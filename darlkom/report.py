@@ -0,0 +1,165 @@
+"""
+Parser for the indented `full_report` text of legacy records.
+
+    Overall Design Config:
+      Tone: "Calm, analog"
+      Visual Identity:
+        Background Color: "#F8F1E7"
+        Accent Color: Coral
+
+tokenize() reads the report once, line by line, and yields a ReportLine
+per non-blank line: its nesting depth, the key before the first ':' (None
+for a line without one) and the value after it. Depth comes from a stack
+of open indentations rather than a fixed indent width, so reports
+indented with 2, 3 or 4 spaces (or inconsistently) nest the same way.
+
+parse_report() turns those lines into the nested section tree:
+
+    {"Overall Design Config": {"Tone": "Calm, analog",
+                               "Visual Identity": {"Background Color": "#F8F1E7", ...}}}
+
+Nothing is dropped. A key that has both a value and indented children
+becomes a section with the value under VALUE_KEY, a repeated key at the
+same level becomes "Key (2)", and lines without a ':' are collected under
+NOTES_KEY of their section. Both functions are linear in the report.
+
+HeaderStats aggregates tokenize() over many reports: how often each
+header occurs, in how many records, at which depths, which headers share
+a report, and the module_ids (id for legacy records) that use it.
+analyze_headers.py streams the library through it.
+"""
+from collections import Counter, namedtuple
+from itertools import combinations
+
+ReportLine = namedtuple('ReportLine', 'depth key value')
+
+VALUE_KEY = 'Value'
+NOTES_KEY = 'Notes'
+
+
+def _clean(text):
+    return text.strip().strip('"').strip()
+
+
+def tokenize(text):
+    """Yields a ReportLine for every non-blank line of `text`."""
+    indents = []  # indentation of the lines that can still take children
+    for line in text.split('\n'):
+        stripped = line.lstrip()
+        if not stripped.strip():
+            continue
+        indent = len(line) - len(stripped)
+        while indents and indents[-1] >= indent:
+            indents.pop()
+        depth = len(indents)
+        indents.append(indent)
+        key, sep, value = stripped.partition(':')
+        if sep:
+            yield ReportLine(depth, _clean(key), _clean(value))
+        else:
+            yield ReportLine(depth, None, _clean(stripped))
+
+
+def _unique(section, key):
+    name, n = key, 2
+    while name in section:
+        name = f"{key} ({n})"
+        n += 1
+    return name
+
+
+def parse_report(text):
+    """The report as nested dicts, in document order."""
+    root = {}
+    # parents[d]: (section, key) of the latest line at depth d; key None for a note.
+    parents = []
+    for depth, key, value in tokenize(text):
+        del parents[depth:]
+        if not parents:
+            section = root
+        else:
+            section, parent_key = parents[-1]
+            if parent_key is not None:
+                node = section[parent_key]
+                if not isinstance(node, dict):
+                    node = section[parent_key] = {VALUE_KEY: node} if node else {}
+                section = node
+        if key is None:
+            notes = section.get(NOTES_KEY)
+            if isinstance(notes, list):
+                notes.append(value)
+            else:
+                section[_unique(section, NOTES_KEY)] = [value]
+        else:
+            key = _unique(section, key)
+            section[key] = value
+        parents.append((section, key))
+    return root
+
+
+class _Header:
+    __slots__ = ('count', 'depths', 'keys')
+
+    def __init__(self):
+        self.count = 0
+        self.depths = Counter()
+        self.keys = {}  # insertion-ordered set
+
+
+class HeaderStats:
+    def __init__(self):
+        self.reports = 0
+        self.headers = {}
+        self.pairs = Counter()  # (header, header) -> reports with both, sorted pair
+
+    def add_report(self, text, key=None):
+        self.reports += 1
+        seen = set()
+        for depth, header, _ in tokenize(text):
+            if header is None:
+                continue
+            stats = self.headers.get(header)
+            if stats is None:
+                stats = self.headers[header] = _Header()
+            stats.count += 1
+            stats.depths[depth] += 1
+            if key is not None:
+                stats.keys[key] = None
+            seen.add(header)
+        self.pairs.update(combinations(sorted(seen), 2))
+
+    def ranked(self):
+        """[(header, _Header)] by occurrences, then records."""
+        return sorted(self.headers.items(), key=lambda pair: (-pair[1].count, -len(pair[1].keys), pair[0]))
+
+    def index(self):
+        """{header: [module_id, ...]} in first-seen order."""
+        return {header: list(stats.keys) for header, stats in self.ranked()}
+
+    def format_report(self, limit=30, pairs=10, note=None):
+        ranked = self.ranked()
+        lines = [f"{self.reports} reports, {len(ranked)} distinct headers, "
+                 f"{sum(stats.count for stats in self.headers.values())} header lines"]
+        lines.append(f"{'count':>7}{'records':>9}{'depth':>8}  header")
+        for header, stats in ranked[:limit or None]:
+            low, high = min(stats.depths), max(stats.depths)
+            depth = str(low) if low == high else f"{low}-{high}"
+            line = f"{stats.count:>7}{len(stats.keys):>9}{depth:>8}  {header}"
+            text = note(header) if note else None
+            lines.append(f"{line}  {text}" if text else line)
+        if pairs:
+            lines.append("Most frequent co-occurring headers (reports containing both):")
+            for (a, b), count in self.pairs.most_common(pairs):
+                lines.append(f"{count:>7}  {a} + {b}")
+        return '\n'.join(lines)
+
+    def to_json(self, pairs=100):
+        return {
+            "reports": self.reports,
+            "headers": {
+                header: {"count": stats.count, "depths": {str(d): n for d, n in sorted(stats.depths.items())},
+                         "module_ids": list(stats.keys)}
+                for header, stats in self.ranked()
+            },
+            "pairs": [[a, b, count] for (a, b), count in self.pairs.most_common(pairs or None)],
+        }
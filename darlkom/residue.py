@@ -0,0 +1,171 @@
+"""
+Untranslated-residue report: one pass over every string in the library.
+
+    python -m darlkom.residue                   # top 30 leftovers
+    python -m darlkom.residue --sort records --limit 50
+    python -m darlkom.residue --latin --json residue.json
+
+Each string is scanned once by a single regex whose alternatives are the
+scripts (Hangul, Kana, Han, Latin as defined in darlkom.scripts); every
+match is a run of one script, so per-character counts come from run
+lengths and whatever no run covers is "other" (digits, punctuation,
+spaces). Adjacent Kana and Han runs form one untranslated token
+("温かみのある"), which is ranked by frequency together with the records
+(module_id, or id for legacy records) and field paths it occurs in.
+`--latin` also ranks Latin words, for English left in Korean fields.
+List items share their parent's path ("tone_keywords[]") so the same
+field adds up across records.
+
+Sorting by records answers "which dictionary entries fix the most
+records"; the default count order is the same as darlkom.fallback's.
+"""
+import argparse
+import json
+import re
+from collections import Counter
+
+from darlkom.scripts import HAN, HANGUL, KANA, LATIN, char_class
+from darlkom.store import COLLECTIONS, record_key
+
+SCRIPTS = ('hangul', 'kana', 'han', 'latin')
+
+# One named group per script; "kana" covers both syllabaries.
+_RUNS = re.compile('|'.join(f'(?P<{name}>[{char_class(scripts)}]+)' for name, scripts in (
+    ('hangul', HANGUL), ('kana', KANA), ('han', HAN), ('latin', LATIN))))
+
+
+class _Token:
+    __slots__ = ('count', 'keys', 'paths')
+
+    def __init__(self):
+        self.count = 0
+        self.keys = {}  # insertion-ordered set
+        self.paths = Counter()
+
+
+class ResidueReport:
+    def __init__(self, latin=False):
+        self.latin = latin
+        self.scripts = Counter()
+        self.other = 0
+        self.strings = 0
+        self.tokens = {}
+
+    def _token(self, text, key, path):
+        token = self.tokens.get(text)
+        if token is None:
+            token = self.tokens[text] = _Token()
+        token.count += 1
+        if key is not None:
+            token.keys[key] = None
+        token.paths[path] += 1
+
+    def add_string(self, text, key, path):
+        self.strings += 1
+        covered = 0
+        start = end = -1  # current Kana/Han token span
+        for match in _RUNS.finditer(text):
+            script = match.lastgroup
+            lo, hi = match.span()
+            self.scripts[script] += hi - lo
+            covered += hi - lo
+            if script == 'kana' or script == 'han':
+                if lo != end:
+                    if end > start:
+                        self._token(text[start:end], key, path)
+                    start = lo
+                end = hi
+            elif script == 'latin' and self.latin:
+                self._token(match.group(), key, path)
+        if end > start:
+            self._token(text[start:end], key, path)
+        self.other += len(text) - covered
+
+    def add_value(self, value, key, path):
+        if isinstance(value, str):
+            self.add_string(value, key, path)
+        elif isinstance(value, dict):
+            for name, item in value.items():
+                self.add_value(item, key, f"{path}.{name}" if path else name)
+        elif isinstance(value, list):
+            path += '[]'
+            for item in value:
+                self.add_value(item, key, path)
+
+    def add_library(self, data):
+        """Walks templates.json data (either layout) once."""
+        if isinstance(data, list):
+            for item in data:
+                self.add_value(item, record_key(item) if isinstance(item, dict) else None, '')
+            return
+        for name, value in data.items():
+            if name in COLLECTIONS and isinstance(value, list):
+                for item in value:
+                    self.add_value(item, record_key(item) if isinstance(item, dict) else None, '')
+            else:
+                self.add_value(value, None, name)
+
+    def ranked(self, sort='count'):
+        """[(token, _Token)] most frequent first, or with sort='records' most widespread first."""
+        if sort == 'records':
+            order = lambda pair: (-len(pair[1].keys), -pair[1].count, pair[0])
+        else:
+            order = lambda pair: (-pair[1].count, -len(pair[1].keys), pair[0])
+        return sorted(self.tokens.items(), key=order)
+
+    def format_report(self, limit=30, sort='count'):
+        total = sum(self.scripts.values()) + self.other
+        lines = [f"{self.strings} strings, {total} characters"]
+        for script in SCRIPTS:
+            count = self.scripts[script]
+            lines.append(f"  {script:<8}{count:>10}  {count / total if total else 0:>6.1%}")
+        lines.append(f"  {'other':<8}{self.other:>10}  {self.other / total if total else 0:>6.1%}")
+        ranked = self.ranked(sort)
+        lines.append(f"{len(ranked)} untranslated tokens, {sum(t.count for t in self.tokens.values())} occurrences"
+                     + (f" (top {limit} by {sort})" if limit and len(ranked) > limit else ""))
+        lines.append(f"{'count':>7}{'records':>9}  token / fields / records")
+        for text, token in ranked[:limit or None]:
+            paths = ', '.join(path or '<value>' for path, _ in token.paths.most_common(3))
+            keys = ', '.join(str(key) for key in list(token.keys)[:5])
+            more = len(token.keys) - 5
+            lines.append(f"{token.count:>7}{len(token.keys):>9}  {text}")
+            lines.append(f"{'':>18}in {paths}" + (f" ({len(token.paths) - 3} more)" if len(token.paths) > 3 else ""))
+            if keys:
+                lines.append(f"{'':>18}at {keys}" + (f" (+{more})" if more > 0 else ""))
+        return '\n'.join(lines)
+
+    def to_json(self, limit=None, sort='count'):
+        return {
+            "strings": self.strings,
+            "scripts": {**{script: self.scripts[script] for script in SCRIPTS}, "other": self.other},
+            "tokens": [
+                {"token": text, "count": token.count, "records": list(token.keys), "paths": dict(token.paths)}
+                for text, token in self.ranked(sort)[:limit or None]
+            ],
+        }
+
+
+def build_report(library, latin=False):
+    report = ResidueReport(latin)
+    report.add_library(library.data)
+    return report
+
+
+if __name__ == "__main__":
+    from darlkom.snapshot import open_library
+    from darlkom.store import DEFAULT_PATH
+
+    parser = argparse.ArgumentParser(description="Rank the untranslated text left in the library.")
+    parser.add_argument('input', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--limit', type=int, default=30, help='tokens to list (0 = all)')
+    parser.add_argument('--sort', choices=('count', 'records'), default='count')
+    parser.add_argument('--latin', action='store_true', help='also rank Latin-script words')
+    parser.add_argument('--json', metavar='PATH', help='write the full report (all tokens) as JSON')
+    args = parser.parse_args()
+
+    report = build_report(open_library(args.input), args.latin)
+    print(report.format_report(args.limit, args.sort))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report.to_json(sort=args.sort), f, ensure_ascii=False, indent=2)
+        print(f"Full report written to {args.json}")
@@ -0,0 +1,84 @@
+"""
+Field-level scanner for characters that should not be in the library.
+
+    for finding in scan_library(library):          # CJK residue, every location
+        print(finding.key, finding.path, finding.text)
+    has_residue(library)                           # stops at the first hit
+
+Records are walked in place, depth first in key order; nothing is
+serialized, and a path is only spelled out for strings that match. Each
+string is searched once with the script class from darlkom.scripts and
+every run becomes a Finding:
+
+    Finding(key='dna_0042', path='design_dna.tone_keywords[2]', start=0, end=3, text='温かみ')
+
+`key` is the record's module_id (id for legacy records), `path` the JSON
+path inside the record, and start/end the run's offsets in that string.
+Everything is a generator, so a caller that only needs a yes/no answer
+(or the first N locations) stops the walk there. Works on DNALibrary and
+SnapshotLibrary in either layout, since both iterate their records.
+"""
+from collections import namedtuple
+
+from darlkom.scripts import CJK, pattern
+from darlkom.store import record_key
+
+Finding = namedtuple('Finding', 'key path start end text')
+
+
+def _runs(text, path, runs):
+    for match in runs.finditer(text):
+        yield path, match.start(), match.end(), match.group()
+
+
+def _walk(value, path, runs):
+    # Strings are tested where they are met, so clean leaves cost one search
+    # and no path string is built for them.
+    search = runs.search
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for name, item in items:
+        if isinstance(item, str):
+            if search(item):
+                yield from _runs(item, _child(path, name), runs)
+        elif isinstance(item, (dict, list)):
+            yield from _walk(item, _child(path, name), runs)
+
+
+def _child(path, name):
+    if isinstance(name, int):
+        return f"{path}[{name}]"
+    return f"{path}.{name}" if path else name
+
+
+def format_path(parts):
+    """('design_dna', 'tone_keywords', 2) -> 'design_dna.tone_keywords[2]', the notation Findings use."""
+    path = ''
+    for name in parts:
+        path = _child(path, name)
+    return path
+
+
+def find_runs(value, scripts=CJK, path=''):
+    """Yields (path, start, end, run) for every run of `scripts` in `value`, in document order."""
+    runs = pattern(scripts)
+    if isinstance(value, str):
+        return _runs(value, path, runs)
+    if isinstance(value, (dict, list)):
+        return _walk(value, path, runs)
+    return iter(())
+
+
+def scan_record(item, scripts=CJK):
+    key = record_key(item) if isinstance(item, dict) else None
+    for path, start, end, text in find_runs(item, scripts):
+        yield Finding(key, path, start, end, text)
+
+
+def scan_library(library, scripts=CJK):
+    """Yields a Finding for every run of `scripts` in every record."""
+    for item in library:
+        yield from scan_record(item, scripts)
+
+
+def has_residue(library, scripts=CJK):
+    return next(scan_library(library, scripts), None) is not None
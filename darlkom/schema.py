@@ -0,0 +1,206 @@
+"""
+Schema for v2 DNA records (`styles_v2`) and a compiled validator.
+
+The schema is declared once below and compiled into nested closures, so
+checking the whole library is a single pass with no per-field lookups into
+the spec. Every violation is reported with its module_id and JSON path.
+
+DNALibrary.save() / commit() call `check_records` before anything touches
+disk, so malformed records are never persisted. Run
+`python -m darlkom.schema` to list every violation in templates.json.
+"""
+from collections import namedtuple
+
+Violation = namedtuple('Violation', 'module_id path message')
+
+
+class SchemaError(ValueError):
+    def __init__(self, violations):
+        self.violations = violations
+        preview = '; '.join(format_violation(v) for v in violations[:5])
+        more = f" (+{len(violations) - 5} more)" if len(violations) > 5 else ''
+        super().__init__(f"{len(violations)} schema violation(s): {preview}{more}")
+
+
+def format_violation(v):
+    return f"{v.module_id} {v.path or '<record>'}: {v.message}"
+
+
+# -- Spec ------------------------------------------------------------------
+
+class Str:
+    def __init__(self, non_empty=False):
+        self.non_empty = non_empty
+
+
+class Num:
+    def __init__(self, minimum=None, maximum=None):
+        self.minimum = minimum
+        self.maximum = maximum
+
+
+class ListOf:
+    def __init__(self, item):
+        self.item = item
+
+
+class Obj:
+    """`fields` maps name -> spec; names in `optional` may be absent. Extra keys are allowed."""
+
+    def __init__(self, fields, optional=()):
+        self.fields = fields
+        self.optional = frozenset(optional)
+
+
+DNA_SCHEMA = Obj({
+    "module_id": Str(non_empty=True),
+    "style_name": Str(non_empty=True),
+    "role_bucket": Str(),
+    "design_dna": Obj({
+        "tone_keywords": ListOf(Str()),
+        "color_palette": Obj({
+            "primary": Str(),
+            "secondary": Str(),
+            "accent": Str(),
+        }),
+        "layout_rules": Obj({
+            "composition": Str(),
+            "whitespace_ratio": Num(0.0, 1.0),
+            "reading_flow": Str(),
+        }),
+        "materiality": Obj({
+            "base": Str(),
+            "texture": ListOf(Str()),
+        }),
+        "line_shape": Obj({
+            "line_style": Str(),
+            "stroke_variance": Str(),
+        }),
+        "typography": Obj({
+            "headline": Str(),
+            "body": Str(),
+            "language_support": ListOf(Str()),
+        }),
+        "emotional_profile": Obj({
+            "mood": ListOf(Str()),
+            "tempo": Str(),
+            "weight": Str(),
+        }),
+    }),
+    "slide_usage": Obj({
+        "best_for": ListOf(Str()),
+        "avoid_for": ListOf(Str()),
+    }),
+    "image_prompt_one_line": Str(),
+    "negative_prompt": Str(),
+})
+
+
+# -- Compiler --------------------------------------------------------------
+# Each compiled check has the signature check(value, path, report).
+
+def _join(path, key):
+    return f"{path}.{key}" if path else key
+
+
+def compile_spec(spec):
+    if isinstance(spec, Str):
+        non_empty = spec.non_empty
+
+        def check_str(value, path, report):
+            if not isinstance(value, str):
+                report(path, f"expected string, got {type(value).__name__}")
+            elif non_empty and not value.strip():
+                report(path, "must not be empty")
+        return check_str
+
+    if isinstance(spec, Num):
+        lo, hi = spec.minimum, spec.maximum
+
+        def check_num(value, path, report):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                report(path, f"expected number, got {type(value).__name__}")
+            elif (lo is not None and value < lo) or (hi is not None and value > hi):
+                report(path, f"{value} outside [{lo}, {hi}]")
+        return check_num
+
+    if isinstance(spec, ListOf):
+        check_item = compile_spec(spec.item)
+
+        def check_list(value, path, report):
+            if not isinstance(value, list):
+                report(path, f"expected list, got {type(value).__name__}")
+                return
+            for i, item in enumerate(value):
+                check_item(item, f"{path}[{i}]", report)
+        return check_list
+
+    if isinstance(spec, Obj):
+        fields = [(name, compile_spec(sub), name in spec.optional) for name, sub in spec.fields.items()]
+
+        def check_obj(value, path, report):
+            if not isinstance(value, dict):
+                report(path, f"expected object, got {type(value).__name__}")
+                return
+            for name, check, optional in fields:
+                if name in value:
+                    check(value[name], _join(path, name), report)
+                elif not optional:
+                    report(_join(path, name), "missing")
+        return check_obj
+
+    raise TypeError(f"unknown schema node {spec!r}")
+
+
+_check_dna = compile_spec(DNA_SCHEMA)
+
+
+def validate_record(item):
+    """Returns the list of violations for one v2 record."""
+    violations = []
+    module_id = item.get('module_id') if isinstance(item, dict) else None
+
+    def report(path, message):
+        violations.append(Violation(module_id, path, message))
+
+    _check_dna(item, '', report)
+    return violations
+
+
+def validate_records(records):
+    """Validates records in one pass, including module_id uniqueness."""
+    violations = []
+    seen = set()
+    for item in records:
+        violations.extend(validate_record(item))
+        module_id = item.get('module_id') if isinstance(item, dict) else None
+        if module_id is not None:
+            if module_id in seen:
+                violations.append(Violation(module_id, 'module_id', "duplicate module_id"))
+            seen.add(module_id)
+    return violations
+
+
+def validate_library(library):
+    """Validates the styles_v2 collection of a DNALibrary (legacy lists have no v2 schema)."""
+    return validate_records(library.collection('styles_v2'))
+
+
+def check_records(records):
+    violations = validate_records(records)
+    if violations:
+        raise SchemaError(violations)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from darlkom.store import DEFAULT_PATH, DNALibrary
+
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    library = DNALibrary.load(path)
+    violations = validate_library(library)
+    for v in violations:
+        print(format_violation(v))
+    print(f"{len(library.collection('styles_v2'))} v2 records checked, {len(violations)} violation(s).")
+    sys.exit(1 if violations else 0)
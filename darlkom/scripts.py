@@ -0,0 +1,127 @@
+"""
+Unicode script classes shared by the scanners, cleaners and translators.
+
+One table of codepoint ranges defines every script; the tools derive what
+they need from it once and reuse it, so "Japanese" means the same thing
+in scan_jp, check_db, clean_cjk and the translate scripts:
+
+    contains(text, JAPANESE)    # does any kana/kanji occur? (regex class, stops at the first hit)
+    strip(text, JAPANESE)       # remove them (whole runs at a time)
+    counts(text)                # Counter({'latin': 812, 'hangul': 40, ...}) in one translate
+    script_of('の')             # 'hiragana'
+
+Scripts are disjoint. Groups used across the repo:
+
+    KANA      hiragana + katakana (incl. half-width katakana)
+    JAPANESE  kana + han -- what clean_cjk removes and what is "untranslated"
+    CJK       Japanese + CJK punctuation + full-width forms -- what check_db reports
+
+Patterns and code tables are built on first use and cached per script
+combination. Deleting runs with a compiled class beat str.translate with
+a deletion table (about 3x on the library); counts() does use translate,
+since classifying every character is one table lookup each.
+"""
+import re
+from bisect import bisect_right
+from collections import Counter
+
+HIRAGANA = 'hiragana'
+KATAKANA = 'katakana'
+HAN = 'han'
+HANGUL = 'hangul'
+LATIN = 'latin'
+FULLWIDTH = 'fullwidth'
+CJK_PUNCT = 'cjk_punct'
+
+SCRIPTS = (HIRAGANA, KATAKANA, HAN, HANGUL, LATIN, FULLWIDTH, CJK_PUNCT)
+
+RANGES = {
+    HIRAGANA: ((0x3040, 0x309f),),
+    KATAKANA: ((0x30a0, 0x30ff), (0x31f0, 0x31ff), (0xff66, 0xff9f)),
+    HAN: ((0x3005, 0x3005), (0x3400, 0x4dbf), (0x4e00, 0x9fff), (0xf900, 0xfaff)),
+    HANGUL: ((0x1100, 0x11ff), (0x3130, 0x318f), (0xa960, 0xa97f), (0xac00, 0xd7a3), (0xd7b0, 0xd7ff)),
+    LATIN: ((0x41, 0x5a), (0x61, 0x7a), (0xc0, 0xd6), (0xd8, 0xf6), (0xf8, 0x24f)),
+    FULLWIDTH: ((0xff01, 0xff60), (0xffe0, 0xffe6)),
+    CJK_PUNCT: ((0x3000, 0x3004), (0x3006, 0x303f), (0xff61, 0xff65)),
+}
+
+KANA = (HIRAGANA, KATAKANA)
+JAPANESE = KANA + (HAN,)
+CJK = JAPANESE + (CJK_PUNCT, FULLWIDTH)
+
+# Scripts that form words, as opposed to punctuation and symbols.
+LETTERS = (HIRAGANA, KATAKANA, HAN, HANGUL, LATIN)
+
+_bounds = sorted((lo, hi, script) for script, ranges in RANGES.items() for lo, hi in ranges)
+_starts = [lo for lo, _, _ in _bounds]
+
+_patterns = {}
+_codes = {}
+
+
+def _names(scripts):
+    return (scripts,) if isinstance(scripts, str) else tuple(scripts)
+
+
+def char_class(scripts):
+    """Body of a regex character class for `scripts`, e.g. r'\\u3040-\\u309f'."""
+    return ''.join(f'\\u{lo:04x}-\\u{hi:04x}' if lo != hi else f'\\u{lo:04x}'
+                   for script in _names(scripts) for lo, hi in RANGES[script])
+
+
+def pattern(scripts, run=True):
+    """Compiled regex matching one character of `scripts`, or a run of them (the default)."""
+    key = (_names(scripts), run)
+    compiled = _patterns.get(key)
+    if compiled is None:
+        compiled = _patterns[key] = re.compile('[' + char_class(key[0]) + ']' + ('+' if run else ''))
+    return compiled
+
+
+def contains(text, scripts):
+    return pattern(scripts, run=False).search(text) is not None
+
+
+def strip(text, scripts):
+    """`text` without any character of `scripts`."""
+    return pattern(scripts).sub('', text)
+
+
+class _CodeTable(dict):
+    # str.translate looks characters up with __getitem__; unlisted ones become chr(0).
+    __slots__ = ()
+
+    def __missing__(self, code):
+        return 0
+
+
+CODES = {chr(index): script for index, script in enumerate(SCRIPTS, 1)}
+
+
+def codes(text, scripts=SCRIPTS):
+    """
+    `text` with every character replaced by its script's code (a key of
+    CODES: chr(1) for hiragana, ...), or chr(0) if it is not in `scripts`.
+    """
+    key = _names(scripts)
+    table = _codes.get(key)
+    if table is None:
+        # Everything below U+3000 is listed so common text never reaches __missing__.
+        table = _codes[key] = _CodeTable.fromkeys(range(0x3000), 0)
+        table.update((code, SCRIPTS.index(script) + 1)
+                     for script in key for lo, hi in RANGES[script] for code in range(lo, hi + 1))
+    return text.translate(table)
+
+
+def counts(text):
+    """Counter of characters per script; unclassified characters count under None."""
+    return Counter({CODES.get(code): n for code, n in Counter(codes(text)).items()})
+
+
+def script_of(char):
+    """The script of one character, or None."""
+    code = ord(char)
+    index = bisect_right(_starts, code) - 1
+    if index >= 0 and code <= _bounds[index][1]:
+        return _bounds[index][2]
+    return None
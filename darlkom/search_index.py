@@ -0,0 +1,161 @@
+"""
+Prebuilt inverted n-gram index for the library search box.
+
+`python -m darlkom.search_index` writes library/search-index.json:
+
+    {"version": 2, "gram": {"latin": 3, "hangul": 2},
+     "ids": ["DNA_001", ...],
+     "texts": ["{\"module_id\":\"dna_001\",...}", ...],
+     "postings": {"doo": [0, 17], "#00": [0, 3, 41], "손글": [5], ...}}
+
+The search box matches a term anywhere in the record, as the old
+JSON.stringify(dna).toLowerCase().includes(term) scan did, and the index
+gives the same answers without the records (which stay in their shards):
+
+- `texts` holds each record's compact, lowercased JSON, the text a term
+  is matched against.
+- `postings` narrows the candidates. That text is NFKC-normalized and
+  split into Latin/digit words, Hangul runs and hex colours; each token
+  contributes its sliding n-grams (or itself when shorter than n).
+
+app.js tokenizes the query the same way, intersects the posting lists
+and then checks each candidate's text, since grams present in a record
+need not be adjacent there. A query with no indexable tokens (Japanese,
+punctuation) checks every text.
+
+Per-record grams and texts are cached by record fingerprint in
+.search-index.fingerprints, outside the deployed library/ directory, so a
+rebuild only re-tokenizes records that changed since the last build.
+"""
+import json
+import os
+import re
+import unicodedata
+
+from darlkom.fingerprints import FINGERPRINT_SUFFIX, BuildCache, fingerprint, write_if_changed
+from darlkom.store import DEFAULT_PATH, DNALibrary
+
+OUTPUT_PATH = os.path.join('library', 'search-index.json')
+CACHE_PATH = '.search-index' + FINGERPRINT_SUFFIX
+FORMAT_VERSION = 2
+
+LATIN_GRAM = 3
+HANGUL_GRAM = 2
+
+# Keep in sync with SEARCH_TOKEN_RE in app.js.
+TOKEN_RE = re.compile(r'#[0-9a-f]{3,8}(?![0-9a-z])|[0-9a-z]+|[ㄱ-ㆎ가-힣]+')
+
+
+def normalize(text):
+    return unicodedata.normalize('NFKC', text).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+def gram_size(token):
+    return HANGUL_GRAM if 'ㄱ' <= token[0] <= '힣' else LATIN_GRAM
+
+
+def grams(token):
+    n = gram_size(token)
+    if len(token) <= n:
+        return [token]
+    return [token[i:i + n] for i in range(len(token) - n + 1)]
+
+
+def searchable_text(item):
+    """The text a query is matched against: JSON.stringify(item).toLowerCase() in app.js."""
+    return json.dumps(item, ensure_ascii=False, separators=(',', ':')).lower()
+
+
+def record_grams(text):
+    seen = set()
+    for token in tokenize(text):
+        seen.update(grams(token))
+    return sorted(seen)
+
+
+def build_index(records, cache=None):
+    """`cache` is an optional BuildCache of per-record [text, grams]."""
+    ids = []
+    texts = []
+    postings = {}
+    for doc, item in enumerate(records):
+        key = item.get('module_id', item.get('id'))
+        ids.append(key)
+        fp = fingerprint(item) if cache is not None else None
+        entry = cache.get(key, fp) if cache is not None else None
+        if entry is None:
+            text = searchable_text(item)
+            entry = [text, record_grams(text)]
+            if cache is not None:
+                cache.put(key, fp, entry)
+        texts.append(entry[0])
+        for gram in entry[1]:
+            postings.setdefault(gram, []).append(doc)
+    return {
+        "version": FORMAT_VERSION,
+        "gram": {"latin": LATIN_GRAM, "hangul": HANGUL_GRAM},
+        "ids": ids,
+        "texts": texts,
+        "postings": dict(sorted(postings.items())),
+    }
+
+
+def search(index, query):
+    """Python mirror of the app.js lookup, for tooling and checks. Returns the matching ids."""
+    term = query.lower()
+    texts = index["texts"]
+    candidates = _candidates(index, tokenize(query))
+    if candidates is None:
+        candidates = range(len(texts))
+    return [index["ids"][doc] for doc in sorted(candidates) if term in texts[doc]]
+
+
+def _candidates(index, tokens):
+    # Docs holding every token's grams; None when there is no token to narrow by.
+    if not tokens:
+        return None
+    postings = index["postings"]
+    result = None
+    for token in tokens:
+        if len(token) >= gram_size(token):
+            docs = None
+            for gram in grams(token):
+                hits = set(postings.get(gram, ()))
+                docs = hits if docs is None else docs & hits
+        else:
+            docs = set()
+            for gram, hits in postings.items():
+                if token in gram:
+                    docs.update(hits)
+        result = docs if result is None else result & docs
+        if not result:
+            break
+    return result
+
+
+def build_search_index(library_path=DEFAULT_PATH, output_path=OUTPUT_PATH, cache_path=CACHE_PATH):
+    library = DNALibrary.load(library_path)
+    # Same collection app.js shows: styles_v2, else the legacy list.
+    records = library.collection('styles_v2') or library.collection('styles_001_100') or library.collection(None)
+    cache = BuildCache(cache_path)
+    index = build_index(records, cache)
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    raw = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_if_changed(output_path, raw)
+    cache.save()
+    return index, cache
+
+
+if __name__ == "__main__":
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_PATH
+    index, cache = build_search_index(source, target)
+    print(f"Indexed {len(index['ids'])} DNAs ({cache.misses} re-tokenized, {cache.hits} cached), "
+          f"{len(index['postings'])} n-grams -> {target} ({os.path.getsize(target)} bytes).")
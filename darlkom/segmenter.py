@@ -0,0 +1,160 @@
+"""
+Dictionary-driven segmentation for Japanese text.
+
+    segmenter = Segmenter(JP_TO_KO)
+    segmenter.replace("和風の色")          # "풍" / "의" only where they are words
+
+darlkom.automaton rewrites the leftmost-longest key at each position,
+which is right for multi-character terms but lets one-character entries
+such as "の", "な" or "夜" fire inside words the dictionary does not know
+("なめらか" -> "한めらか"). The segmenter instead chooses the best
+segmentation of the whole string by dynamic programming over the key
+trie: every position is reached either by a dictionary key or by one
+unknown character, and the cheapest path covers the most characters with
+dictionary keys, then uses the fewest segments, then prefers longer
+earlier segments (leftmost-longest on ties).
+
+One-character keys are only allowed at a word boundary: they may not
+touch an unknown character of the same script (hiragana, katakana or
+kanji, as classified by darlkom.scripts). "の" between two known words
+or after katakana is a particle; "な" followed by unknown hiragana is
+part of a word and is left alone, as is "夜" in an unknown kanji
+compound. Leftovers are then visible to darlkom.residue /
+darlkom.fallback instead of being half-translated.
+
+The DP walks the trie once per position, so a string costs one pass times
+the longest key that matches there. Only Japanese runs (widened to cover
+keys such as "Japaneseは") enter the DP; other text is copied as is.
+"""
+import re
+
+from darlkom.automaton import _trie, compile_pattern
+from darlkom.scripts import JAPANESE, codes, pattern, strip
+
+JAPANESE_RUN = pattern(JAPANESE)
+
+# Segment kinds for the DP state; only the last segment matters.
+_WORD, _SINGLE, _UNKNOWN = 0, 1, 2
+
+# An unknown character outweighs any number of segments.
+_UNKNOWN_COST = (1 << 20) + 1
+_INF = 1 << 62
+
+_OTHER = chr(0)  # darlkom.scripts.codes() for anything but kana and kanji
+
+
+class Segmenter:
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        for key in self.mapping:
+            if not isinstance(key, str) or not key:
+                raise ValueError(f"translation keys must be non-empty strings, got {key!r}")
+        self.trie = _trie(self.mapping)
+        # Only Japanese runs need the DP, widened to any occurrence of a key with
+        # non-Japanese characters ("Japaneseは"); the rest of the text is copied.
+        outside = [key for key in self.mapping if strip(key, JAPANESE)]
+        self._outside = re.compile('(?=(' + compile_pattern(outside).pattern + '))') if outside else None
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def _segment(self, text, lo, hi):
+        """Best segmentation of text[lo:hi] as [(start, end, key or None)]."""
+        n = hi - lo
+        # cost[kind][i]: unknown chars << 20 | segments, to reach lo+i with a last segment of `kind`.
+        cost = [[_INF] * (n + 1) for _ in range(3)]
+        back = [[None] * (n + 1) for _ in range(3)]
+        word, single, unknown = cost
+        word[0] = 0  # span edges behave like a word boundary
+        scripts = codes(text[lo:hi], JAPANESE)
+        root = self.trie
+        prev_script = _OTHER
+        for i in range(n):
+            w, s, u = word[i], single[i], unknown[i]
+            script = scripts[i]
+            same = script == prev_script and script != _OTHER
+            prev_script = script
+            # Cheapest predecessor for each transition; ties keep the earlier kind.
+            best, kind = (w, _WORD) if w <= u else (u, _UNKNOWN)
+            if best == _INF and s == _INF:
+                continue
+            if same:
+                after_single = best, kind
+                after_unknown = (w, _WORD) if w <= s else (s, _SINGLE)
+                any_kind = after_unknown if after_unknown[0] <= best else after_single
+            else:
+                any_kind = (s, _SINGLE) if s < best or (s == best and kind == _UNKNOWN) else (best, kind)
+                after_single = after_unknown = any_kind
+
+            # One unknown character; not right after a one-character key of its script.
+            c, kind = after_single
+            if c != _INF and c + _UNKNOWN_COST <= unknown[i + 1]:
+                unknown[i + 1] = c + _UNKNOWN_COST
+                back[_UNKNOWN][i + 1] = (i, kind, None)
+
+            node = root.get(text[lo + i])
+            j = i
+            while node is not None:
+                j += 1
+                if '' in node:
+                    if j - i == 1 and script != _OTHER:
+                        (c, kind), target = after_unknown, _SINGLE
+                    else:
+                        (c, kind), target = any_kind, _WORD
+                    if c != _INF and c + 1 <= cost[target][j]:
+                        cost[target][j] = c + 1
+                        back[target][j] = (i, kind, text[lo + i:lo + j])
+                if j == n:
+                    break
+                node = node.get(text[lo + j])
+
+        _, kind = min((word[n], _WORD), (single[n], _SINGLE), (unknown[n], _UNKNOWN))
+        segments = []
+        i = n
+        while i > 0:
+            start, prev_kind, key = back[kind][i]
+            segments.append((lo + start, lo + i, key))
+            i, kind = start, prev_kind
+        segments.reverse()
+        return segments
+
+    def _spans(self, text):
+        spans = [match.span() for match in JAPANESE_RUN.finditer(text)]
+        if self._outside is not None:
+            spans.extend((match.start(), match.start() + len(match.group(1))) for match in self._outside.finditer(text))
+            spans.sort()
+        merged = []
+        for lo, hi in spans:
+            if merged and lo <= merged[-1][1]:
+                if hi > merged[-1][1]:
+                    merged[-1][1] = hi
+            else:
+                merged.append([lo, hi])
+        return merged
+
+    def segments(self, text):
+        """Yields (start, end, key) for every dictionary segment of `text`."""
+        if not self.mapping:
+            return
+        for lo, hi in self._spans(text):
+            for start, end, key in self._segment(text, lo, hi):
+                if key is not None:
+                    yield start, end, key
+
+    def replace_tracking(self, text):
+        """Translated text and the keys used (in order, with repeats)."""
+        used = []
+        if not self.mapping or not text:
+            return text, used
+        out = []
+        pos = 0
+        for start, end, key in self.segments(text):
+            out.append(text[pos:start])
+            out.append(self.mapping[key])
+            used.append(key)
+            pos = end
+        out.append(text[pos:])
+        return ''.join(out), used
+
+    def replace(self, text):
+        return self.replace_tracking(text)[0]
@@ -0,0 +1,106 @@
+"""
+Sharded, content-hashed build of `styles_v2` for the web front-end.
+
+`python -m darlkom.shards` writes:
+
+    library/manifest.json                           ids, names, roles + shard map
+    library/shards/styles_v2.<role>.<hash>.json     full records for one role_bucket
+
+The manifest is small and revalidated on every load; shard names change
+whenever their content does, so they can be cached forever (see _headers).
+app.js paints from the manifest and fetches shards when a filter needs them.
+
+The build streams templates.json and holds the collection as DNAModule
+records (darlkom.records) until every shard is written; they dump back to
+the same JSON, so shard hashes do not depend on how the records were held.
+"""
+import hashlib
+import json
+import os
+import re
+
+from darlkom.fingerprints import write_if_changed
+from darlkom.journal import PatchJournal, journal_path
+from darlkom.records import dump_modules, load_modules
+from darlkom.store import DEFAULT_PATH, DNALibrary
+from darlkom.stream import iter_library
+
+OUTPUT_DIR = 'library'
+SHARD_DIR = 'shards'
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FIELDS = ('module_id', 'style_name', 'role_bucket')
+HASH_LENGTH = 12
+
+
+def role_slug(role):
+    slug = re.sub(r'[^a-z0-9]+', '-', (role or 'unsorted').lower()).strip('-')
+    return slug or 'unsorted'
+
+
+def encode(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def content_hash(raw):
+    return hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]
+
+
+def load_styles(library_path=DEFAULT_PATH):
+    """Returns (deck_consistency, styles_v2 as DNAModule records)."""
+    if PatchJournal(journal_path(library_path)).exists():
+        # The raw file is missing the pending patches; load() replays them
+        library = DNALibrary.load(library_path)
+        deck = {} if library.is_legacy_list else library.data.get('deck_consistency', {})
+        return deck, load_modules(library.collection('styles_v2'))
+    deck, modules = {}, []
+    for entry in iter_library(library_path):
+        if entry.key == 'styles_v2' and entry.records is not None:
+            modules = load_modules(entry.records)
+        elif entry.key == 'deck_consistency':
+            deck = entry.value
+    return deck, modules
+
+
+def build_shards(library_path=DEFAULT_PATH, output_dir=OUTPUT_DIR):
+    """Splits styles_v2 by role_bucket. Returns the manifest that was written."""
+    deck, modules = load_styles(library_path)
+
+    by_role = {}
+    for module in modules:
+        by_role.setdefault(module.role_bucket or '', []).append(module)
+
+    shard_dir = os.path.join(output_dir, SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    shards = {}
+    written = set()
+    for role, items in by_role.items():
+        raw = encode(dump_modules(items))
+        name = f"styles_v2.{role_slug(role)}.{content_hash(raw)}.json"
+        write_if_changed(os.path.join(shard_dir, name), raw)
+        shards[role] = f"{SHARD_DIR}/{name}"
+        written.add(name)
+
+    # Old hashes are never referenced again once the manifest moves on.
+    for name in os.listdir(shard_dir):
+        if name.startswith('styles_v2.') and name not in written:
+            os.remove(os.path.join(shard_dir, name))
+
+    manifest = {
+        "version": 1,
+        "deck_consistency": deck,
+        "shards": shards,
+        "entries": [{field: getattr(module, field) for field in MANIFEST_FIELDS} for module in modules],
+    }
+    write_if_changed(os.path.join(output_dir, MANIFEST_NAME), encode(manifest))
+    return manifest
+
+
+if __name__ == "__main__":
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else OUTPUT_DIR
+    manifest = build_shards(source, target)
+    size = os.path.getsize(os.path.join(target, MANIFEST_NAME))
+    print(f"Wrote {len(manifest['shards'])} shards for {len(manifest['entries'])} DNAs to {target}/ (manifest {size} bytes).")
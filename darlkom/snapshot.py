@@ -0,0 +1,437 @@
+"""
+Columnar binary snapshot of templates.json for fast, read-only tool startup.
+
+`python -m darlkom.snapshot` writes `templates.json.snap` next to the library.
+Every record is flattened into leaf paths (e.g. design_dna.layout_rules.
+whitespace_ratio) and each path becomes one column:
+
+    f64 / i64   numeric array, e.g. whitespace_ratio
+    color       packed 0xRRGGBB (+ a lowercase flag), e.g. color_palette.primary;
+                free-text values ("#FFD700 (Gold)") fall back to a string id
+    str         id into the interned string table
+    strlist     offsets + string ids, e.g. tone_keywords, texture
+    json        id of a JSON-encoded string for anything irregular
+
+A per-record "shape" id stores which columns the record has, in their
+original key order, so records round-trip losslessly. Readers mmap the file
+and decode only the columns they touch.
+
+The file is a darlkom.container: MAGIC, the JSON directory, then 8-aligned
+column sections whose offsets the directory holds.
+"""
+import json
+import os
+import re
+from array import array
+
+from darlkom.container import Body, Container, StringTable, write_container
+from darlkom.journal import journal_path
+from darlkom.store import COLLECTIONS, DEFAULT_PATH, DNALibrary
+
+MAGIC = b'DNASNAP1'
+SNAPSHOT_SUFFIX = '.snap'
+FORMAT_VERSION = 1
+
+
+def snapshot_path(library_path):
+    return library_path + SNAPSHOT_SUFFIX
+
+
+# -- Encoding helpers ------------------------------------------------------
+
+_HEX_COLOR = re.compile(r'#([0-9A-Fa-f]{6})')
+
+
+def pack_color(value):
+    """Packs '#RRGGBB' into an int, or returns None if it would not round-trip."""
+    # Not int(x, 16) alone: it also takes a sign, '_' and surrounding spaces ("#+12345").
+    match = _HEX_COLOR.fullmatch(value) if isinstance(value, str) else None
+    if match is None:
+        return None
+    digits = match.group(1)
+    rgb = int(digits, 16)
+    if digits == digits.upper():
+        return rgb
+    if digits == digits.lower():
+        return rgb | (1 << 24)
+    return None
+
+
+# Set on color cells that hold a string id instead of a packed colour.
+COLOR_STRING_FLAG = 1 << 31
+
+
+def unpack_color(packed):
+    digits = f"{packed & 0xFFFFFF:06X}"
+    if packed >> 24:
+        digits = digits.lower()
+    return '#' + digits
+
+
+def flatten(record, prefix=()):
+    """Yields (path, leaf) in key order. Non-empty dicts are descended into."""
+    for key, value in record.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            yield from flatten(value, path)
+        else:
+            yield path, value
+
+
+def column_type(values):
+    if all(type(v) is float for v in values):
+        return 'f64'
+    if all(type(v) is int and -2**63 <= v < 2**63 for v in values):
+        return 'i64'
+    if all(isinstance(v, str) for v in values):
+        packable = sum(1 for v in values if pack_color(v) is not None)
+        return 'color' if packable * 2 >= len(values) else 'str'
+    if all(isinstance(v, list) and all(isinstance(i, str) for i in v) for v in values):
+        return 'strlist'
+    return 'json'
+
+
+def _encode_collection(records, strings, body):
+    paths = {}
+    flat_rows = []
+    for record in records:
+        row = list(flatten(record))
+        flat_rows.append(row)
+        for path, _ in row:
+            paths.setdefault(path, len(paths))
+
+    per_column = [[] for _ in paths]
+    shapes = {}
+    shape_ids = array('I')
+    for row in flat_rows:
+        shape = tuple(paths[path] for path, _ in row)
+        shape_ids.append(shapes.setdefault(shape, len(shapes)))
+        for path, value in row:
+            per_column[paths[path]].append(value)
+
+    shape_sets = [frozenset(shape) for shape in shapes]
+    columns = []
+    for path, col in paths.items():
+        present = per_column[col]
+        ctype = column_type(present)
+        values = iter(present)
+        sections = {}
+        if ctype == 'strlist':
+            offsets = array('I', [0])
+            ids = array('I')
+        else:
+            data = array({'f64': 'd', 'i64': 'q'}.get(ctype, 'I'))
+
+        for shape_id in shape_ids:
+            has = col in shape_sets[shape_id]
+            value = next(values) if has else None
+            if ctype == 'strlist':
+                if has:
+                    ids.extend(strings.intern(s) for s in value)
+                offsets.append(len(ids))
+            elif not has:
+                data.append(0)
+            elif ctype in ('f64', 'i64'):
+                data.append(value)
+            elif ctype == 'color':
+                packed = pack_color(value)
+                data.append(packed if packed is not None else COLOR_STRING_FLAG | strings.intern(value))
+            elif ctype == 'str':
+                data.append(strings.intern(value))
+            else:
+                data.append(strings.intern(json.dumps(value, ensure_ascii=False)))
+
+        if ctype == 'strlist':
+            sections['offsets'] = body.section(offsets)
+            sections['values'] = body.section(ids)
+        else:
+            sections['values'] = body.section(data)
+        columns.append({"path": list(path), "type": ctype, **sections})
+
+    return {
+        "rows": len(shape_ids),
+        "columns": columns,
+        "shapes": [list(shape) for shape in shapes],
+        "shape_ids": body.section(shape_ids),
+    }
+
+
+def build_snapshot(library_path=DEFAULT_PATH, output_path=None):
+    """Encodes templates.json (plus any pending journal) into a columnar snapshot."""
+    output_path = output_path or snapshot_path(library_path)
+    library = DNALibrary.load(library_path)
+    strings = StringTable()
+    body = Body()
+
+    directory = {"version": FORMAT_VERSION, "collections": []}
+    if library.is_legacy_list:
+        directory["layout"] = "list"
+        directory["collections"].append({"name": None, **_encode_collection(library.data, strings, body)})
+    else:
+        directory["layout"] = "dict"
+        directory["top_order"] = list(library.data.keys())
+        directory["meta"] = {k: v for k, v in library.data.items() if k not in COLLECTIONS}
+        for name in library.collection_names():
+            directory["collections"].append({"name": name, **_encode_collection(library.collection(name), strings, body)})
+    directory["strings"] = strings.sections(body)
+
+    stat = os.stat(library_path)
+    directory["source"] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return write_container(output_path, MAGIC, directory, body)
+
+
+# -- Reading ---------------------------------------------------------------
+
+class _Column:
+    def __init__(self, snap, spec):
+        self.path = tuple(spec["path"])
+        self.type = spec["type"]
+        self.values = snap.view(spec["values"], {'f64': 'd', 'i64': 'q'}.get(self.type, 'I'))
+        self.offsets = snap.view(spec["offsets"], 'I') if "offsets" in spec else None
+        self._snap = snap
+
+    def __getitem__(self, row):
+        raw = self.values
+        if self.type in ('f64', 'i64'):
+            return raw[row]
+        string = self._snap.string
+        if self.type == 'color':
+            packed = raw[row]
+            if packed & COLOR_STRING_FLAG:
+                return string(packed & ~COLOR_STRING_FLAG)
+            return unpack_color(packed)
+        if self.type == 'str':
+            return string(raw[row])
+        if self.type == 'strlist':
+            return [string(i) for i in raw[self.offsets[row]:self.offsets[row + 1]]]
+        return json.loads(string(raw[row]))
+
+
+class _Collection:
+    def __init__(self, snap, spec):
+        self.name = spec["name"]
+        self.rows = spec["rows"]
+        self.columns = [_Column(snap, c) for c in spec["columns"]]
+        self.by_path = {c.path: i for i, c in enumerate(self.columns)}
+        self.shapes = [tuple(s) for s in spec["shapes"]]
+        self.shape_sets = [frozenset(s) for s in self.shapes]
+        self.shape_ids = snap.view(spec["shape_ids"], 'I')
+
+    def has(self, row, col):
+        return col in self.shape_sets[self.shape_ids[row]]
+
+    def value(self, row, path):
+        col = self.by_path.get(tuple(path))
+        if col is None or not self.has(row, col):
+            raise KeyError(path)
+        return self.columns[col][row]
+
+    def record(self, row):
+        record = {}
+        for col in self.shapes[self.shape_ids[row]]:
+            column = self.columns[col]
+            target = record
+            for part in column.path[:-1]:
+                target = target.setdefault(part, {})
+            target[column.path[-1]] = column[row]
+        return record
+
+
+class Snapshot(Container):
+    """Read-only mmap view over a file written by `build_snapshot`."""
+
+    def __init__(self, path):
+        super().__init__(path, MAGIC, FORMAT_VERSION, 'DNA snapshot')
+        self.collections = [_Collection(self, spec) for spec in self.directory["collections"]]
+
+    def is_fresh(self, library_path):
+        try:
+            stat = os.stat(library_path)
+        except FileNotFoundError:
+            return False
+        source = self.directory.get("source", {})
+        return source.get("size") == stat.st_size and source.get("mtime_ns") == stat.st_mtime_ns
+
+    def close(self):
+        self.collections = []
+        super().close()
+
+
+class SnapshotLibrary:
+    """
+    Read-only counterpart of DNALibrary backed by a Snapshot.
+
+    Exposes the same lookup API (get, filter, by_role, collection, ...) and
+    returns plain record dicts, decoded on access. `field()` reads a single
+    value straight from its column without building the record.
+    """
+
+    def __init__(self, snapshot, path=None):
+        self.snapshot = snapshot
+        self.path = path
+        self.replayed = 0
+        self._key_index = None
+        self._role_index = None
+        self._material_index = None
+
+    @property
+    def is_legacy_list(self):
+        return self.snapshot.directory["layout"] == "list"
+
+    @property
+    def data(self):
+        """Materializes the full JSON structure (same as DNALibrary.data)."""
+        if self.is_legacy_list:
+            return self.collection(None)
+        meta = self.snapshot.directory.get("meta", {})
+        data = {}
+        for key in self.snapshot.directory["top_order"]:
+            data[key] = self.collection(key) if key in COLLECTIONS else meta[key]
+        return data
+
+    def _collection(self, name):
+        for coll in self.snapshot.collections:
+            if coll.name == name:
+                return coll
+        return None
+
+    def collection_names(self):
+        return [coll.name for coll in self.snapshot.collections]
+
+    def collection(self, name):
+        coll = self._collection(name)
+        if coll is None:
+            return []
+        return [coll.record(row) for row in range(coll.rows)]
+
+    # -- Indexes built from single columns --------------------------------
+
+    def _column_index(self, path):
+        index = {}
+        for coll in self.snapshot.collections:
+            col = coll.by_path.get(path)
+            for row in range(coll.rows):
+                value = coll.columns[col][row] if col is not None and coll.has(row, col) else None
+                index.setdefault(value, []).append((coll, row))
+        return index
+
+    def _keys(self):
+        if self._key_index is None:
+            index = {}
+            for coll in self.snapshot.collections:
+                for path in (('module_id',), ('id',)):
+                    col = coll.by_path.get(path)
+                    if col is None:
+                        continue
+                    for row in range(coll.rows):
+                        if coll.has(row, col):
+                            index.setdefault(coll.columns[col][row], (coll, row))
+            self._key_index = index
+        return self._key_index
+
+    def _roles(self):
+        if self._role_index is None:
+            self._role_index = self._column_index(('role_bucket',))
+        return self._role_index
+
+    def _materials(self):
+        if self._material_index is None:
+            self._material_index = self._column_index(('design_dna', 'materiality', 'base'))
+        return self._material_index
+
+    # -- DNALibrary-compatible lookups ------------------------------------
+
+    def __len__(self):
+        return sum(coll.rows for coll in self.snapshot.collections)
+
+    def __iter__(self):
+        for coll in self.snapshot.collections:
+            for row in range(coll.rows):
+                yield coll.record(row)
+
+    def __contains__(self, key):
+        return key in self._keys()
+
+    def get(self, key, default=None):
+        hit = self._keys().get(key)
+        if hit is None:
+            return default
+        coll, row = hit
+        return coll.record(row)
+
+    def field(self, key, path, default=None):
+        """Reads one field, e.g. field('DNA_001', 'design_dna.layout_rules.whitespace_ratio')."""
+        hit = self._keys().get(key)
+        if hit is None:
+            return default
+        if isinstance(path, str):
+            path = path.split('.')
+        coll, row = hit
+        try:
+            return coll.value(row, path)
+        except KeyError:
+            return default
+
+    def collection_of(self, key):
+        hit = self._keys().get(key)
+        return hit[0].name if hit else None
+
+    def keys(self):
+        return self._keys().keys()
+
+    def roles(self):
+        return [role for role in self._roles() if role is not None]
+
+    def materials(self):
+        return [base for base in self._materials() if base is not None]
+
+    def by_role(self, role):
+        return [coll.record(row) for coll, row in self._roles().get(role, ())]
+
+    def by_material(self, base):
+        return [coll.record(row) for coll, row in self._materials().get(base, ())]
+
+    def filter(self, role=None, material=None, collection=None):
+        hits = None
+        if role is not None:
+            hits = set(self._roles().get(role, ()))
+        if material is not None:
+            by_material = set(self._materials().get(material, ()))
+            hits = by_material if hits is None else hits & by_material
+        if hits is None:
+            if collection:
+                yield from self.collection(collection)
+            else:
+                yield from self
+            return
+        for coll, row in sorted(hits, key=lambda hit: (self.snapshot.collections.index(hit[0]), hit[1])):
+            if not collection or coll.name == collection:
+                yield coll.record(row)
+
+
+def open_library(path=DEFAULT_PATH):
+    """
+    Returns a SnapshotLibrary when a fresh snapshot exists for `path`,
+    otherwise falls back to DNALibrary.load(). Use it in read-only tools;
+    anything that writes should keep using DNALibrary.
+    """
+    snap_path = snapshot_path(path)
+    if os.path.exists(snap_path) and not os.path.exists(journal_path(path)):
+        try:
+            snapshot = Snapshot(snap_path)
+        except ValueError:
+            snapshot = None
+        if snapshot is not None:
+            if snapshot.is_fresh(path):
+                return SnapshotLibrary(snapshot, path)
+            snapshot.close()
+    return DNALibrary.load(path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    target = sys.argv[2] if len(sys.argv) > 2 else snapshot_path(source)
+    build_snapshot(source, target)
+    print(f"Snapshot written to {target} ({os.path.getsize(target)} bytes, source {os.path.getsize(source)} bytes).")
@@ -0,0 +1,278 @@
+import json
+
+from darlkom.fingerprints import data_fingerprints, diff, is_dirty, read_manifest, write_manifest
+from darlkom.journal import PatchJournal, check_path, journal_path, replay, set_path, write_snapshot
+from darlkom.schema import SchemaError, check_records, validate_record
+
+DEFAULT_PATH = 'templates.json'
+
+# Record collections inside templates.json, in load order.
+COLLECTIONS = ('styles_v2', 'styles_001_100')
+
+
+def record_key(item):
+    """v2 records are keyed by module_id, legacy records by their numeric id."""
+    if 'module_id' in item:
+        return item['module_id']
+    return item.get('id')
+
+
+def record_material(item):
+    dna = item.get('design_dna')
+    if isinstance(dna, dict):
+        materiality = dna.get('materiality')
+        if isinstance(materiality, dict):
+            return materiality.get('base')
+    return None
+
+
+class DNALibrary:
+    """
+    Loads templates.json once and keeps hash indexes over every record.
+
+    Supports both layouts we have shipped: the current dict with
+    `styles_v2` / `styles_001_100` lists, and the original flat list.
+    Records are the plain dicts from the file, so in-place edits are
+    picked up by `save()`; call `reindex()` after changing an indexed field.
+
+    Small edits should go through `set_field()` + `commit()`, which append
+    to the patch journal instead of rewriting the whole file. `load()`
+    replays any pending journal, so every tool sees the same state.
+    """
+
+    def __init__(self, data, path=None):
+        self.data = data
+        self.path = path
+        self.replayed = 0
+        self._pending = []
+        self.reindex()
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, journal=True):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        library = cls(data, path)
+        if journal:
+            library.replayed = replay(library, library.journal())
+        return library
+
+    def journal(self):
+        return PatchJournal(journal_path(self.path or DEFAULT_PATH))
+
+    # -- Layout -----------------------------------------------------------
+
+    @property
+    def is_legacy_list(self):
+        return isinstance(self.data, list)
+
+    def collection(self, name):
+        """Returns the record list for `name` (None for the flat list layout)."""
+        if self.is_legacy_list:
+            return self.data if name is None else []
+        if name is None:
+            return []
+        return self.data.get(name, [])
+
+    def collection_names(self):
+        if self.is_legacy_list:
+            return [None]
+        return [name for name in COLLECTIONS if name in self.data]
+
+    # -- Indexes ----------------------------------------------------------
+
+    def reindex(self):
+        self._by_key = {}
+        self._collection_of = {}
+        self._by_role = {}
+        self._by_material = {}
+        for name in self.collection_names():
+            for item in self.collection(name):
+                self._index(item, name)
+
+    def _index(self, item, name):
+        key = record_key(item)
+        if key is not None and key not in self._by_key:
+            self._by_key[key] = item
+            self._collection_of[key] = name
+        self._by_role.setdefault(item.get('role_bucket'), []).append(item)
+        self._by_material.setdefault(record_material(item), []).append(item)
+
+    # -- Lookups ----------------------------------------------------------
+
+    def __len__(self):
+        return sum(len(self.collection(name)) for name in self.collection_names())
+
+    def __iter__(self):
+        for name in self.collection_names():
+            yield from self.collection(name)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def get(self, key, default=None):
+        return self._by_key.get(key, default)
+
+    def collection_of(self, key):
+        return self._collection_of.get(key)
+
+    def keys(self):
+        return self._by_key.keys()
+
+    def roles(self):
+        return [role for role in self._by_role if role is not None]
+
+    def materials(self):
+        return [base for base in self._by_material if base is not None]
+
+    def by_role(self, role):
+        return list(self._by_role.get(role, ()))
+
+    def by_material(self, base):
+        return list(self._by_material.get(base, ()))
+
+    def filter(self, role=None, material=None, collection=None):
+        """
+        Iterates records matching every given criterion.
+        Starts from the narrowest index instead of scanning the library.
+        """
+        candidates = None
+        if role is not None:
+            candidates = self._by_role.get(role, ())
+        if material is not None:
+            by_material = self._by_material.get(material, ())
+            if candidates is None or len(by_material) < len(candidates):
+                candidates = by_material
+        if candidates is None:
+            candidates = self.collection(collection) if collection else self
+
+        for item in candidates:
+            if role is not None and item.get('role_bucket') != role:
+                continue
+            if material is not None and record_material(item) != material:
+                continue
+            if collection and self._collection_of.get(record_key(item)) != collection:
+                continue
+            yield item
+
+    # -- Mutation ---------------------------------------------------------
+
+    def transform(self, record_fn, meta_fn=None):
+        """
+        In-memory counterpart of darlkom.stream.stream_transform: replaces
+        every record with record_fn(record, collection) (None drops it) and
+        every top-level non-collection value with meta_fn(value), then
+        reindexes. Returns the number of records kept.
+        """
+        if meta_fn is not None and not self.is_legacy_list:
+            for key in list(self.data):
+                if key not in COLLECTIONS or not isinstance(self.data[key], list):
+                    self.data[key] = meta_fn(self.data[key])
+        count = 0
+        for name in self.collection_names():
+            records = self.collection(name)
+            kept = [record for record in (record_fn(item, name) for item in records) if record is not None]
+            records[:] = kept
+            count += len(kept)
+        self.reindex()
+        return count
+
+    def add(self, item, collection='styles_v2', journal=False):
+        """
+        Appends a record to `collection`. Returns False if its key already exists.
+        With journal=True the insert is also queued for the next `commit()`.
+        """
+        key = record_key(item)
+        if key is not None and key in self._by_key:
+            return False
+        if self.is_legacy_list:
+            self.data.append(item)
+            collection = None
+        else:
+            self.data.setdefault(collection, []).append(item)
+        self._index(item, collection)
+        if journal:
+            self._pending.append({"op": "add", "key": key, "collection": collection, "value": item})
+        return True
+
+    def set_field(self, key, path, value):
+        """
+        Sets a (possibly nested) field on one record and queues the patch.
+        `path` is a list of keys, e.g. ['design_dna', 'materiality', 'base'].
+        Returns False if the record is missing or already holds `value`.
+        Raises ValueError, queuing nothing, if `path` runs through a value
+        that is not an object (a patch that could never be replayed).
+        """
+        record = self._by_key.get(key)
+        if record is None:
+            return False
+        if isinstance(path, str):
+            path = [path]
+        check_path(record, path)
+        current = record
+        for part in path:
+            if not isinstance(current, dict) or part not in current:
+                current = _MISSING
+                break
+            current = current[part]
+        if current == value:
+            return False
+        set_path(record, path, value)
+        self._pending.append({"op": "set", "key": key, "path": list(path), "value": value})
+        if path[0] == 'role_bucket' or list(path[:2]) in (['design_dna'], ['design_dna', 'materiality']):
+            self.reindex()
+        return True
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def commit(self, validate=True):
+        """
+        Appends queued patches to the journal. Returns how many were written.
+        Raises SchemaError (and keeps the patches queued) if a touched v2
+        record no longer matches the schema.
+        """
+        if validate:
+            violations = []
+            for key in dict.fromkeys(p['key'] for p in self._pending):
+                if self._collection_of.get(key) == 'styles_v2':
+                    violations.extend(validate_record(self._by_key[key]))
+            if violations:
+                raise SchemaError(violations)
+        written = self.journal().append(self._pending)
+        self._pending = []
+        return written
+
+    # -- Dirty tracking ---------------------------------------------------
+
+    def fingerprints(self):
+        return data_fingerprints(self.data, COLLECTIONS)
+
+    def changes(self, path=None):
+        """Records added/changed/removed relative to the last save to `path` (see darlkom.fingerprints)."""
+        path = path or self.path or DEFAULT_PATH
+        return diff(read_manifest(path), self.fingerprints())
+
+    def save(self, path=None, validate=True):
+        """
+        Writes a full snapshot atomically (temp file + rename). Saving over
+        the library's own path folds in the journal, which is then dropped.
+        Raises SchemaError without writing if styles_v2 fails validation.
+        Returns False, without touching the file, if no record or top-level
+        value differs from what was last saved there.
+        """
+        path = path or self.path or DEFAULT_PATH
+        if validate and not self.is_legacy_list:
+            check_records(self.collection('styles_v2'))
+        fingerprints = self.fingerprints()
+        written = is_dirty(path, fingerprints)
+        if written:
+            write_snapshot(self.data, path)
+            write_manifest(path, fingerprints)
+        if path == (self.path or DEFAULT_PATH):
+            self.journal().clear()
+            self._pending = []
+        return written
+
+
+_MISSING = object()
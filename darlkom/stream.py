@@ -0,0 +1,310 @@
+"""
+Streaming reader/writer for DNA libraries too large for json.load.
+
+The reader walks the top-level structure incrementally and yields records
+of each collection (`styles_v2`, `styles_001_100`, or the flat legacy list)
+one at a time; small top-level values such as `deck_consistency` are decoded
+whole. The writer emits the same `indent=2` layout json.dump produces, one
+record at a time, into a temp file that is renamed over the target on close.
+Memory stays proportional to the largest single record.
+
+    for entry in iter_library('templates.json'):
+        if entry.records is not None:
+            for record in entry.records: ...
+
+Scripts expose this through `--stream` (see `add_stream_arguments`).
+"""
+import argparse
+import json
+from collections import namedtuple
+
+from darlkom.atomic import AtomicFile
+from darlkom.fingerprints import LIST_COLLECTION, fingerprint, is_dirty, record_fingerprint, write_manifest
+from darlkom.journal import PatchJournal, journal_path
+from darlkom.schema import SchemaError, validate_record
+from darlkom.store import COLLECTIONS, DEFAULT_PATH
+
+CHUNK_SIZE = 1 << 16
+
+# One top-level entry: `records` is an iterator for collections, else `value` holds the data.
+Entry = namedtuple('Entry', 'key value records')
+
+_WS = ' \t\n\r'
+_DELIMITERS = _WS + ',]}'
+
+
+class _Reader:
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer never holds more than a record or two.
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} near offset {self.pos}, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number cut by the chunk boundary ("15" of "1500.0") decodes short;
+            # only trust it once a delimiter follows.
+            truncated = end == len(self.buf) or (
+                isinstance(value, (int, float)) and self.buf[end] not in _DELIMITERS)
+            if truncated and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"expected ',' or ']' in array, got {char!r}")
+
+
+def iter_library(path=DEFAULT_PATH, chunk_size=CHUNK_SIZE):
+    """
+    Yields an Entry per top-level item of the library file, in file order.
+    For collections `records` is a lazy iterator that must be consumed (or
+    abandoned) before advancing; the flat legacy layout yields one Entry
+    with key None.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        first = reader.peek()
+        if first == '[':
+            yield Entry(None, None, reader.array_items())
+            return
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key in COLLECTIONS and reader.peek() == '[':
+                records = reader.array_items()
+                yield Entry(key, None, records)
+                for _ in records:
+                    pass  # skip whatever the caller did not read
+            else:
+                yield Entry(key, reader.value(), None)
+            char = reader.peek()
+            reader.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise ValueError(f"expected ',' or '}}' after {key!r}, got {char!r}")
+
+
+def iter_records(path=DEFAULT_PATH, collection='styles_v2', chunk_size=CHUNK_SIZE):
+    """Yields the records of one collection (None for the flat list layout)."""
+    for entry in iter_library(path, chunk_size):
+        if entry.key == collection and entry.records is not None:
+            yield from entry.records
+            return
+
+
+def _indented(value, depth):
+    text = json.dumps(value, indent=2, ensure_ascii=False)
+    return text.replace('\n', '\n' + '  ' * depth)
+
+
+class StreamWriter:
+    """
+    Writes a library file incrementally with json.dump(indent=2) layout.
+
+        with StreamWriter('templates.json') as out:
+            out.write_meta('deck_consistency', {...})
+            out.begin_collection('styles_v2')
+            for record in records:
+                out.write_record(record)
+
+    Pass layout='list' for the flat legacy layout (a single collection).
+    v2 records are validated as they are written; a SchemaError aborts the
+    write and leaves the target untouched. Records are fingerprinted as they
+    go; if nothing differs from the target's fingerprint sidecar the temp
+    file is discarded and `written` stays False.
+    """
+
+    def __init__(self, path, layout='dict', validate=True):
+        self.path = path
+        self.layout = layout
+        self.validate = validate
+        self.out = AtomicFile(path)
+        self.f = None
+        self.entries = 0
+        self.collection = False
+        self.collection_name = None
+        self.records = 0
+        self.count = 0
+        self.fingerprints = {"meta": {}, "collections": {}}
+        self.written = False
+
+    def __enter__(self):
+        self.f = self.out.open()
+        if self.layout == 'dict':
+            self.f.write('{')
+        return self
+
+    def _key(self, key):
+        self.f.write(',\n  ' if self.entries else '\n  ')
+        self.f.write(json.dumps(key, ensure_ascii=False) + ': ')
+        self.entries += 1
+
+    def write_meta(self, key, value):
+        self.end_collection()
+        self._key(key)
+        self.f.write(_indented(value, 1))
+        self.fingerprints["meta"][key] = fingerprint(value)
+
+    def begin_collection(self, name):
+        self.end_collection()
+        if self.layout == 'dict':
+            self._key(name)
+        self.f.write('[')
+        self.collection = True
+        self.collection_name = name
+        self.records = 0
+        self._fingerprints = self.fingerprints["collections"].setdefault(
+            LIST_COLLECTION if name is None else name, [])
+
+    def write_record(self, record):
+        if self.validate and self.collection_name == 'styles_v2':
+            violations = validate_record(record)
+            if violations:
+                raise SchemaError(violations)
+        depth = 2 if self.layout == 'dict' else 1
+        self.f.write(',\n' if self.records else '\n')
+        self.f.write('  ' * depth + _indented(record, depth))
+        self.records += 1
+        self.count += 1
+        self._fingerprints.append(record_fingerprint(record))
+
+    def end_collection(self):
+        if not self.collection:
+            return
+        if self.records:
+            self.f.write('\n' + ('  ' if self.layout == 'dict' else '') + ']')
+        else:
+            self.f.write(']')
+        self.collection = False
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.end_collection()
+                if self.layout == 'dict':
+                    self.f.write('\n}' if self.entries else '}')
+            if exc_type is None and is_dirty(self.path, self.fingerprints):
+                self.out.commit()
+                write_manifest(self.path, self.fingerprints)
+                self.written = True
+        finally:
+            self.out.close()
+        return False
+
+
+def check_no_journal(*paths):
+    """
+    Raises RuntimeError if any of `paths` has pending journal patches.
+    Call before streaming from or over a library: the next
+    DNALibrary.load() would replay those patches over the streamed file
+    and undo it. Reading the raw file would also miss them.
+    """
+    for path in dict.fromkeys(paths):
+        if path and PatchJournal(journal_path(path)).exists():
+            raise RuntimeError(f"{path} has pending journal patches; run `python -m darlkom.journal` first")
+
+
+def stream_transform(source, target, record_fn, meta_fn=None, chunk_size=CHUNK_SIZE):
+    """
+    Copies `source` to `target` one record at a time through
+    record_fn(record, collection) -> record (None drops it). Top-level
+    non-collection values go through meta_fn(value) if given.
+    `target` may equal `source`. Returns the number of records written.
+    """
+    check_no_journal(source, target)
+    entries = iter_library(source, chunk_size)
+    first = next(entries, None)
+    layout = 'list' if first is not None and first.key is None and first.records is not None else 'dict'
+    with StreamWriter(target, layout) as out:
+        for entry in ([first] if first is not None else []):
+            _copy_entry(out, entry, record_fn, meta_fn)
+        for entry in entries:
+            _copy_entry(out, entry, record_fn, meta_fn)
+    return out.count
+
+
+def _copy_entry(out, entry, record_fn, meta_fn):
+    if entry.records is None:
+        out.write_meta(entry.key, meta_fn(entry.value) if meta_fn else entry.value)
+        return
+    out.begin_collection(entry.key)
+    for record in entry.records:
+        result = record_fn(record, entry.key)
+        if result is not None:
+            out.write_record(result)
+
+
+def add_stream_arguments(parser, default_input=DEFAULT_PATH):
+    """Shared `--stream/--input/--output` flags for migration and translation scripts."""
+    parser.add_argument('--stream', action='store_true',
+                        help='process records one at a time in constant memory')
+    parser.add_argument('--input', default=default_input, help='library file to read')
+    parser.add_argument('--output', default=None, help='file to write (defaults to --input)')
+    return parser
+
+
+def parse_stream_args(description, default_input=DEFAULT_PATH, incremental=False, parallel=False):
+    parser = argparse.ArgumentParser(description=description)
+    add_stream_arguments(parser, default_input)
+    if incremental:
+        parser.add_argument('--incremental', action='store_true',
+                            help='only process records whose source fields changed since the last run')
+    if parallel:
+        from darlkom.parallel import add_parallel_arguments  # only scripts that can use a process pool load it
+        add_parallel_arguments(parser)
+    args = parser.parse_args()
+    if parallel and args.workers and (args.stream or getattr(args, 'incremental', False)):
+        parser.error('--workers cannot be combined with --stream or --incremental')
+    args.output = args.output or args.input
+    return args
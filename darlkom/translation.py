@@ -0,0 +1,157 @@
+"""
+Compiled, memoized translation tables.
+
+    TABLE = translation_table(TRANSLATION_MAP)
+    TABLE.replace(text)
+
+`translation_table` returns the same TranslationTable for the same dict
+from any module, and the matcher (darlkom.automaton) is compiled on first
+use only, so translating many strings costs one compile plus one pass
+per string. Tables merge without compiling:
+
+    jp_any = translation_table(JP_TO_EN).merge(translation_table(JP_TO_KO))
+
+Later tables win on duplicate keys. Merged tables are memoized too.
+
+`target` is the output language ('en', 'ko'); with a darlkom.memory
+session open, replace() and segment() answer repeated strings from the
+on-disk translation memory. segment() (darlkom.segmenter) is for Japanese
+input where one-character keys would otherwise fire inside words.
+
+Whole-token lookups (`lookup`) try the exact key, then a case-folded,
+NFKC-normalized index built once per table, so "playful", "PLAYFUL" and
+full-width "ＰＬＡＹＦＵＬ" all hit "Playful" in O(1). Each table counts
+its lookup hits and misses to show dictionary coverage.
+"""
+import unicodedata
+from collections.abc import Mapping, MutableMapping
+
+from darlkom.automaton import Automaton
+from darlkom.segmenter import Segmenter
+
+_tables = {}
+_merged = {}
+
+
+def fold(text):
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+class TranslationTable:
+    def __init__(self, mapping, name=None, target=None):
+        # Read-only mappings (a compiled darlkom.lexicon table) are used in place.
+        read_only = isinstance(mapping, Mapping) and not isinstance(mapping, MutableMapping)
+        self.mapping = mapping if read_only else dict(mapping)
+        self.name = name
+        self.target = target
+        self.memory = None
+        self._automaton = None
+        self._segmenter = None
+        self._folded = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.mapping)
+
+    def __contains__(self, key):
+        return key in self.mapping
+
+    def __repr__(self):
+        return f"TranslationTable({self.name or '<anonymous>'}, {len(self.mapping)} keys)"
+
+    @property
+    def automaton(self):
+        if self._automaton is None:
+            self._automaton = Automaton(self.mapping)
+        return self._automaton
+
+    @property
+    def segmenter(self):
+        if self._segmenter is None:
+            self._segmenter = Segmenter(self.mapping)
+        return self._segmenter
+
+    def get(self, key, default=None):
+        return self.mapping.get(key, default)
+
+    @property
+    def folded(self):
+        """fold(key) -> value. On collisions the first key in dictionary order wins."""
+        if self._folded is None:
+            folded = {}
+            for key, value in self.mapping.items():
+                folded.setdefault(fold(key), value)
+            self._folded = folded
+        return self._folded
+
+    def lookup(self, token, default=None):
+        """Exact match, else case/width-insensitive match. Counts a hit or a miss."""
+        value = self.mapping.get(token)
+        if value is None:
+            value = self.folded.get(fold(token))
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def coverage(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def format_coverage(self):
+        return (f"{self.name or 'dictionary'}: {self.hits} hits, {self.misses} misses "
+                f"({self.coverage():.1%} coverage)")
+
+    def replace(self, text):
+        """Rewrites every key occurring in `text` in one leftmost-longest pass."""
+        if not self.mapping or not text:
+            return text
+        if self.memory is not None:
+            return self.memory.translate(self, text)
+        return self.automaton.replace(text)
+
+    def segment(self, text):
+        """
+        Like replace(), but picks the best segmentation of Japanese runs and only
+        lets one-character keys ("の", "夜") match at word boundaries.
+        """
+        if not self.mapping or not text:
+            return text
+        if self.memory is not None:
+            return self.memory.translate(self, text, 'segment')
+        return self.segmenter.replace(text)
+
+    def merge(self, *others):
+        """A table with this table's keys overridden by each of `others` in turn."""
+        key = (id(self),) + tuple(id(other) for other in others)
+        cached = _merged.get(key)
+        if cached is not None and cached[0] == (self,) + others:
+            return cached[1]
+        mapping = dict(self.mapping)
+        for other in others:
+            mapping.update(other.mapping)
+        names = [t.name for t in (self,) + others if t.name]
+        targets = {t.target for t in (self,) + others}
+        table = TranslationTable(mapping, '+'.join(names) or None, targets.pop() if len(targets) == 1 else None)
+        # Holding the inputs keeps their ids from being reused while cached.
+        _merged[key] = ((self,) + others, table)
+        return table
+
+
+def translation_table(mapping, name=None, target=None):
+    """
+    The shared TranslationTable for `mapping`. Calls with the same dict
+    (and unchanged contents) return the already compiled table.
+    """
+    cached = _tables.get(id(mapping))
+    if cached is not None and cached[0] is mapping and (cached[1].mapping is mapping or cached[1].mapping == mapping):
+        return cached[1]
+    table = TranslationTable(mapping, name, target)
+    _tables[id(mapping)] = (mapping, table)
+    return table
+
+
+def shared_tables():
+    return [table for _, table in _tables.values()]
@@ -1,21 +1,12 @@
-import json
+from darlkom.journal import compact_hint
+from darlkom.lexicon import lexicon_table
+from darlkom.store import DNALibrary, record_key
 
-EN_TO_KR_MAP = {
-    "Authentic.": "진정성 있는",
-    "Modern.": "모던한",
-    "Sparkle.": "반짝이는",
-    "Colorful.": "다채로운",
-    "Memphis": "멤피스 스타일",
-    "Flat illustration": "플랫 일러스트레이션",
-    "Geometric": "기하학적",
-    "Bauhaus": "바우하우스"
-}
+TABLE = lexicon_table('remaining_en_ko')
 
 def fix_remaining_english():
-    with open('templates.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    styles = data.get('styles_001_100', [])
+    library = DNALibrary.load('templates.json')
+    styles = library.collection('styles_001_100')
     count = 0
 
     for item in styles:
@@ -25,20 +16,20 @@ def fix_remaining_english():
         changed = False
         
         for w in words:
-            if w in EN_TO_KR_MAP:
-                new_words.append(EN_TO_KR_MAP[w])
+            if w in TABLE:
+                new_words.append(TABLE.get(w))
                 changed = True
             else:
                 new_words.append(w)
         
-        if changed:
-            item['elaboration'] = ", ".join(new_words)
+        if changed and library.set_field(record_key(item), ['elaboration'], ", ".join(new_words)):
             count += 1
 
+    # Only the changed elaborations are journaled; `python -m darlkom.journal` folds them in.
+    written = library.commit()
     print(f"Fixed {count} remaining items.")
-
-    with open('templates.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if written:
+        print(compact_hint(library.path))
 
 if __name__ == "__main__":
     fix_remaining_english()
@@ -1,6 +1,7 @@
-import json
 import random
 
+from darlkom.store import DNALibrary
+
 # Categories and Seeds
 categories = {
     "Corporate": [
@@ -116,19 +117,17 @@ def generate():
     
     # Load existing and merge
     try:
-        with open('templates.json', 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        current_list = data.get('styles_v2', [])
-        # Check for duplicates? For now just append
-        current_list.extend(new_items)
-        
-        data['styles_v2'] = current_list
-        
-        with open('templates.json', 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-            
-        print("Successfully merged into templates.json")
+        library = DNALibrary.load('templates.json')
+
+        added = 0
+        for item in new_items:
+            # Skip module_ids that are already in the library
+            if library.add(item, 'styles_v2'):
+                added += 1
+
+        library.save()
+
+        print(f"Successfully merged {added} designs into templates.json")
         
     except Exception as e:
         print(f"Error: {e}")
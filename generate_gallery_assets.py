@@ -1,10 +1,12 @@
-import json
 import os
 import time
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
+from darlkom.fingerprints import BuildCache, fingerprint, fingerprint_path
+from darlkom.snapshot import open_library
+
 # Load environment variables
 load_dotenv()
 
@@ -12,11 +14,15 @@ load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 JSON_PATH = "templates.json"
 OUTPUT_DIR = "assets/thumbnails"
+# Fingerprint of the prompt, model and size each thumbnail was generated from;
+# only edits that change the request get a new image.
+CACHE_PATH = fingerprint_path(OUTPUT_DIR + ".prompts")
 
 # -----------------------------------------------------------------------------
 # MODEL CONFIGURATION
 # -----------------------------------------------------------------------------
 MODEL_NAME = "imagen-4.0-fast-generate-001" 
+ASPECT_RATIO = "16:9"
 # -----------------------------------------------------------------------------
 
 # Initialize Client
@@ -67,7 +73,7 @@ def generate_image_google(prompt, output_path):
             prompt=prompt,
             config=types.GenerateImagesConfig(
                 number_of_images=1,
-                aspect_ratio="16:9",
+                aspect_ratio=ASPECT_RATIO,
             )
         )
 
@@ -89,18 +95,17 @@ def main():
     ensure_dir(OUTPUT_DIR)
     
     try:
-        with open(JSON_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        dna_list = []
-        if isinstance(data, list):
-            dna_list = data
-        elif "styles_001_100" in data:
-            dna_list = data["styles_001_100"]
+        library = open_library(JSON_PATH)
+
+        if library.is_legacy_list:
+            dna_list = library.collection(None)
+        else:
+            dna_list = library.collection("styles_001_100")
 
         print(f"Found {len(dna_list)} DNA entries.")
         print(f"Using Model: {MODEL_NAME}")
 
+        cache = BuildCache(CACHE_PATH)
         count = 0
         for dna in dna_list:
             dna_id = dna.get("id")
@@ -109,19 +114,32 @@ def main():
 
             filename = f"dna_{dna_id}.png"
             output_path = os.path.join(OUTPUT_DIR, filename)
+            prompt = get_or_synthesize_prompt(dna)
+            fp = fingerprint([prompt, MODEL_NAME, ASPECT_RATIO])
+            previous = cache.entries.get(str(dna_id))
 
             if os.path.exists(output_path):
-                print(f"Skipping {filename} (Already exists)")
-                continue
+                if cache.get(dna_id, fp) is not None:
+                    print(f"Skipping {filename} (Unchanged)")
+                    continue
+                if previous is None:
+                    # Generated before fingerprints were tracked; adopt it as current.
+                    cache.put(dna_id, fp, filename)
+                    print(f"Skipping {filename} (Already exists)")
+                    continue
+                print(f"Regenerating {filename} (prompt changed)")
 
-            prompt = get_or_synthesize_prompt(dna)
-            
             success = generate_image_google(prompt, output_path)
             
             if success:
+                cache.put(dna_id, fp, filename)
                 count += 1
                 time.sleep(4) 
+            elif previous is not None:
+                cache.put(dna_id, previous[0], previous[1])
 
+        if client:
+            cache.save()
         print(f"Batch generation complete. Generated {count} new images.")
 
     except Exception as e:
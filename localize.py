@@ -0,0 +1,132 @@
+"""
+Runs every localization pass over the library in one load/save.
+
+Equivalent to running translate_db.py, final_translate.py,
+translate_jp_to_kr.py, batch_translate_all.py,
+translate_english_legacy_to_ko.py and clean_cjk.py one after another,
+but the library is parsed and written once and each record goes through
+all the stages while it is in hand.
+
+    python localize.py                      # all stages, in place
+    python localize.py --stages final_translate,clean_cjk
+    python localize.py --stream --output out.json
+    python localize.py --workers 4 --chunk-size 16 --compare
+    python localize.py --llm-fallback --llm-base-url http://localhost:8000/v1
+
+With --llm-fallback, Japanese that survives the dictionary stages is sent
+to a model (darlkom.fallback) before clean_cjk would strip it.
+"""
+import copy
+import time
+
+# Importing the scripts registers their stages.
+import batch_translate_all  # noqa: F401
+import clean_cjk  # noqa: F401
+import final_translate  # noqa: F401
+import translate_db  # noqa: F401
+import translate_english_legacy_to_ko  # noqa: F401
+import translate_jp_to_kr  # noqa: F401
+from darlkom.fallback import add_fallback_arguments, from_args
+from darlkom.memory import memory_session
+from darlkom.parallel import DEFAULT_CHUNK_SIZE, add_parallel_arguments, format_stats, run_parallel
+from darlkom.pipeline import Pipeline
+from darlkom.store import DNALibrary
+from darlkom.stream import add_stream_arguments, stream_transform
+
+LOCALIZATION_STAGES = (
+    'translate_db',
+    'final_translate',
+    'translate_jp_to_kr',
+    'batch_translate_all',
+    'translate_english_legacy_to_ko',
+    'clean_cjk',
+)
+
+
+def localize(source='templates.json', target=None, stream=False, stages=LOCALIZATION_STAGES,
+             workers=0, chunk_size=DEFAULT_CHUNK_SIZE, compare=False, fallback=None):
+    """`fallback`, a darlkom.fallback.FallbackTranslator, runs between the dictionaries and clean_cjk."""
+    if fallback is not None and (stream or workers):
+        raise ValueError("the LLM fallback needs the whole library in memory (no stream/workers)")
+    if workers:
+        return localize_parallel(source, target, stages, workers, chunk_size, compare)
+    pipeline = Pipeline(stages)
+    start = time.perf_counter()
+    with memory_session() as memory:
+        if stream:
+            count = stream_transform(source, target or source, pipeline.apply, pipeline.apply_meta)
+            written = None
+        else:
+            library = DNALibrary.load(source)
+            if fallback is None:
+                pipeline.run(library)
+            else:
+                # The residue has to be collected from the whole library, so the run is cut in two.
+                dictionaries, cleanup = pipeline.split('clean_cjk')
+                dictionaries.run(library)
+                fallback.memory = memory
+                fallback.run(library)
+                cleanup.run(library)
+            changes = library.changes(target)
+            written = library.save(target)
+            count = len(library)
+    elapsed = time.perf_counter() - start
+
+    print(pipeline.format_report())
+    if fallback is not None:
+        print(fallback.format_stats())
+    print(f"Localized {count} records in {elapsed:.3f}s (load + stages + save) -> {target or source}")
+    if written is False:
+        print("No record changed; file left untouched.")
+    elif written:
+        print(f"{len(changes.changed)} changed, {len(changes.added)} added, {len(changes.removed)} removed since last save.")
+    return pipeline
+
+
+def localize_parallel(source, target, stages, workers, chunk_size, compare=False):
+    """
+    Runs the stages in a process pool. With compare=True the serial path is
+    timed on a copy of the same data first, and the two outputs must match.
+    """
+    library = DNALibrary.load(source)
+    serial_seconds = None
+    if compare:
+        reference = DNALibrary(copy.deepcopy(library.data), library.path)
+        start = time.perf_counter()
+        Pipeline(stages).run(reference)
+        serial_seconds = time.perf_counter() - start
+
+    pipeline = Pipeline(stages)
+    stats = run_parallel(pipeline, library, workers, chunk_size)
+    if compare and library.data != reference.data:
+        raise RuntimeError("parallel output differs from the serial run; nothing was written")
+    written = library.save(target)
+
+    print(pipeline.format_report())
+    print(format_stats(stats, serial_seconds))
+    if not written:
+        print("No record changed; file left untouched.")
+    return pipeline
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run all localization passes in a single load/save.")
+    add_stream_arguments(parser)
+    add_parallel_arguments(parser)
+    add_fallback_arguments(parser)
+    parser.add_argument('--stages', default=','.join(LOCALIZATION_STAGES),
+                        help='comma-separated stage names, in run order')
+    parser.add_argument('--compare', action='store_true',
+                        help='with --workers, also time the serial path and check both outputs match')
+    args = parser.parse_args()
+    if args.workers and args.stream:
+        parser.error('--workers cannot be combined with --stream')
+    if args.llm_fallback and (args.stream or args.workers):
+        parser.error('--llm-fallback needs the whole library in memory; drop --stream/--workers')
+    # Checked before any stage runs, so a missing key or package is a usage error, not a traceback.
+    fallback = from_args(args, parser=parser) if args.llm_fallback else None
+    localize(args.input, args.output or args.input, args.stream,
+             [name.strip() for name in args.stages.split(',') if name.strip()],
+             args.workers, args.chunk_size, args.compare, fallback)
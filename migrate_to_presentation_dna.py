@@ -1,65 +1,91 @@
-import json
 import os
 
-def migrate_db():
-    source_path = 'templates.json'
-    
+from darlkom.store import DNALibrary
+from darlkom.stream import StreamWriter, check_no_journal, iter_records, parse_stream_args
+
+DECK_CONSISTENCY = {
+    "global_rule": "Consistent 16:9 layout with minimal clutter.",
+    "anchor_motif": "Top-left geometric marker",
+    "palette_harmony_rule": "Limit to 3 main colors per slide",
+    "typography_mood_hint": "Clean, Sans-serif, deeply legible"
+}
+
+def convert_item(item):
+    """Converts one flat legacy item into a Presentation DNA record."""
+    # Heuristic to guess role
+    title_lower = item.get('title', '').lower()
+    role = "Structure"
+    if "notebook" in title_lower or "doodle" in title_lower:
+        role = "Opening / Emotional"
+    elif "neon" in title_lower or "cyber" in title_lower:
+        role = "High Impact"
+    elif "b&w" in title_lower or "minimal" in title_lower:
+        role = "Content / Data"
+
+    new_item = {
+        "id": item.get('id'),
+        "title": item.get('title'),
+        "role_bucket": role,
+        "slide_intent": ["title", "content"] if role == "Structure" else ["impact"],
+        "image_prompt_one_line": item.get('prompt', "No prompt available."),
+        "negative_prompt": "clutter, text overlay, chaotic, low resolution, watermark",
+        "elaboration": f"Migrated from legacy: {item.get('tone', '')}",
+        "palette": item.get('palette'), # Keep strictly for backward compat in rendering
+        "fidelity_score": 0 # Default for tuning loop
+    }
+    return new_item
+
+def migrate_db(source_path='templates.json', target_path=None, stream=False):
+    target_path = target_path or source_path
+
     if not os.path.exists(source_path):
-        print("templates.json not found.")
+        print(f"{source_path} not found.")
+        return
+
+    if stream:
+        with open(source_path, 'r', encoding='utf-8') as f:
+            first = f.read(4096).lstrip()[:1]
+        if first != '[':
+            print("Data is already in new format.")
+            return
+        check_no_journal(source_path, target_path)
+        with StreamWriter(target_path) as out:
+            out.write_meta("deck_consistency", DECK_CONSISTENCY)
+            out.begin_collection("styles_001_100")
+            for item in iter_records(source_path, None):
+                out.write_record(convert_item(item))
+        print(f"Migrated {out.count} items.")
+        print(f"Migration complete. {target_path} updated to Presentation DNA structure.")
         return
 
-    with open(source_path, 'r', encoding='utf-8') as f:
-        old_data = json.load(f)
+    library = DNALibrary.load(source_path)
 
     # If already in new format, skip
-    if isinstance(old_data, dict) and "styles_001_100" in old_data:
+    if not library.is_legacy_list:
         print("Data is already in new format.")
         return
+    old_data = library.data
 
     new_db = {
-        "deck_consistency": {
-            "global_rule": "Consistent 16:9 layout with minimal clutter.",
-            "anchor_motif": "Top-left geometric marker",
-            "palette_harmony_rule": "Limit to 3 main colors per slide",
-            "typography_mood_hint": "Clean, Sans-serif, deeply legible"
-        },
+        "deck_consistency": dict(DECK_CONSISTENCY),
         "styles_001_100": []
     }
 
     print(f"Migrating {len(old_data)} items...")
 
     for item in old_data:
-        # Heuristic to guess role
-        title_lower = item.get('title', '').lower()
-        role = "Structure"
-        if "notebook" in title_lower or "doodle" in title_lower:
-            role = "Opening / Emotional"
-        elif "neon" in title_lower or "cyber" in title_lower:
-            role = "High Impact"
-        elif "b&w" in title_lower or "minimal" in title_lower:
-            role = "Content / Data"
-
-        new_item = {
-            "id": item.get('id'),
-            "title": item.get('title'),
-            "role_bucket": role,
-            "slide_intent": ["title", "content"] if role == "Structure" else ["impact"],
-            "image_prompt_one_line": item.get('prompt', "No prompt available."),
-            "negative_prompt": "clutter, text overlay, chaotic, low resolution, watermark",
-            "elaboration": f"Migrated from legacy: {item.get('tone', '')}",
-            "palette": item.get('palette'), # Keep strictly for backward compat in rendering
-            "fidelity_score": 0 # Default for tuning loop
-        }
-        new_db["styles_001_100"].append(new_item)
+        new_db["styles_001_100"].append(convert_item(item))
 
     # Backup logic
     # with open('templates_backup.json', 'w', encoding='utf-8') as f:
     #    json.dump(old_data, f, indent=2)
 
-    with open(source_path, 'w', encoding='utf-8') as f:
-        json.dump(new_db, f, indent=2, ensure_ascii=False)
-    
-    print("Migration complete. templates.json updated to Presentation DNA structure.")
+    library.data = new_db
+    library.reindex()
+    library.save(target_path)
+
+    print(f"Migration complete. {target_path} updated to Presentation DNA structure.")
 
 if __name__ == "__main__":
-    migrate_db()
+    args = parse_stream_args("Convert the original flat list library into the Presentation DNA layout.")
+    migrate_db(args.input, args.output, args.stream)
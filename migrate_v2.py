@@ -1,27 +1,104 @@
 import json
-import os
 
-def migrate():
+from darlkom.store import DNALibrary
+from darlkom.stream import StreamWriter, add_stream_arguments, check_no_journal, iter_library, iter_records
+
+def migrate_item(item):
+    """Builds the v2 record for one legacy (styles_001_100) item."""
+    new_id = f"DNA_{item.get('id', 0):03d}"
+
+    # Default fallback values for V2 Schema
+    role = item.get('role_bucket', 'Structure')
+    title = item.get('title', 'Untitled Style')
+    
+    # Color mapping
+    legacy_palette = item.get('palette', {})
+    primary = legacy_palette.get('background', '#111111')
+    text = legacy_palette.get('text', '#ffffff')
+    accents = legacy_palette.get('accents', [])
+    accent = accents[0] if accents else '#00FF00'
+    secondary = accents[1] if len(accents) > 1 else text
+
+    # Construct V2 Object
+    migrated_item = {
+        "module_id": new_id,
+        "style_name": title,
+        "role_bucket": role,
+        "design_dna": {
+            "tone_keywords": item.get('slide_intent', []),
+            "color_palette": {
+                "primary": primary,
+                "secondary": secondary,
+                "accent": accent
+            },
+            "layout_rules": {
+                "composition": "determined_by_role", # Placeholder logic
+                "whitespace_ratio": 0.5,
+                "reading_flow": "z-pattern"
+            },
+            "materiality": {
+                "base": "digital_screen",
+                "texture": []
+            },
+            "line_shape": {
+                "line_style": "default",
+                "stroke_variance": "none"
+            },
+            "typography": {
+                "headline": "sans-serif",
+                "body": "sans-serif",
+                "language_support": ["en"]
+            },
+            "emotional_profile": {
+                "mood": [],
+                "tempo": "moderate",
+                "weight": "balanced"
+            }
+        },
+        "slide_usage": {
+            "best_for": [],
+            "avoid_for": []
+        },
+        "image_prompt_one_line": item.get('image_prompt', ''),
+        "negative_prompt": item.get('negative_prompt', 'clutter, text overlay, chaotic, low resolution, watermark')
+    }
+    
+    # Auto-generate prompt if missing
+    if not migrated_item["image_prompt_one_line"]:
+        tone = ", ".join(migrated_item["design_dna"]["tone_keywords"][:3])
+        colors = f"{primary}, {secondary}, {accent}"
+        migrated_item["image_prompt_one_line"] = f"{title} style, {role} layout, {tone}, {colors}, high quality design"
+    
+    # Naive "Enhancement" based on keywords
+    keywords = (title + " " + role).lower()
+    if "minimal" in keywords:
+        migrated_item['design_dna']['layout_rules']['whitespace_ratio'] = 0.8
+    if "grid" in keywords:
+        migrated_item['design_dna']['layout_rules']['composition'] = "modular_grid"
+    if "neon" in keywords:
+        migrated_item['design_dna']['materiality']['base'] = "dark_glass"
+    if "paper" in keywords:
+        migrated_item['design_dna']['materiality']['base'] = "paper"
+        migrated_item['design_dna']['materiality']['texture'].append("grain")
+
+    return migrated_item
+
+def migrate(backup='templates.backup.json', source='templates.json', target=None):
     # Load backup (Legacy Data)
     try:
-        with open('templates.backup.json', 'r', encoding='utf-8') as f:
+        with open(backup, 'r', encoding='utf-8') as f:
             legacy_data = json.load(f)
     except FileNotFoundError:
-        print("Error: templates.backup.json not found!")
+        print(f"Error: {backup} not found!")
         return
 
     # Load current V2 (New Schema items)
     try:
-        with open('templates.json', 'r', encoding='utf-8') as f:
-            v2_data = json.load(f)
+        library = DNALibrary.load(source)
     except FileNotFoundError:
-        v2_data = {"styles_v2": []}
+        library = DNALibrary({"styles_v2": []}, source)
 
     legacy_list = legacy_data.get('styles_001_100', [])
-    new_v2_list = v2_data.get('styles_v2', [])
-    
-    # Existing IDs in V2 to avoid duplicates
-    existing_ids = {item['module_id'] for item in new_v2_list if 'module_id' in item}
 
     print(f"Found {len(legacy_list)} legacy items.")
     
@@ -30,95 +107,69 @@ def migrate():
         legacy_id = item.get('id', 0)
         new_id = f"DNA_{legacy_id:03d}"
         
-        if new_id in existing_ids:
+        if new_id in library:
             continue # Skip if already exists (DNA_001, 002, 003 usually exist)
 
-        # Default fallback values for V2 Schema
-        role = item.get('role_bucket', 'Structure')
-        title = item.get('title', 'Untitled Style')
-        
-        # Color mapping
-        legacy_palette = item.get('palette', {})
-        primary = legacy_palette.get('background', '#111111')
-        text = legacy_palette.get('text', '#ffffff')
-        accents = legacy_palette.get('accents', [])
-        accent = accents[0] if accents else '#00FF00'
-        secondary = accents[1] if len(accents) > 1 else text
-
-        # Construct V2 Object
-        migrated_item = {
-            "module_id": new_id,
-            "style_name": title,
-            "role_bucket": role,
-            "design_dna": {
-                "tone_keywords": item.get('slide_intent', []),
-                "color_palette": {
-                    "primary": primary,
-                    "secondary": secondary,
-                    "accent": accent
-                },
-                "layout_rules": {
-                    "composition": "determined_by_role", # Placeholder logic
-                    "whitespace_ratio": 0.5,
-                    "reading_flow": "z-pattern"
-                },
-                "materiality": {
-                    "base": "digital_screen",
-                    "texture": []
-                },
-                "line_shape": {
-                    "line_style": "default",
-                    "stroke_variance": "none"
-                },
-                "typography": {
-                    "headline": "sans-serif",
-                    "body": "sans-serif",
-                    "language_support": ["en"]
-                },
-                "emotional_profile": {
-                    "mood": [],
-                    "tempo": "moderate",
-                    "weight": "balanced"
-                }
-            },
-            "slide_usage": {
-                "best_for": [],
-                "avoid_for": []
-            },
-            "image_prompt_one_line": item.get('image_prompt', ''),
-            "negative_prompt": item.get('negative_prompt', 'clutter, text overlay, chaotic, low resolution, watermark')
-        }
-        
-        # Auto-generate prompt if missing
-        if not migrated_item["image_prompt_one_line"]:
-            tone = ", ".join(migrated_item["design_dna"]["tone_keywords"][:3])
-            colors = f"{primary}, {secondary}, {accent}"
-            migrated_item["image_prompt_one_line"] = f"{title} style, {role} layout, {tone}, {colors}, high quality design"
-        
-        # Naive "Enhancement" based on keywords
-        keywords = (title + " " + role).lower()
-        if "minimal" in keywords:
-            migrated_item['design_dna']['layout_rules']['whitespace_ratio'] = 0.8
-        if "grid" in keywords:
-            migrated_item['design_dna']['layout_rules']['composition'] = "modular_grid"
-        if "neon" in keywords:
-            migrated_item['design_dna']['materiality']['base'] = "dark_glass"
-        if "paper" in keywords:
-            migrated_item['design_dna']['materiality']['base'] = "paper"
-            migrated_item['design_dna']['materiality']['texture'].append("grain")
-
-        new_v2_list.append(migrated_item)
+        library.add(migrate_item(item), 'styles_v2')
 
     # Re-save to templates.json
-    final_data = {
-        "deck_consistency": v2_data.get('deck_consistency', {}),
-        "styles_v2": new_v2_list
+    library.data = {
+        "deck_consistency": library.data.get('deck_consistency', {}),
+        "styles_v2": library.collection('styles_v2')
     }
+    library.save(target)
+
+    print(f"Migration Complete. Total items: {len(library.collection('styles_v2'))}")
 
-    with open('templates.json', 'w', encoding='utf-8') as f:
-        json.dump(final_data, f, indent=2, ensure_ascii=False)
+def migrate_streaming(backup='templates.backup.json', source='templates.json', target=None):
+    """Same migration in constant memory: only the set of existing module_ids is kept."""
+    existing_ids = set()
+    total = 0
 
-    print(f"Migration Complete. Total items: {len(new_v2_list)}")
+    def append_legacy(out):
+        nonlocal total
+        for item in iter_records(backup, 'styles_001_100'):
+            new_id = f"DNA_{item.get('id', 0):03d}"
+            if new_id in existing_ids:
+                continue
+            existing_ids.add(new_id)
+            out.write_record(migrate_item(item))
+            total += 1
+
+    # Same check as stream_transform: a pending journal would be replayed over the migrated file.
+    check_no_journal(source, backup, target)
+    with StreamWriter(target or source) as out:
+        # Top-level values are written in whatever order they arrive; like migrate(),
+        # only deck_consistency is kept next to styles_v2.
+        deck_written = v2_written = False
+        for entry in iter_library(source):
+            if entry.key == 'deck_consistency':
+                out.write_meta('deck_consistency', entry.value)
+                deck_written = True
+            elif entry.key == 'styles_v2' and entry.records is not None:
+                out.begin_collection('styles_v2')
+                for item in entry.records:
+                    existing_ids.add(item.get('module_id'))
+                    out.write_record(item)
+                    total += 1
+                append_legacy(out)
+                v2_written = True
+        if not deck_written:
+            out.write_meta('deck_consistency', {})
+        if not v2_written:
+            out.begin_collection('styles_v2')
+            append_legacy(out)
+
+    print(f"Migration Complete. Total items: {total}")
 
 if __name__ == "__main__":
-    migrate()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate legacy styles_001_100 items into the v2 schema.")
+    parser.add_argument('--backup', default='templates.backup.json', help='legacy library to migrate from')
+    add_stream_arguments(parser)
+    args = parser.parse_args()
+    if args.stream:
+        migrate_streaming(args.backup, args.input, args.output)
+    else:
+        migrate(args.backup, args.input, args.output)
@@ -1,16 +1,13 @@
-import json
-import re
+from darlkom.scripts import JAPANESE, contains
+from darlkom.snapshot import open_library
 
 def has_japanese(text):
-    # Hiragana, Katakana, Kanji ranges
-    jp_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-    return bool(jp_pattern.search(text))
+    # Hiragana, Katakana, Kanji
+    return contains(text, JAPANESE)
 
 def scan_and_translate():
-    with open('templates.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    styles = data.get('styles_001_100', [])
+    library = open_library('templates.json')
+    styles = library.collection('styles_001_100')
     jp_count = 0
     
     for item in styles:
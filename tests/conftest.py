@@ -0,0 +1,8 @@
+import pytest
+
+from tests.helpers import library_data, write_json
+
+
+@pytest.fixture
+def library_path(tmp_path):
+    return write_json(tmp_path / 'templates.json', library_data())
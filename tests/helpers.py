@@ -0,0 +1,59 @@
+"""Record and library builders shared by the tests."""
+import json
+
+
+def v2_record(n, **overrides):
+    record = {
+        "module_id": f"DNA_{n:03d}",
+        "style_name": f"Style {n}",
+        "role_bucket": "Opening" if n % 2 else "Data",
+        "design_dna": {
+            "tone_keywords": ["creative", "raw"],
+            "color_palette": {"primary": "#0000CD", "secondary": "#ffffff", "accent": "#FF0000 (Red)"},
+            "layout_rules": {"composition": "modular_grid", "whitespace_ratio": 0.5 + n / 100, "reading_flow": "z-pattern"},
+            "materiality": {"base": "paper" if n % 2 else "dark_glass", "texture": ["grain"] if n % 2 else []},
+            "line_shape": {"line_style": "hand-drawn", "stroke_variance": "high"},
+            "typography": {"headline": "sans-serif", "body": "sans-serif", "language_support": ["ja", "ko", "en"]},
+            "emotional_profile": {"mood": ["calm"], "tempo": "slow", "weight": "light"},
+        },
+        "slide_usage": {"best_for": ["ideation"], "avoid_for": []},
+        "image_prompt_one_line": f"style {n}, blue ink on lined paper",
+        "negative_prompt": "clutter, watermark",
+    }
+    record.update(overrides)
+    return record
+
+
+def legacy_record(n, **overrides):
+    record = {
+        "id": n,
+        "title": f"和風の色 {n}",
+        "role_bucket": "Structure",
+        "palette": {"background": "#F8F1E7", "text": "#333333", "accents": ["#E07A5F"]},
+        "slide_intent": ["温かみ", "calm"],
+        "full_report": "Overall Design Config:\n  Tone: \"Calm, analog\"\n  Visual Identity:\n    Accent Color: Coral\n",
+        "score": n * 1500.0,
+        "count": -n,
+        "flags": [True, False, None],
+    }
+    record.update(overrides)
+    return record
+
+
+def library_data(v2=3, legacy=2):
+    return {
+        "deck_consistency": {"font_family": "Pretendard", "margin": 0.08},
+        "styles_v2": [v2_record(n) for n in range(1, v2 + 1)],
+        "styles_001_100": [legacy_record(n) for n in range(1, legacy + 1)],
+    }
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return str(path)
+
+
+def read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
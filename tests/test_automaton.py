@@ -0,0 +1,36 @@
+from darlkom.automaton import Automaton, compile_pattern
+
+MAPPING = {"背景": "BG", "背景色": "Background Color", "色": "Color", "景色": "Scenery", "白": "White"}
+
+
+def test_longest_key_wins_at_a_position():
+    assert Automaton(MAPPING).replace("背景色: 白") == "Background Color: White"
+    assert Automaton(MAPPING).replace("背景: 色") == "BG: Color"
+
+
+def test_leftmost_match_wins_over_a_longer_later_one():
+    # "背景" starts before "景色"; the overlap goes to the earlier key.
+    automaton = Automaton({"背景": "BG", "景色": "Scenery", "色": "Color"})
+    assert automaton.replace("背景色") == "BGColor"
+    assert list(automaton.finditer("背景色")) == [(0, 2, "背景"), (2, 3, "色")]
+
+
+def test_result_does_not_depend_on_dictionary_order():
+    reordered = dict(reversed(list(MAPPING.items())))
+    text = "背景色と景色と色と背景"
+    assert Automaton(reordered).replace(text) == Automaton(MAPPING).replace(text)
+
+
+def test_replaced_text_is_not_rescanned():
+    assert Automaton({"a": "b", "b": "c"}).replace("ab") == "bc"
+
+
+def test_replace_tracking_reports_matched_keys():
+    result, used = Automaton(MAPPING).replace_tracking("背景色と色と色")
+    assert result == "Background ColorとColorとColor"
+    assert used == ["背景色", "色", "色"]
+
+
+def test_regex_metacharacters_are_literal():
+    pattern = compile_pattern(["a.b", "a*"])
+    assert [m.group() for m in pattern.finditer("a.b axb a*")] == ["a.b", "a*"]
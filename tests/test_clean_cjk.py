@@ -0,0 +1,58 @@
+import copy
+import os
+
+from clean_cjk import clean_database, clean_string, clean_value
+from darlkom.journal import journal_path
+from darlkom.store import DNALibrary
+
+from tests.helpers import legacy_record, read_json, v2_record
+
+
+def test_clean_string_strips_japanese_and_spacing():
+    assert clean_string("Calm 温かみ  analog") == "Calm analog"
+    assert clean_string("plain text") == "plain text"
+
+
+def test_untouched_values_are_returned_as_is():
+    record = v2_record(1)
+    assert clean_value(record) is record
+
+
+def test_only_the_path_to_a_change_is_copied():
+    record = v2_record(1, style_name="Doodle 手描き")
+    record['design_dna']['tone_keywords'] = ["raw", "温かみ"]
+    original = copy.deepcopy(record)
+
+    cleaned = clean_value(record)
+    assert record == original  # input never mutated
+    assert cleaned['style_name'] == "Doodle"
+    assert cleaned['design_dna']['tone_keywords'] == ["raw", ""]
+    assert cleaned is not record
+    assert cleaned['design_dna'] is not record['design_dna']
+    assert cleaned['design_dna']['tone_keywords'] is not record['design_dna']['tone_keywords']
+    # Siblings without residue are shared, not copied.
+    assert cleaned['design_dna']['color_palette'] is record['design_dna']['color_palette']
+    assert cleaned['slide_usage'] is record['slide_usage']
+
+
+def test_changes_are_reported_with_paths():
+    record = legacy_record(1)
+    changes = []
+    clean_value(record, changes=changes)
+    assert changes == [
+        (('title',), "和風の色 1", "1"),
+        (('slide_intent', 0), "温かみ", ""),
+    ]
+
+
+def test_clean_database_journals_and_says_how_to_compact(library_path, capsys):
+    before = read_json(library_path)
+    assert clean_database(library_path, dry_run=True)
+    assert not os.path.exists(journal_path(library_path))
+
+    changes = clean_database(library_path)
+    out = capsys.readouterr().out
+    assert f"python -m darlkom.journal {library_path}" in out
+    assert read_json(library_path) == before
+    assert DNALibrary.load(library_path).get(1)['title'] == "1"
+    assert len(changes) == 4
@@ -0,0 +1,110 @@
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from darlkom.fallback import (
+    BASE_URL_ENV, FallbackTranslator, add_fallback_arguments, collect_residue, from_args, rewrite,
+)
+from darlkom.memory import TranslationMemory
+from darlkom.store import DNALibrary
+
+from tests.helpers import legacy_record, v2_record
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    """/chat/completions that answers each string with one "한" per character; "壊" gets a non-JSON reply."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        batch = json.loads(body['messages'][-1]['content'])
+        self.server.batches.append(batch)
+        reply = {text: '한' * len(text) for text in batch}
+        content = 'not json' if '壊' in batch else json.dumps(reply, ensure_ascii=False)
+        raw = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": body['model'],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ChatHandler)
+    server.batches = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_port}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_collect_and_rewrite():
+    data = {"a": ["温かみのある色", {"b": "calm 夜"}], "c": 3, "d": "夜"}
+    assert collect_residue(data) == {"温かみのある色": 1, "夜": 2}
+    assert rewrite(data, {"夜": "밤"}) == {"a": ["温かみのある色", {"b": "calm 밤"}], "c": 3, "d": "밤"}
+    assert rewrite("no residue", {}) == "no residue"
+
+
+def test_configuration_errors(monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv(BASE_URL_ENV, raising=False)
+    with pytest.raises(ValueError, match='OPENAI_API_KEY'):
+        FallbackTranslator()
+    with pytest.raises(ValueError, match='unsupported'):
+        FallbackTranslator('ja', base_url='http://localhost')
+    with pytest.raises(ValueError, match='at least 1'):
+        FallbackTranslator(batch_size=0, base_url='http://localhost')
+
+    parser = add_fallback_arguments(argparse.ArgumentParser())
+    args = parser.parse_args(['--llm-concurrency', '0'])
+    with pytest.raises(ValueError):
+        from_args(args)
+    with pytest.raises(SystemExit):
+        from_args(args, parser=parser)
+    monkeypatch.setenv(BASE_URL_ENV, 'http://localhost:8000/v1')
+    assert from_args(parser.parse_args([])).base_url == 'http://localhost:8000/v1'
+
+
+def test_run_against_a_local_endpoint(endpoint, tmp_path):
+    server, base_url = endpoint
+    data = {"styles_v2": [v2_record(1, style_name="夜の窓")],
+            "styles_001_100": [legacy_record(1), legacy_record(2, elaboration="夜")]}
+    library = DNALibrary(data)
+    memory = TranslationMemory(str(tmp_path / 'memory.sqlite3'))
+    translator = FallbackTranslator('ko', base_url=base_url, batch_size=2, memory=memory)
+
+    translations = translator.run(library)
+    assert translations == {"和風の色": "한한한한", "温かみ": "한한한", "夜": "한", "夜の窓": "한한한"}
+    assert library.get('DNA_001')['style_name'] == "한한한"
+    assert library.get(2)['title'] == "한한한한 2"
+    assert collect_residue(library.data) == {}
+    assert translator.requests == len(server.batches) == 2
+    assert [len(batch) for batch in server.batches] == [2, 2]
+
+    # The memory answers the second run without a request.
+    memory.flush()
+    again = FallbackTranslator('ko', base_url=base_url, memory=memory)
+    assert again.translate(["夜"]) == {"夜": "한"}
+    assert (again.cached, again.requests) == (1, 0)
+    memory.close()
+
+
+def test_failed_batches_leave_the_text(endpoint):
+    _, base_url = endpoint
+    translator = FallbackTranslator('ko', base_url=base_url, batch_size=1)
+    assert translator.translate(["壊", "夜"]) == {"夜": "한"}
+    assert translator.failed == 1
+    assert translator.format_stats().endswith("(1 failed)")
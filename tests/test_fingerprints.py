@@ -0,0 +1,71 @@
+import os
+
+from darlkom.fingerprints import (
+    BuildCache, data_fingerprints, diff, fingerprint, fingerprint_path, is_dirty, read_manifest,
+    write_if_changed, write_manifest,
+)
+from darlkom.store import COLLECTIONS
+
+from tests.helpers import library_data, v2_record, write_json
+
+
+def test_fingerprint_follows_key_order():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"a": 1, "b": 2})
+    assert fingerprint({"a": 1, "b": 2}) != fingerprint({"b": 2, "a": 1})
+    assert fingerprint(v2_record(1)) != fingerprint(v2_record(2))
+
+
+def test_manifest_is_tied_to_the_file(tmp_path):
+    data = library_data()
+    path = write_json(tmp_path / 'templates.json', data)
+    fps = data_fingerprints(data, COLLECTIONS)
+    assert read_manifest(path) is None and is_dirty(path, fps)
+
+    write_manifest(path, fps)
+    assert read_manifest(path) == fps
+    assert not is_dirty(path, fps)
+
+    # Replacing the file behind the sidecar's back makes it stale.
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    assert read_manifest(path) is None
+
+
+def test_diff_by_collection_and_key():
+    data = library_data()
+    old = data_fingerprints(data, COLLECTIONS)
+    data['styles_v2'][0]['style_name'] = 'Renamed'
+    data['styles_v2'].append(v2_record(4))
+    del data['styles_001_100'][0]
+    new = data_fingerprints(data, COLLECTIONS)
+    assert diff(old, new) == ([('styles_v2', 'DNA_004')], [('styles_v2', 'DNA_001')], [('styles_001_100', 1)])
+    assert diff(None, {"meta": {}, "collections": {'': [[1, 'x']]}}).added == [('', 1)]
+
+
+def test_write_if_changed(tmp_path):
+    path = str(tmp_path / 'out.bin')
+    assert write_if_changed(path, b'abc')
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_if_changed(path, b'abc')
+    assert os.stat(path).st_mtime_ns == mtime
+    assert write_if_changed(path, b'abcd')
+
+
+def test_build_cache_keeps_only_entries_seen(tmp_path):
+    path = fingerprint_path(str(tmp_path / 'build' / 'out'))
+    cache = BuildCache(path)
+    assert cache.get('DNA_001', 'f1') is None
+    cache.put('DNA_001', 'f1', ['grams'])
+    cache.put('DNA_002', 'f2', 'thumb.png')
+    assert cache.save()
+
+    cache = BuildCache(path)
+    assert cache.get('DNA_001', 'f1') == ['grams']
+    assert cache.get('DNA_002', 'changed') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.save()
+    assert BuildCache(path).entries == {'DNA_001': ['f1', ['grams']]}
+
+    cache = BuildCache(path)
+    cache.get('DNA_001', 'f1')
+    assert not cache.save()
@@ -0,0 +1,73 @@
+from darlkom.incremental import IncrementalState, state_path
+from darlkom.translation import TranslationTable
+
+from tests.helpers import legacy_record
+
+
+def _run(path, records, fields=None, tables=()):
+    state = IncrementalState(path, fields, tables)
+    seen = []
+
+    def translate(record, collection):
+        seen.append(record['id'])
+        return dict(record, elaboration=record['elaboration'].upper())
+
+    out = [state.wrap(translate)(record, 'styles_001_100') for record in records]
+    state.save()
+    return out, seen, state
+
+
+def _records(*texts):
+    return [legacy_record(n, elaboration=text) for n, text in enumerate(texts, 1)]
+
+
+def test_state_path():
+    assert state_path('templates.json', 'translate_db') == 'templates.json.translate_db.state'
+
+
+def test_unchanged_records_are_skipped(tmp_path):
+    path = str(tmp_path / 'state')
+    out, seen, _ = _run(path, _records('calm', 'warm'), ['elaboration'])
+    assert seen == [1, 2]
+
+    out[1]['score'] = 0.0  # not a translated field
+    out.append(legacy_record(3, elaboration='new'))
+    out, seen, state = _run(path, out, ['elaboration'])
+    assert seen == [3]
+    assert [r['elaboration'] for r in out] == ['CALM', 'WARM', 'NEW']
+    assert state.format_stats() == "incremental: 1 processed, 2 unchanged and skipped"
+
+
+def test_whole_record_hash_without_fields(tmp_path):
+    path = str(tmp_path / 'state')
+    out, _, _ = _run(path, _records('calm', 'warm'))
+    out[1]['score'] = 0.0
+    _, seen, _ = _run(path, out)
+    assert seen == [2]
+
+
+def test_different_fields_drop_the_state(tmp_path):
+    path = str(tmp_path / 'state')
+    out, _, _ = _run(path, _records('calm'), ['elaboration'])
+    _, seen, _ = _run(path, out, ['elaboration', 'title'])
+    assert seen == [1]
+
+
+def test_dictionary_edits_drop_the_state(tmp_path):
+    path = str(tmp_path / 'state')
+    mapping = {"calm": "차분한"}
+    out, _, _ = _run(path, _records('calm'), ['elaboration'], [TranslationTable(mapping, 'en_ko')])
+    _, seen, _ = _run(path, out, ['elaboration'], [TranslationTable(mapping, 'en_ko')])
+    assert seen == []
+
+    mapping["warm"] = "따뜻한"
+    _, seen, _ = _run(path, out, ['elaboration'], [TranslationTable(mapping, 'en_ko')])
+    assert seen == [1]
+
+
+def test_unreadable_state_is_ignored(tmp_path):
+    path = tmp_path / 'state'
+    path.write_text('{"version": 1, "fields": null, "records": {"1": "x"}}', encoding='utf-8')
+    assert IncrementalState(str(path)).previous == {}
+    path.write_text('not json', encoding='utf-8')
+    assert IncrementalState(str(path)).previous == {}
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from darlkom.journal import JournalError, PatchJournal, compact, journal_path
+from darlkom.store import DNALibrary
+
+from tests.helpers import read_json, v2_record
+
+
+def test_commit_appends_and_load_replays(library_path):
+    library = DNALibrary.load(library_path)
+    assert library.set_field('DNA_001', ['design_dna', 'materiality', 'base'], 'linen')
+    assert library.set_field('DNA_002', 'style_name', 'Renamed')
+    assert not library.set_field('DNA_002', 'style_name', 'Renamed')  # already holds it
+    library.add(v2_record(9), journal=True)
+    assert library.commit() == 3
+
+    # The library file itself is untouched until compaction.
+    assert read_json(library_path)['styles_v2'][0]['design_dna']['materiality']['base'] == 'paper'
+    assert len(PatchJournal(journal_path(library_path))) == 3
+
+    reloaded = DNALibrary.load(library_path)
+    assert reloaded.replayed == 3
+    assert reloaded.get('DNA_001')['design_dna']['materiality']['base'] == 'linen'
+    assert reloaded.get('DNA_002')['style_name'] == 'Renamed'
+    assert reloaded.get('DNA_009') == v2_record(9)
+    assert [r['module_id'] for r in reloaded.by_material('linen')] == ['DNA_001']
+
+
+def test_replay_is_idempotent(library_path):
+    library = DNALibrary.load(library_path)
+    library.set_field('DNA_001', ['design_dna', 'tone_keywords'], ['quiet'])
+    library.add(v2_record(9), journal=True)
+    library.commit()
+    once = DNALibrary.load(library_path).data
+
+    # A crash between the snapshot rename and the journal removal replays over patched data.
+    with open(library_path, 'w', encoding='utf-8') as f:
+        json.dump(once, f)
+    assert DNALibrary.load(library_path).data == once
+
+
+def test_compact_folds_the_journal_in(library_path):
+    library = DNALibrary.load(library_path)
+    library.set_field('DNA_003', ['slide_usage', 'avoid_for'], ['dense data'])
+    library.commit()
+    expected = DNALibrary.load(library_path).data
+
+    assert compact(library_path) == 1
+    assert not PatchJournal(journal_path(library_path)).exists()
+    assert read_json(library_path) == expected
+    assert compact(library_path) == 0
+
+
+def test_torn_final_line_is_ignored(library_path):
+    library = DNALibrary.load(library_path)
+    library.set_field('DNA_001', 'style_name', 'Kept')
+    library.commit()
+    with open(journal_path(library_path), 'a', encoding='utf-8') as f:
+        f.write('{"op": "set", "key": "DNA_002", "path": ["style_na')
+
+    reloaded = DNALibrary.load(library_path)
+    assert reloaded.replayed == 1
+    assert reloaded.get('DNA_001')['style_name'] == 'Kept'
+
+
+def test_set_field_rejects_a_path_through_a_value(library_path):
+    library = DNALibrary.load(library_path)
+    with pytest.raises(ValueError, match='style_name is str'):
+        library.set_field('DNA_001', ['style_name', 'en'], 'x')
+    assert library.pending == 0
+    assert library.get('DNA_001')['style_name'] == 'Style 1'
+
+
+def test_unappliable_patch_names_the_journal_line(library_path):
+    patches = [
+        {"op": "set", "key": "DNA_001", "path": ["style_name"], "value": "ok"},
+        {"op": "set", "key": "DNA_001", "path": ["style_name", "en"], "value": "bad"},
+    ]
+    PatchJournal(journal_path(library_path)).append(patches)
+    with pytest.raises(JournalError, match=r'templates\.json\.journal:2: '):
+        DNALibrary.load(library_path)
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from darlkom import lexicon as lexicon_module
+from darlkom.lexicon import BINARY_NAME, Lexicon, build_lexicon, lexicon_table, load_lexicon, read_source
+
+JA_EN = (
+    "# comment\n"
+    "背景色\tBackground Color\tjp_en,report_headers\n"
+    "白\tWhite\tjp_en\n"
+    "\n"
+    "タブ\\t記号\tTab\\\\Mark\treport_headers\n"
+)
+EN_KO = "playful\t장난스러운\tbatch_en_ko\n"
+
+
+@pytest.fixture
+def lexicon_dir(tmp_path):
+    (tmp_path / 'ja-en.tsv').write_text(JA_EN, encoding='utf-8')
+    (tmp_path / 'en-ko.tsv').write_text(EN_KO, encoding='utf-8')
+    return str(tmp_path)
+
+
+def _write(directory, name, text):
+    with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_sources_unescape_and_split_tables(lexicon_dir):
+    entries = list(read_source(os.path.join(lexicon_dir, 'ja-en.tsv')))
+    assert entries[0] == ('背景色', 'Background Color', ['jp_en', 'report_headers'])
+    assert entries[2] == ('タブ\t記号', 'Tab\\Mark', ['report_headers'])
+
+
+@pytest.mark.parametrize('line, message', [
+    ("a\tb\n", "expected source<TAB>target<TAB>tables"),
+    ("\tb\tjp_en\n", "empty source or table list"),
+    ("a\\x\tb\tjp_en\n", "bad escape"),
+])
+def test_bad_source_lines(tmp_path, line, message):
+    _write(str(tmp_path), 'ja-en.tsv', line)
+    with pytest.raises(ValueError, match=message):
+        build_lexicon(str(tmp_path))
+
+
+def test_duplicate_keys_and_mixed_targets_are_rejected(tmp_path):
+    _write(str(tmp_path), 'ja-en.tsv', "白\tWhite\tjp_en\n白\tBlank\tjp_en\n")
+    with pytest.raises(ValueError, match="duplicate key '白' in table jp_en"):
+        build_lexicon(str(tmp_path))
+    _write(str(tmp_path), 'ja-en.tsv', "白\tWhite\tjp_en\n")
+    _write(str(tmp_path), 'ja-ko.tsv', "黒\t검정\tjp_en\n")
+    with pytest.raises(ValueError, match="table jp_en already targets en"):
+        build_lexicon(str(tmp_path))
+
+
+def test_compiled_tables(lexicon_dir):
+    lexicon = Lexicon(build_lexicon(lexicon_dir))
+    try:
+        assert sorted(lexicon.table_names()) == ['batch_en_ko', 'jp_en', 'report_headers']
+        jp_en = lexicon.mapping('jp_en')
+        assert jp_en.target == 'en'
+        assert list(jp_en) == ['背景色', '白']
+        assert dict(jp_en) == {'背景色': 'Background Color', '白': 'White'}
+        assert jp_en['白'] == 'White' and '黒' not in jp_en and 1 not in jp_en
+        with pytest.raises(KeyError):
+            jp_en['背景']
+        with pytest.raises(KeyError, match='no lexicon table'):
+            lexicon.mapping('missing')
+        assert lexicon.is_fresh(lexicon_dir)
+        _write(lexicon_dir, 'en-ko.tsv', EN_KO + "bold\t굵은\tbatch_en_ko\n")
+        assert not lexicon.is_fresh(lexicon_dir)
+    finally:
+        lexicon.close()
+
+
+def test_load_rebuilds_stale_binary(lexicon_dir):
+    build_lexicon(lexicon_dir)
+    _write(lexicon_dir, 'en-ko.tsv', EN_KO + "bold\t굵은\tbatch_en_ko\n")
+    table = lexicon_table('batch_en_ko', lexicon_dir)
+    assert table is lexicon_table('batch_en_ko', lexicon_dir)
+    assert table.target == 'ko'
+    assert table.lookup('BOLD') == '굵은'
+    assert load_lexicon(lexicon_dir).is_fresh(lexicon_dir)
+
+
+def test_unwritable_directory_compiles_in_memory(lexicon_dir, monkeypatch):
+    def read_only(directory, output_path=None):
+        raise PermissionError(output_path)
+
+    monkeypatch.setattr(lexicon_module, 'build_lexicon', read_only)
+    lexicon = load_lexicon(lexicon_dir)
+    assert not os.path.exists(os.path.join(lexicon_dir, BINARY_NAME))
+    assert lexicon.mapping('jp_en')['白'] == 'White'
@@ -0,0 +1,39 @@
+import pytest
+
+from darlkom.memory import TranslationMemory
+from darlkom.translation import TranslationTable
+
+TEXTS = ['赤い花', '青い空', '白い雲']
+BASE = {'赤い': 'red ', '青い': 'blue ', '花': 'flower'}
+
+
+@pytest.fixture
+def run(tmp_path):
+    path = str(tmp_path / 'memory.sqlite3')
+
+    def run(mapping):
+        table = TranslationTable(mapping, 'colors', 'en')
+        memory = TranslationMemory(path)
+        table.memory = memory
+        results = [table.replace(text) for text in TEXTS]
+        memory.close()
+        assert results == [TranslationTable(mapping).replace(text) for text in TEXTS]
+        return memory.hits, memory.misses, memory.stale
+    return run
+
+
+def test_repeat_run_is_answered_from_memory(run):
+    assert run(BASE) == (0, 3, 0)
+    assert run(BASE) == (3, 0, 0)
+
+
+def test_added_key_only_invalidates_texts_containing_it(run):
+    run(BASE)
+    assert run({**BASE, '雲': 'cloud'}) == (2, 0, 1)
+    assert run({**BASE, '雲': 'cloud'}) == (3, 0, 0)
+
+
+def test_removed_or_changed_key_only_invalidates_texts_that_used_it(run):
+    run(BASE)
+    assert run({'赤い': 'red ', '花': 'flower'}) == (2, 0, 1)
+    assert run({'赤い': 'RED ', '花': 'flower'}) == (2, 0, 1)
@@ -0,0 +1,45 @@
+import copy
+
+import pytest
+
+import final_translate  # noqa: F401  registers the 'final_translate' stage
+from darlkom.parallel import ParallelStats, format_stats, run_parallel
+from darlkom.pipeline import Pipeline
+from darlkom.store import DNALibrary
+
+from tests.helpers import legacy_record, library_data
+
+
+def _library():
+    data = library_data()
+    data['styles_001_100'] += [legacy_record(n, elaboration="背景色: 白") for n in range(3, 12)]
+    return DNALibrary(data)
+
+
+def test_parallel_output_matches_serial():
+    serial = _library()
+    Pipeline(['final_translate']).run(serial)
+
+    parallel = _library()
+    pipeline = Pipeline(['final_translate'])
+    stats = run_parallel(pipeline, parallel, workers=2, chunk_size=3)
+
+    assert parallel.data == serial.data
+    assert parallel.data != _library().data
+    assert (stats.workers, stats.records, stats.chunks) == (2, 14, 5)
+    assert pipeline.report()[0][1] == 14 + 1  # every record plus deck_consistency
+    assert 'DNA_001' in parallel
+
+
+def test_chunk_size_must_be_positive():
+    library = _library()
+    before = copy.deepcopy(library.data)
+    with pytest.raises(ValueError):
+        run_parallel(Pipeline(['final_translate']), library, workers=1, chunk_size=0)
+    assert library.data == before
+
+
+def test_speedup_without_a_serial_run_is_an_estimate():
+    stats = ParallelStats(workers=4, chunks=10, records=300, wall=2.0, busy=6.0)
+    assert format_stats(stats, serial_seconds=5.0).endswith("serial 5.000s -> 2.50x speedup")
+    assert "~3.00x estimated speedup (not measured against a serial run)" in format_stats(stats)
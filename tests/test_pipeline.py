@@ -0,0 +1,60 @@
+import pytest
+
+from darlkom.pipeline import STAGES, Pipeline, register_stage
+from darlkom.store import DNALibrary
+
+from tests.helpers import library_data
+
+
+@pytest.fixture
+def stages():
+    before = dict(STAGES)
+
+    @register_stage('test_upper_title', collections=('styles_001_100',))
+    def upper_title(record):
+        record['title'] = record['title'].upper()
+
+    @register_stage('test_tag', meta=True)
+    def tag(value):
+        if isinstance(value, dict):
+            return dict(value, tagged=True)
+        return value
+
+    yield
+    STAGES.clear()
+    STAGES.update(before)
+
+
+def test_unregistered_stages_are_reported():
+    with pytest.raises(KeyError, match='nope, missing'):
+        Pipeline(['nope', 'missing'])
+
+
+def test_stages_run_in_order_over_their_collections(stages):
+    pipeline = Pipeline(['test_upper_title', 'test_tag'])
+    record = pipeline.apply({"title": "a"}, 'styles_001_100')
+    assert record == {"title": "A", "tagged": True}
+    assert pipeline.apply({"title": "b"}, 'styles_v2') == {"title": "b", "tagged": True}
+    assert pipeline.apply_meta({"rule": 1}) == {"rule": 1, "tagged": True}
+    assert [(name, calls) for name, calls, _ in pipeline.report()] == [('test_upper_title', 1), ('test_tag', 3)]
+
+
+def test_run_transforms_the_library_in_memory(stages):
+    library = DNALibrary(library_data())
+    Pipeline(['test_upper_title', 'test_tag']).run(library)
+    assert [r['title'] for r in library.collection('styles_001_100')] == ['和風の色 1'.upper(), '和風の色 2'.upper()]
+    assert all(r['tagged'] for r in library.collection('styles_v2'))
+    assert library.data['deck_consistency']['tagged'] is True
+    assert 'DNA_001' in library
+
+
+def test_split_shares_the_report(stages):
+    pipeline = Pipeline(['test_upper_title', 'test_tag'])
+    before, after = pipeline.split('test_tag')
+    assert [s.name for s in before.stages] == ['test_upper_title']
+    assert [s.name for s in after.stages] == ['test_tag']
+    before.apply({"title": "x"}, 'styles_001_100')
+    after.apply({"title": "x"}, 'styles_001_100')
+    assert [calls for _, calls, _ in pipeline.report()] == [1, 1]
+    assert pipeline.format_report().splitlines()[-1].split()[:2] == ['total', '2']
+    assert len(pipeline.split('absent')[1].stages) == 0
@@ -0,0 +1,56 @@
+import json
+
+from darlkom.records import DNAModule, LayoutRules, dump_modules, load_modules
+from darlkom.shards import load_styles
+
+from tests.helpers import library_data, v2_record, write_json
+
+
+def _same_json(a, b):
+    return json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False)
+
+
+def test_round_trip_keeps_key_order_and_extra_keys():
+    record = v2_record(1, generated_by="hand")
+    record = {key: record[key] for key in reversed(list(record))}
+    record['design_dna']['color_palette'] = {"accent": "#000000", "note": "x", "primary": "#ffffff"}
+    module = DNAModule.from_dict(record)
+    assert _same_json(module.to_dict(), record)
+    assert module.design_dna.color_palette.secondary is None
+
+
+def test_round_trip_of_missing_and_malformed_genes():
+    record = v2_record(2)
+    del record['slide_usage']
+    record['design_dna']['typography'] = "sans-serif"
+    record['design_dna']['layout_rules'] = None
+    record['design_dna']['tone_keywords'] = ["raw", 3]
+    module = DNAModule.from_dict(record)
+    assert _same_json(module.to_dict(), record)
+    assert module.slide_usage is None
+    assert module.design_dna.typography == "sans-serif"
+    assert DNAModule.from_dict({}).to_dict() == {}
+
+
+def test_vocabulary_is_shared():
+    a, b = load_modules([v2_record(1), v2_record(3)])
+    assert a.design_dna.layout_rules.reading_flow is b.design_dna.layout_rules.reading_flow
+    assert a.design_dna.tone_keywords == ("creative", "raw")
+    assert a.design_dna.tone_keywords[0] is b.design_dna.tone_keywords[0]
+    assert a.to_dict()['design_dna']['tone_keywords'] == ["creative", "raw"]
+    assert a._order is None and a.design_dna._order is None
+
+
+def test_records_compare_by_content():
+    assert DNAModule.from_dict(v2_record(1)) == DNAModule.from_dict(v2_record(1))
+    assert DNAModule.from_dict(v2_record(1)) != DNAModule.from_dict(v2_record(2))
+    rules = LayoutRules(composition="grid", whitespace_ratio=0.4)
+    assert rules.to_dict() == {"composition": "grid", "whitespace_ratio": 0.4, "reading_flow": None}
+
+
+def test_streamed_styles_match_the_library(library_path, tmp_path):
+    deck, modules = load_styles(library_path)
+    data = library_data()
+    assert deck == data['deck_consistency']
+    assert dump_modules(modules) == data['styles_v2']
+    assert load_styles(write_json(tmp_path / 'flat.json', [{"id": 1}])) == ({}, [])
@@ -0,0 +1,83 @@
+from darlkom.report import NOTES_KEY, VALUE_KEY, HeaderStats, ReportLine, parse_report, tokenize
+
+REPORT = """Overall Design Config:
+   Tone: "Calm, analog"
+   Visual Identity:
+       Background Color: "#F8F1E7"
+       Accent Color: Coral
+
+       Accent Color: Sage
+   Typography: Sans
+     Headers: Bold
+   loose note
+"""
+
+
+def test_tokenize_nests_by_open_indentation():
+    assert list(tokenize(REPORT)) == [
+        ReportLine(0, 'Overall Design Config', ''),
+        ReportLine(1, 'Tone', 'Calm, analog'),
+        ReportLine(1, 'Visual Identity', ''),
+        ReportLine(2, 'Background Color', '#F8F1E7'),
+        ReportLine(2, 'Accent Color', 'Coral'),
+        ReportLine(2, 'Accent Color', 'Sage'),
+        ReportLine(1, 'Typography', 'Sans'),
+        ReportLine(2, 'Headers', 'Bold'),
+        ReportLine(1, None, 'loose note'),
+    ]
+
+
+def test_indent_width_does_not_matter():
+    two = "A:\n  B: 1\n    C: 2\n  D: 3\n"
+    uneven = "A:\n   B: 1\n        C: 2\n   D: 3\n"
+    assert [line.depth for line in tokenize(two)] == [line.depth for line in tokenize(uneven)] == [0, 1, 2, 1]
+
+
+def test_parse_report_keeps_everything():
+    assert parse_report(REPORT) == {
+        "Overall Design Config": {
+            "Tone": "Calm, analog",
+            "Visual Identity": {
+                "Background Color": "#F8F1E7",
+                "Accent Color": "Coral",
+                "Accent Color (2)": "Sage",
+            },
+            "Typography": {VALUE_KEY: "Sans", "Headers": "Bold"},
+            NOTES_KEY: ["loose note"],
+        },
+    }
+
+
+def test_notes_and_colliding_keys():
+    assert parse_report("intro\nmore\nNotes: real key\nafter\n") == {
+        NOTES_KEY: ["intro", "more", "after"], "Notes (2)": "real key",
+    }
+    assert parse_report("") == {}
+
+
+def test_header_stats():
+    stats = HeaderStats()
+    stats.add_report(REPORT, 'DNA_001')
+    stats.add_report("Tone: warm\nTypography:\n  Headers: Serif\n", 'DNA_002')
+    stats.add_report("no headers here")
+
+    assert stats.reports == 3
+    accent = stats.headers['Accent Color']
+    assert (accent.count, dict(accent.depths), list(accent.keys)) == (2, {2: 2}, ['DNA_001'])
+    assert dict(stats.headers['Headers'].depths) == {1: 1, 2: 1}
+    assert stats.pairs[('Tone', 'Typography')] == 2
+    assert stats.index()['Tone'] == ['DNA_001', 'DNA_002']
+    assert [header for header, _ in stats.ranked()][:3] == ['Headers', 'Tone', 'Typography']
+
+    notes = []
+    text = stats.format_report(limit=2, pairs=1, note=lambda header: notes.append(header) or "(gap)")
+    assert notes == ['Headers', 'Tone']
+    assert text.splitlines()[0] == "3 reports, 7 distinct headers, 11 header lines"
+    assert text.splitlines()[2].endswith("1-2  Headers  (gap)")
+    assert text.splitlines()[-1] == "      2  Headers + Tone"
+
+    data = stats.to_json(pairs=1)
+    assert data['headers']['Headers'] == {
+        "count": 2, "depths": {"1": 1, "2": 1}, "module_ids": ['DNA_001', 'DNA_002'],
+    }
+    assert len(data['pairs']) == 1
@@ -0,0 +1,59 @@
+from darlkom.residue import ResidueReport, build_report
+from darlkom.store import DNALibrary
+
+from tests.helpers import legacy_record, v2_record
+
+
+def _library():
+    return DNALibrary({
+        "deck_consistency": {"global_rule": "余白 first"},
+        "styles_v2": [v2_record(1, style_name="温かみのある 노트"), v2_record(2, style_name="温かみのある")],
+        "styles_001_100": [legacy_record(1, slide_intent=["温かみのある", "calm"])],
+    })
+
+
+def test_script_counts_and_tokens():
+    report = ResidueReport()
+    report.add_string("온기 温かみ, 12 ok", 'DNA_001', 'style_name')
+    assert report.scripts == {'hangul': 2, 'han': 1, 'kana': 2, 'latin': 2}
+    assert report.other == 6  # spaces, comma and digits
+    assert list(report.tokens) == ['温かみ']
+
+
+def test_tokens_rank_with_records_and_paths():
+    report = build_report(_library())
+    ranked = dict(report.ranked())
+    token = ranked['温かみのある']
+    assert token.count == 3
+    assert list(token.keys) == ['DNA_001', 'DNA_002', 1]
+    assert token.paths == {'style_name': 2, 'slide_intent[]': 1}
+    assert ranked['余白'].paths == {'deck_consistency.global_rule': 1}
+    assert list(ranked['余白'].keys) == []
+    assert 'calm' not in ranked
+
+
+def test_sort_by_records():
+    report = ResidueReport()
+    for key in ('a', 'b'):
+        report.add_string("夜", key, 'x')
+    for _ in range(3):
+        report.add_string("窓", 'c', 'x')
+    assert [text for text, _ in report.ranked()] == ['窓', '夜']
+    assert [text for text, _ in report.ranked('records')] == ['夜', '窓']
+
+
+def test_latin_words_are_opt_in():
+    report = ResidueReport(latin=True)
+    report.add_value({"mood": ["calm", "차분"]}, 'DNA_001', '')
+    assert dict(report.ranked())['calm'].paths == {'mood[]': 1}
+
+
+def test_flat_list_and_outputs():
+    report = ResidueReport()
+    report.add_library([legacy_record(1), legacy_record(2)])
+    data = report.to_json(limit=1)
+    assert data['strings'] == report.strings
+    assert data['tokens'] == [{"token": "和風の色", "count": 2, "records": [1, 2], "paths": {"title": 2}}]
+    text = report.format_report(limit=1)
+    assert "(top 1 by count)" in text
+    assert "at 1, 2" in text
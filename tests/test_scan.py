@@ -0,0 +1,39 @@
+from darlkom.scan import Finding, find_runs, format_path, has_residue, scan_library, scan_record
+from darlkom.scripts import JAPANESE
+from darlkom.store import DNALibrary
+
+from tests.helpers import legacy_record, library_data, v2_record
+
+
+def test_findings_carry_key_path_and_offsets():
+    record = v2_record(7, style_name="calm 夜の窓")
+    record['design_dna']['tone_keywords'] = ["raw", "温かみ、"]
+    assert list(scan_record(record)) == [
+        Finding('DNA_007', 'style_name', 5, 8, '夜の窓'),
+        Finding('DNA_007', 'design_dna.tone_keywords[1]', 0, 4, '温かみ、'),
+    ]
+    # JAPANESE leaves out the ideographic comma.
+    assert [f.text for f in scan_record(record, JAPANESE)] == ['夜の窓', '温かみ']
+
+
+def test_find_runs_on_plain_values():
+    assert list(find_runs("a夜b窓")) == [('', 1, 2, '夜'), ('', 3, 4, '窓')]
+    assert list(find_runs(3)) == []
+    assert list(find_runs(["x", {"y": "夜"}], path='root')) == [('root[1].y', 0, 1, '夜')]
+
+
+def test_format_path():
+    assert format_path(('design_dna', 'tone_keywords', 2)) == 'design_dna.tone_keywords[2]'
+    assert format_path(()) == ''
+
+
+def test_library_scan_and_early_exit():
+    library = DNALibrary(library_data())
+    findings = list(scan_library(library))
+    assert {f.key for f in findings} == {1, 2}
+    assert findings[0] == Finding(1, 'title', 0, 4, '和風の色')
+    assert has_residue(library)
+
+    clean = DNALibrary({"styles_v2": [v2_record(1)],
+                        "styles_001_100": [legacy_record(1, title="Warm", slide_intent=[])]})
+    assert not has_residue(clean)
@@ -0,0 +1,65 @@
+import pytest
+
+from darlkom.schema import SchemaError, check_records, format_violation, validate_record, validate_records
+
+from tests.helpers import v2_record
+
+
+def _paths(violations):
+    return [(v.module_id, v.path, v.message) for v in violations]
+
+
+def test_valid_record_has_no_violations():
+    assert validate_record(v2_record(1)) == []
+    # Extra keys are allowed at every level.
+    record = v2_record(1, generated_by="hand")
+    record['design_dna']['extra'] = {"anything": 1}
+    assert validate_record(record) == []
+
+
+def test_violations_carry_module_id_and_path():
+    record = v2_record(1, style_name="  ", slide_usage={"best_for": ["x", 3]})
+    dna = record['design_dna']
+    del dna['typography']
+    dna['layout_rules']['whitespace_ratio'] = 1.5
+    dna['emotional_profile']['mood'] = "calm"
+    dna['materiality']['base'] = None
+
+    assert _paths(validate_record(record)) == [
+        ('DNA_001', 'style_name', "must not be empty"),
+        ('DNA_001', 'design_dna.layout_rules.whitespace_ratio', "1.5 outside [0.0, 1.0]"),
+        ('DNA_001', 'design_dna.materiality.base', "expected string, got NoneType"),
+        ('DNA_001', 'design_dna.typography', "missing"),
+        ('DNA_001', 'design_dna.emotional_profile.mood', "expected list, got str"),
+        ('DNA_001', 'slide_usage.best_for[1]', "expected string, got int"),
+        ('DNA_001', 'slide_usage.avoid_for', "missing"),
+    ]
+
+
+def test_booleans_are_not_numbers():
+    record = v2_record(1)
+    record['design_dna']['layout_rules']['whitespace_ratio'] = True
+    assert _paths(validate_record(record)) == [
+        ('DNA_001', 'design_dna.layout_rules.whitespace_ratio', "expected number, got bool"),
+    ]
+
+
+def test_non_dict_record():
+    [violation] = validate_record(["not", "a", "record"])
+    assert format_violation(violation) == "None <record>: expected object, got list"
+
+
+def test_duplicate_module_ids():
+    violations = validate_records([v2_record(1), v2_record(2), v2_record(1)])
+    assert _paths(violations) == [('DNA_001', 'module_id', "duplicate module_id")]
+
+
+def test_check_records_raises_with_preview():
+    check_records([v2_record(1), v2_record(2)])
+    records = [v2_record(n, negative_prompt=None) for n in range(1, 8)]
+    with pytest.raises(SchemaError) as excinfo:
+        check_records(records)
+    assert len(excinfo.value.violations) == 7
+    message = str(excinfo.value)
+    assert message.startswith("7 schema violation(s): DNA_001 negative_prompt: expected string, got NoneType; ")
+    assert message.endswith(" (+2 more)")
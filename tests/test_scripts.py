@@ -0,0 +1,20 @@
+from darlkom.scripts import CJK, HAN, HANGUL, JAPANESE, KANA, LATIN, contains, counts, script_of, strip
+
+
+def test_script_of():
+    assert [script_of(c) for c in 'のカ字한aＡ。ｶ1'] == [
+        'hiragana', 'katakana', 'han', 'hangul', 'latin', 'fullwidth', 'cjk_punct', 'katakana', None]
+    assert script_of('々') == 'han' and script_of('〆') == 'cjk_punct'
+
+
+def test_contains_and_strip():
+    assert contains("calm 夜", JAPANESE)
+    assert not contains("차분한 calm", JAPANESE)
+    assert contains("「calm」", CJK) and not contains("「calm」", JAPANESE)
+    assert strip("温かみのある 색", JAPANESE) == " 색"
+    assert strip("ｶﾀｶﾅ kana", KANA) == " kana"
+
+
+def test_counts_classify_every_character():
+    assert counts("夜の밤 night!") == {HAN: 1, 'hiragana': 1, HANGUL: 1, LATIN: 5, None: 2}
+    assert counts("") == {}
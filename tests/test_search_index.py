@@ -0,0 +1,61 @@
+import json
+import os
+
+from darlkom.search_index import FORMAT_VERSION, build_index, build_search_index, search
+
+from tests.helpers import legacy_record, read_json, v2_record
+
+
+def _scan(records, query):
+    # What app.js did before the index: JSON.stringify(dna).toLowerCase().includes(term).
+    term = query.lower()
+    return [r.get('module_id', r.get('id')) for r in records
+            if term in json.dumps(r, ensure_ascii=False, separators=(',', ':')).lower()]
+
+
+RECORDS = [
+    v2_record(1),
+    v2_record(2, design_dna={"color_palette": {"primary": "#0fff00"}}),
+    v2_record(3, design_dna={"color_palette": {"primary": "#ffd700"}}, style_name="손글씨 노트"),
+]
+
+
+def test_every_field_is_searchable():
+    index = build_index(RECORDS)
+    assert index['version'] == FORMAT_VERSION
+    assert search(index, 'z-pattern') == ['DNA_001']
+    assert search(index, 'DNA_002') == ['DNA_002']
+    assert search(index, 'Opening') == ['DNA_001', 'DNA_003']
+    assert search(index, 'sans-serif') == ['DNA_001']
+
+
+def test_grams_are_only_candidates():
+    index = build_index(RECORDS)
+    # '#0fff00' holds the grams of '#ff' but not the string.
+    assert search(index, '#ff') == ['DNA_001', 'DNA_003']
+    assert search(index, 'style 3, blue') == ['DNA_003']
+    assert search(index, 'blue paper') == []
+
+
+def test_queries_without_tokens_scan_every_text():
+    records = RECORDS + [legacy_record(1), legacy_record(2)]
+    index = build_index(records)
+    for query in ('和風', '温かみ', '#', ', ', '손글', '노트', 'ink on'):
+        assert search(index, query) == _scan(records, query), query
+
+
+def test_cache_lives_outside_the_output_dir(tmp_path):
+    path = tmp_path / 'templates.json'
+    path.write_text(json.dumps({"styles_v2": RECORDS}, ensure_ascii=False), encoding='utf-8')
+    output_path = str(tmp_path / 'library' / 'search-index.json')
+    cache_path = str(tmp_path / '.search-index.fingerprints')
+
+    index, cache = build_search_index(str(path), output_path, cache_path)
+    assert read_json(output_path) == index
+    assert os.listdir(tmp_path / 'library') == ['search-index.json']
+    assert os.path.exists(cache_path)
+    assert (cache.hits, cache.misses) == (0, 3)
+
+    again, cache = build_search_index(str(path), output_path, cache_path)
+    assert again == index
+    assert (cache.hits, cache.misses) == (3, 0)
@@ -0,0 +1,31 @@
+from darlkom.lexicon import lexicon_table
+from darlkom.segmenter import Segmenter
+
+MAPPING = {"和風": "일본풍", "色": "색", "の": "의", "な": "한", "と": "와", "も": "도", "夜": "밤", "空": "하늘"}
+
+
+def test_words_made_of_single_character_keys_stay_intact():
+    segmenter = Segmenter(MAPPING)
+    assert segmenter.replace("なめらか") == "なめらか"
+    assert segmenter.replace("とても") == "とても"
+
+
+def test_particle_between_known_words_is_translated():
+    segmenter = Segmenter(MAPPING)
+    assert segmenter.replace("和風の色") == "일본풍의색"
+    assert segmenter.replace("夜の空") == "밤의하늘"
+
+
+def test_single_kanji_inside_an_unknown_compound_is_left_alone():
+    assert Segmenter(MAPPING).replace("夜景") == "夜景"
+
+
+def test_non_japanese_text_is_copied():
+    assert Segmenter(MAPPING).replace("Tone: 和風の色, calm") == "Tone: 일본풍의색, calm"
+
+
+def test_jp_ko_lexicon():
+    table = lexicon_table('jp_ko')
+    assert table.segment("なめらか") == "なめらか"
+    assert table.segment("とても") == "とても"
+    assert table.segment("和風の色") == "和風의色"
@@ -0,0 +1,46 @@
+import os
+
+from darlkom.shards import MANIFEST_NAME, build_shards, role_slug
+
+from tests.helpers import library_data, read_json, v2_record, write_json
+
+
+def _shard_files(output_dir):
+    return sorted(os.listdir(os.path.join(output_dir, 'shards')))
+
+
+def test_manifest_and_shards_cover_every_record(library_path, tmp_path):
+    output_dir = str(tmp_path / 'library')
+    manifest = build_shards(library_path, output_dir)
+
+    assert read_json(os.path.join(output_dir, MANIFEST_NAME)) == manifest
+    assert manifest['entries'] == [
+        {"module_id": f"DNA_00{n}", "style_name": f"Style {n}", "role_bucket": role}
+        for n, role in ((1, 'Opening'), (2, 'Data'), (3, 'Opening'))
+    ]
+    assert manifest['deck_consistency'] == read_json(library_path)['deck_consistency']
+    loaded = {role: read_json(os.path.join(output_dir, path)) for role, path in manifest['shards'].items()}
+    assert [r['module_id'] for r in loaded['Opening']] == ['DNA_001', 'DNA_003']
+    assert loaded['Data'] == [v2_record(2)]
+
+
+def test_shard_names_follow_content(tmp_path):
+    output_dir = str(tmp_path / 'library')
+    data = library_data()
+    path = write_json(tmp_path / 'templates.json', data)
+    first = build_shards(path, output_dir)
+    assert build_shards(path, output_dir) == first
+
+    data['styles_v2'][1]['style_name'] = 'Renamed'
+    write_json(path, data)
+    second = build_shards(path, output_dir)
+    assert second['shards']['Opening'] == first['shards']['Opening']
+    assert second['shards']['Data'] != first['shards']['Data']
+    # The superseded shard is removed.
+    assert _shard_files(output_dir) == sorted(p.split('/')[1] for p in second['shards'].values())
+
+
+def test_role_slug():
+    assert role_slug('Data / Charts') == 'data-charts'
+    assert role_slug('') == 'unsorted'
+    assert role_slug('表紙') == 'unsorted'
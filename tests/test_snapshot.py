@@ -0,0 +1,88 @@
+import os
+
+from darlkom.snapshot import Snapshot, SnapshotLibrary, build_snapshot, open_library, pack_color, unpack_color
+from darlkom.store import DNALibrary
+
+from tests.helpers import legacy_record, library_data, read_json, v2_record, write_json
+
+
+def _snapshot(path):
+    return SnapshotLibrary(Snapshot(build_snapshot(path)), path)
+
+
+def test_round_trip_equals_json_load(tmp_path):
+    data = library_data(v2=6, legacy=4)
+    # Irregular shapes: reordered keys, a missing gene, an empty dict, mixed types in one column.
+    data['styles_v2'][1] = dict(reversed(list(v2_record(2).items())))
+    del data['styles_v2'][2]['design_dna']['line_shape']
+    data['styles_v2'][3]['design_dna']['materiality'] = {}
+    data['styles_001_100'][0]['score'] = 'n/a'
+    data['styles_001_100'][1]['palette']['accents'] = []
+    path = write_json(tmp_path / 'templates.json', data)
+
+    library = _snapshot(path)
+    assert library.data == read_json(path)
+    assert list(library.data) == list(data)
+    assert [list(r) for r in library.collection('styles_v2')] == [list(r) for r in data['styles_v2']]
+    library.snapshot.close()
+
+
+def test_flat_legacy_list_round_trips(tmp_path):
+    path = write_json(tmp_path / 'templates.json', [legacy_record(n) for n in range(1, 4)])
+    library = _snapshot(path)
+    assert library.is_legacy_list
+    assert library.data == read_json(path)
+    library.snapshot.close()
+
+
+def test_lookups_match_dna_library(library_path):
+    library = _snapshot(library_path)
+    reference = DNALibrary.load(library_path)
+    assert library.get('DNA_002') == reference.get('DNA_002')
+    assert library.get(1) == reference.get(1)
+    assert library.field('DNA_003', 'design_dna.layout_rules.whitespace_ratio') == 0.53
+    assert library.field('DNA_003', 'design_dna.missing', 'default') == 'default'
+    assert list(library.filter(role='Opening', material='paper')) == list(reference.filter(role='Opening', material='paper'))
+    library.snapshot.close()
+
+
+NOT_COLORS = ['#12345 ', '#+12345', '#-12345', '#1_2345', '# 12345', '#12345\n', '#FfFfFf', '#FF0000 (Red)', '#GGGGGG']
+
+
+def test_colors_pack_only_when_they_round_trip():
+    assert unpack_color(pack_color('#0000CD')) == '#0000CD'
+    assert unpack_color(pack_color('#ffffff')) == '#ffffff'
+    for value in NOT_COLORS:
+        assert pack_color(value) is None, value
+
+
+def test_near_colors_round_trip_as_strings(tmp_path):
+    records = [v2_record(n) for n in range(1, len(NOT_COLORS) + 3)]
+    for record, value in zip(records, NOT_COLORS):
+        record['design_dna']['color_palette']['primary'] = value
+    path = write_json(tmp_path / 'templates.json', {"styles_v2": records})
+    library = _snapshot(path)
+    assert [r['design_dna']['color_palette']['primary'] for r in library] == \
+        NOT_COLORS + ['#0000CD', '#0000CD']
+    library.snapshot.close()
+
+
+def test_open_library_uses_a_fresh_snapshot_only(library_path):
+    build_snapshot(library_path)
+    library = open_library(library_path)
+    assert isinstance(library, SnapshotLibrary)
+    library.snapshot.close()
+
+    # A pending journal is not in the snapshot.
+    editable = DNALibrary.load(library_path)
+    editable.set_field('DNA_001', 'style_name', 'Edited')
+    editable.commit()
+    library = open_library(library_path)
+    assert isinstance(library, DNALibrary)
+    assert library.get('DNA_001')['style_name'] == 'Edited'
+
+    # Nor is a rewritten library file.
+    library.save()
+    stat = os.stat(library_path)
+    os.utime(library_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert isinstance(open_library(library_path), DNALibrary)
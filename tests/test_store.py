@@ -0,0 +1,82 @@
+import pytest
+
+from darlkom.schema import SchemaError
+from darlkom.store import DNALibrary, record_key, record_material
+
+from tests.helpers import legacy_record, library_data, read_json, v2_record, write_json
+
+
+def test_indexes_cover_both_collections(library_path):
+    library = DNALibrary.load(library_path)
+    assert len(library) == 5
+    assert list(library.keys()) == ['DNA_001', 'DNA_002', 'DNA_003', 1, 2]
+    assert library.collection_of('DNA_002') == 'styles_v2'
+    assert library.collection_of(1) == 'styles_001_100'
+    assert 'DNA_003' in library and 'DNA_004' not in library
+    assert [r['module_id'] for r in library.by_role('Opening')] == ['DNA_001', 'DNA_003']
+    assert [r['module_id'] for r in library.by_material('dark_glass')] == ['DNA_002']
+    assert set(library.roles()) == {'Opening', 'Data', 'Structure'}
+
+
+def test_filter_combines_criteria(library_path):
+    library = DNALibrary.load(library_path)
+    assert [record_key(r) for r in library.filter(role='Opening', material='paper')] == ['DNA_001', 'DNA_003']
+    assert [record_key(r) for r in library.filter(role='Structure', collection='styles_v2')] == []
+    assert [record_key(r) for r in library.filter(collection='styles_001_100')] == [1, 2]
+
+
+def test_flat_legacy_layout(tmp_path):
+    path = write_json(tmp_path / 'legacy.json', [legacy_record(1), legacy_record(2)])
+    library = DNALibrary.load(path)
+    assert library.is_legacy_list
+    assert library.collection_names() == [None]
+    assert library.add(legacy_record(3))
+    assert not library.add(legacy_record(3))
+    assert [record_key(r) for r in library] == [1, 2, 3]
+
+
+def test_record_helpers():
+    assert record_key(v2_record(7)) == 'DNA_007'
+    assert record_key(legacy_record(7)) == 7
+    assert record_material(v2_record(1)) == 'paper'
+    assert record_material({"design_dna": "not a dict"}) is None
+
+
+def test_transform_replaces_drops_and_reindexes(library_path):
+    library = DNALibrary.load(library_path)
+
+    def rename(record, collection):
+        if collection == 'styles_001_100' and record['id'] == 2:
+            return None
+        return {**record, 'role_bucket': 'Closing'}
+    assert library.transform(rename, lambda value: {**value, 'margin': 0.1}) == 4
+    assert len(library.by_role('Closing')) == 4
+    assert 2 not in library
+    assert library.data['deck_consistency']['margin'] == 0.1
+
+
+def test_save_skips_unchanged_and_validates(library_path):
+    library = DNALibrary.load(library_path)
+    assert library.save() is True  # no fingerprint sidecar yet
+    assert library.save() is False
+    library.get('DNA_001')['style_name'] = 'Changed'
+    assert library.save() is True
+    assert read_json(library_path)['styles_v2'][0]['style_name'] == 'Changed'
+    assert library.save() is False
+
+    library.get('DNA_002')['design_dna']['layout_rules']['whitespace_ratio'] = 'wide'
+    with pytest.raises(SchemaError):
+        library.save()
+    assert read_json(library_path)['styles_v2'][1]['design_dna']['layout_rules']['whitespace_ratio'] == 0.52
+
+
+def test_changes_since_last_save(tmp_path):
+    path = write_json(tmp_path / 'templates.json', library_data())
+    library = DNALibrary.load(path)
+    library.save()
+    library.get('DNA_001')['style_name'] = 'Changed'
+    library.add(v2_record(4))
+    changes = library.changes()
+    assert list(changes.changed) == [('styles_v2', 'DNA_001')]
+    assert list(changes.added) == [('styles_v2', 'DNA_004')]
+    assert not changes.removed
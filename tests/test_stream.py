@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from darlkom.store import DNALibrary
+from darlkom.stream import StreamWriter, iter_library, iter_records, stream_transform
+
+from tests.helpers import legacy_record, library_data, read_json, write_json
+
+NUMBERS = [0, -0.0, 1500.0, 15, -3e-05, 2.5e+20, 12345678901234567890, 1.0000000000000002, True, False, None]
+
+
+def _materialize(path, chunk_size):
+    data = {}
+    for entry in iter_library(path, chunk_size):
+        data[entry.key] = list(entry.records) if entry.records is not None else entry.value
+    return data
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 64])
+def test_numbers_survive_every_chunk_boundary(tmp_path, chunk_size):
+    data = {"meta": NUMBERS, "styles_001_100": [{"n": n} for n in NUMBERS] + [legacy_record(1)]}
+    for indent in (None, 2):
+        path = tmp_path / f'numbers-{indent}.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        streamed = _materialize(path, chunk_size)
+        assert streamed == data
+        assert [repr(v) for v in streamed['meta']] == [repr(v) for v in NUMBERS]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 13, 1 << 16])
+def test_reader_matches_json_load(library_path, chunk_size):
+    assert _materialize(library_path, chunk_size) == read_json(library_path)
+
+
+def test_flat_list_layout(tmp_path):
+    path = write_json(tmp_path / 'legacy.json', [legacy_record(n) for n in range(1, 4)])
+    assert list(iter_records(path, None, chunk_size=5)) == read_json(path)
+
+
+def test_unread_collections_are_skipped(library_path):
+    keys = [entry.key for entry in iter_library(library_path, 3)]
+    assert keys == ['deck_consistency', 'styles_v2', 'styles_001_100']
+    assert list(iter_records(library_path, 'styles_001_100', 3)) == read_json(library_path)['styles_001_100']
+
+
+def test_identity_transform_round_trips(library_path, tmp_path):
+    target = str(tmp_path / 'out.json')
+    count = stream_transform(library_path, target, lambda record, collection: record, chunk_size=7)
+    assert count == 5
+    assert read_json(target) == read_json(library_path)
+    with open(target, encoding='utf-8') as a, open(library_path, encoding='utf-8') as b:
+        assert a.read() == b.read()  # same layout as json.dump(indent=2)
+
+
+def test_stream_transform_refuses_a_pending_journal(library_path, tmp_path):
+    library = DNALibrary.load(library_path)
+    library.set_field('DNA_001', 'style_name', 'Edited')
+    library.commit()
+    with pytest.raises(RuntimeError, match='pending journal'):
+        stream_transform(library_path, str(tmp_path / 'out.json'), lambda record, collection: record)
+
+
+def test_writer_discards_its_temp_file_on_error(tmp_path):
+    target = tmp_path / 'out.json'
+    write_json(target, library_data())
+    before = target.read_bytes()
+    with pytest.raises(KeyError):
+        with StreamWriter(str(target)) as out:
+            out.begin_collection('styles_v2')
+            raise KeyError('boom')
+    assert target.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['out.json']
+
+
+def test_migration_paths_agree(tmp_path):
+    from migrate_to_presentation_dna import migrate_db
+
+    flat = [{"id": n, "title": f"Neon {n}", "prompt": "p", "palette": {"bg": "#000"}} for n in (1, 2)]
+    source = write_json(tmp_path / 'flat.json', flat)
+    migrate_db(source, str(tmp_path / 'full.json'))
+    migrate_db(source, str(tmp_path / 'streamed.json'), stream=True)
+    assert read_json(tmp_path / 'full.json') == read_json(tmp_path / 'streamed.json')
+    assert read_json(tmp_path / 'full.json')['styles_001_100'][1]['role_bucket'] == 'High Impact'
+    assert read_json(source) == flat
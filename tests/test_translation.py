@@ -0,0 +1,55 @@
+from darlkom.translation import TranslationTable, translation_table
+
+JP_TO_EN = {"背景": "Background", "背景色": "Background Color", "白": "White"}
+JP_TO_KO = {"白": "흰색", "黒": "검정"}
+
+
+def test_tables_are_shared_per_dict():
+    table = translation_table(JP_TO_EN, 'jp_en', 'en')
+    assert translation_table(JP_TO_EN) is table
+    assert translation_table(dict(JP_TO_EN)) is not table
+    assert repr(table) == "TranslationTable(jp_en, 3 keys)"
+
+
+def test_edited_dict_gets_a_fresh_table():
+    mapping = {"赤": "Red"}
+    table = translation_table(mapping)
+    mapping["青"] = "Blue"
+    fresh = translation_table(mapping)
+    assert fresh is not table
+    assert fresh.replace("赤と青") == "RedとBlue"
+
+
+def test_replace_is_leftmost_longest():
+    table = TranslationTable(JP_TO_EN)
+    assert table.replace("背景色: 白") == "Background Color: White"
+    assert table.replace("") == ""
+    assert TranslationTable({}).replace("背景") == "背景"
+
+
+def test_merge_later_tables_win_and_is_memoized():
+    en = translation_table(JP_TO_EN, 'jp_en', 'en')
+    ko = translation_table(JP_TO_KO, 'jp_ko', 'ko')
+    merged = en.merge(ko)
+    assert merged is en.merge(ko)
+    assert merged.name == 'jp_en+jp_ko'
+    assert merged.target is None
+    assert merged.replace("背景の白と黒") == "Backgroundの흰색と검정"
+    assert en.merge(translation_table({"黒": "Black"}, target='en')).target == 'en'
+    # Merging never compiles the inputs.
+    assert ko._automaton is None
+
+
+def test_lookup_folds_case_and_width():
+    table = TranslationTable({"Playful": "장난스러운", "playful": "놀이", "Ｂｏｌｄ": "굵은"})
+    assert table.lookup("playful") == "놀이"
+    assert table.lookup("PLAYFUL") == "장난스러운"
+    assert table.lookup("ＰＬＡＹＦＵＬ") == "장난스러운"
+    assert table.lookup("bold") == "굵은"
+    assert table.lookup("calm", "calm") == "calm"
+    assert (table.hits, table.misses) == (4, 1)
+    assert table.format_coverage() == "dictionary: 4 hits, 1 misses (80.0% coverage)"
+
+
+def test_coverage_of_an_unused_table():
+    assert TranslationTable({}, 'empty').coverage() == 0.0